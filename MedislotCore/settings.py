@@ -16,6 +16,7 @@ from decouple import config # type: ignore
 from pathlib import Path
 from dotenv import load_dotenv # type: ignore
 from datetime import timedelta
+from django.core.exceptions import ImproperlyConfigured
 
 load_dotenv()
 
@@ -132,7 +133,7 @@ REST_FRAMEWORK = {
     'NON_FIELD_ERRORS_KEY': 'error',
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'common.authentication.StatelessJWTAuthentication',  # Trusts token claims; one decode per request
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -141,8 +142,15 @@ REST_FRAMEWORK = {
         'django_filters.rest_framework.DjangoFilterBackend'
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',  # Added for API docs
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',  # Added pagination
+    'DEFAULT_PAGINATION_CLASS': 'common.pagination.KeysetPagination',  # Keyset cursors: no OFFSET, no COUNT
     'PAGE_SIZE': 10,  # Added pagination size
+    # Sliding-window limits for the auth endpoints (common.throttling), kept in the THROTTLE_CACHE_ALIAS cache
+    'DEFAULT_THROTTLE_RATES': {
+        'auth_ip': os.getenv('AUTH_IP_THROTTLE_RATE', '30/min'),
+        'auth_email': os.getenv('AUTH_EMAIL_THROTTLE_RATE', '5/min'),
+        'auth_user': os.getenv('AUTH_USER_THROTTLE_RATE', '10/min'),
+        'otp_resend': os.getenv('OTP_RESEND_THROTTLE_RATE', '3/day'),  # OTP e-mails per address
+    },
 }
 
 # API Documentation Settings (Added)
@@ -155,6 +163,35 @@ SPECTACULAR_SETTINGS = {
 }
 
 
+# Caching (locmem by default; point AVAILABILITY_CACHE_BACKEND / THROTTLE_CACHE_BACKEND at a shared backend such as Redis in production)
+AVAILABILITY_CACHE_ALIAS = 'availability'
+AVAILABILITY_CACHE_TIMEOUT = int(os.getenv('AVAILABILITY_CACHE_TIMEOUT', 300))  # Upper bound on entry TTL (seconds)
+DASHBOARD_CACHE_TIMEOUT = int(os.getenv('DASHBOARD_CACHE_TIMEOUT', 60))  # Doctor dashboard aggregates (seconds; dropped on change)
+THROTTLE_CACHE_ALIAS = 'throttle'  # Throttle counters and token revocations (common.authentication)
+THROTTLE_CACHE_BACKEND = os.getenv('THROTTLE_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache')
+if not DEBUG and THROTTLE_CACHE_BACKEND.rsplit('.', 1)[-1] in ('LocMemCache', 'DummyCache'):
+    # A per-process cache would let revoked tokens and throttled clients through on other workers
+    raise ImproperlyConfigured("THROTTLE_CACHE_BACKEND must be a cache shared by all workers when DEBUG is off")
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    AVAILABILITY_CACHE_ALIAS: {
+        'BACKEND': os.getenv('AVAILABILITY_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('AVAILABILITY_CACHE_LOCATION', 'availability'),
+        'TIMEOUT': AVAILABILITY_CACHE_TIMEOUT,
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('AVAILABILITY_CACHE_MAX_ENTRIES', 10000)),  # Bounds memory use
+        },
+    },
+    THROTTLE_CACHE_ALIAS: {
+        'BACKEND': THROTTLE_CACHE_BACKEND,
+        'LOCATION': os.getenv('THROTTLE_CACHE_LOCATION', 'throttle'),
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
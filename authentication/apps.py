@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class AuthenticationConfig(AppConfig):
     name = 'authentication'
+
+    def ready(self):
+        from . import signals  # noqa: F401 (registers token revocation receivers)
+        from common import schema  # noqa: F401 (registers the OpenAPI scheme for StatelessJWTAuthentication)
@@ -0,0 +1,98 @@
+import time
+from datetime import date
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from common.middleware import AuthenticationMiddleware
+from common.testing import scratch_database
+from doctors.models import DoctorProfile
+from patients.models import PatientProfile
+
+User = get_user_model()
+
+# The pre-change middleware body, kept here as the benchmark baseline
+LEGACY_PUBLIC_PATHS = [
+    '/auth/register/', '/auth/login/', '/auth/token/refresh/', '/auth/otp/resend/', '/auth/verify-otp/',
+    '/auth/password-reset/', '/auth/password-reset-confirm/', '/admin/', '/api/schema/', '/api/docs/', '/api/redoc/',
+]
+
+
+class LegacyAuthenticationMiddleware(AuthenticationMiddleware):
+    def __call__(self, request):
+        public_paths = list(LEGACY_PUBLIC_PATHS)
+        if any(request.path.startswith(path) for path in public_paths):
+            return self.get_response(request)
+        if not request.user.is_authenticated:
+            return HttpResponse(status=401)
+        user = request.user
+        if hasattr(user, 'patient_profile') and user.patient_profile:
+            request.user_role = 'patient'
+        elif hasattr(user, 'doctor_profile') and user.doctor_profile:
+            request.user_role = 'doctor'
+        else:
+            return HttpResponse(status=403)
+        return self.get_response(request)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure common.middleware.AuthenticationMiddleware per-request overhead (time and queries) "
+        "against the previous profile-lookup implementation. Runs on a scratch test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help="Requests per run")
+        parser.add_argument('--repeat', type=int, default=3, help="Runs per implementation; the best time is reported")
+        parser.add_argument(
+            '--noinput', '--no-input', action='store_false', dest='interactive',
+            help="Replace a leftover test database without asking",
+        )
+
+    def handle(self, *args, **options):
+        with scratch_database(interactive=options['interactive']):
+            users = self.seed_users()
+            for label, middleware_class in (('before', LegacyAuthenticationMiddleware), ('after', AuthenticationMiddleware)):
+                self.report(label, middleware_class, users, options['requests'], options['repeat'])
+
+    def seed_users(self):
+        doctor_user = User.objects.create_user('bench-mw-doctor', 'bench-mw-doctor@example.com', None, role='is_doctor')
+        patient_user = User.objects.create_user('bench-mw-patient', 'bench-mw-patient@example.com', None, role='is_patient')
+        DoctorProfile.objects.create(user=doctor_user, specialty='Cardiology', license_number='BENCH-MW-1')
+        PatientProfile.objects.create(user=patient_user, date_of_birth=date(1990, 1, 1), gender='other')
+        # Doctors are the worst case for the old code: the patient lookup misses first
+        return [doctor_user.pk, patient_user.pk]
+
+    def build_requests(self, users, count):
+        # A fresh user instance per request, as the auth backend would load it (not timed)
+        factory = RequestFactory()
+        requests = []
+        for index in range(count):
+            request = factory.get('/doctors/appointments/')
+            request.user = User.objects.get(pk=users[index % len(users)])
+            requests.append(request)
+        return requests
+
+    def report(self, label, middleware_class, users, count, repeat):
+        middleware = middleware_class(lambda request: HttpResponse())
+        timings, executed = [], []
+
+        def count_query(execute, sql, params, many, context):
+            executed.append(sql)
+            return execute(sql, params, many, context)
+
+        for _ in range(repeat):
+            requests = self.build_requests(users, count)
+            executed.clear()
+            with connection.execute_wrapper(count_query):
+                started = time.perf_counter()
+                for request in requests:
+                    middleware(request)
+                timings.append(time.perf_counter() - started)
+        queries = len(executed)
+        best = min(timings)
+        self.stdout.write(
+            f"{label:>6}: {best / count * 1e6:8.1f} us/request | {queries / count:.2f} queries/request "
+            f"({count} requests, best of {repeat})"
+        )
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from authentication.services.purge_service import AuthArtifactPurgeService
+
+
+class Command(BaseCommand):
+    help = "Delete expired OTPs and password reset tokens in bounded batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Rows deleted per statement (default 1000)")
+        parser.add_argument('--pause', type=float, default=0.0, help="Seconds to sleep between batches (default 0)")
+
+    def handle(self, *args, **options):
+        counts = AuthArtifactPurgeService(batch_size=options['batch_size'], pause=options['pause']).purge()
+        summary = ", ".join(f"{count} {name}" for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Purged {summary}."))
@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-10-17 23:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='otp',
+            index=models.Index(fields=['user', 'otp'], name='otp_user_code_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='otp',
+            index=models.Index(fields=['created_at'], name='otp_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='otprequesttracker',
+            index=models.Index(fields=['last_request_time'], name='otp_tracker_request_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='passwordresettoken',
+            index=models.Index(fields=['created_at'], name='password_reset_created_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 6.0 on 2026-10-17 23:33
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_auth_artifact_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='otprequesttracker',
+            name='otp_tracker_request_time_idx',
+        ),
+        migrations.DeleteModel(
+            name='OTPRequestTracker',
+        ),
+    ]
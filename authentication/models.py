@@ -1,7 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin, Group, Permission
 from django.utils import timezone
-from rest_framework_simplejwt.tokens import RefreshToken
+from .tokens import ClaimsRefreshToken
 from datetime import timedelta
 import uuid
 
@@ -14,6 +14,10 @@ class BaseModel(models.Model):
     class Meta:
         abstract = True 
 
+# Lifetimes of the auth artifacts below; rows past them are removed by `purge_auth_artifacts`
+OTP_EXPIRY_TIME = timedelta(seconds=60)
+PASSWORD_RESET_TOKEN_EXPIRY_TIME = timedelta(minutes=15)
+
 AUTH_PROVIDERS = {
     'email': 'email'
 }
@@ -84,7 +88,7 @@ class User(AbstractBaseUser, PermissionsMixin, BaseModel):
         return f"{self.first_name} {self.last_name}".strip()
 
     def tokens(self):
-        refresh = RefreshToken.for_user(self)
+        refresh = ClaimsRefreshToken.for_user(self)
         return {
             'refresh': str(refresh),
             'access': str(refresh.access_token)
@@ -114,42 +118,29 @@ class OTP(BaseModel):
     otp = models.CharField(max_length=6)
     is_verified = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # Verification looks codes up per user; codes alone collide across users
+            models.Index(fields=['user', 'otp'], name='otp_user_code_idx'),
+            models.Index(fields=['created_at'], name='otp_created_idx'),
+        ]
+
     def is_expired(self):
-        OTP_EXPIRY_TIME = timedelta(seconds=60)
         return timezone.now() > self.created_at + OTP_EXPIRY_TIME
 
     def __str__(self):
         return f"OTP(user = {self.user}, otp = {self.otp}, is_verified = {self.is_verified})"
 
 
-class OTPRequestTracker(BaseModel):
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
-    last_request_time = models.DateTimeField(auto_now_add=True)
-    request_count = models.PositiveIntegerField(default=0)
-
-    def reset_request_count(self):
-        self.request_count = 0
-        self.save()
-
-    def can_request_otp(self):
-        if self.last_request_time < timezone.now() - timedelta(hours=24):
-            self.reset_request_count()
-        return self.request_count < 3
-
-    def increment_request_count(self):
-        self.request_count += 1
-        self.save()
-
-    def __str__(self):
-        return f"OTPRequestTracker(user = {self.user}, request_count = {self.request_count})"
-
-
 class PasswordResetToken(BaseModel):
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     token = models.CharField(max_length=64)
 
+    class Meta:
+        indexes = [models.Index(fields=['created_at'], name='password_reset_created_idx')]
+
     def is_expired(self):
-        return timezone.now() > self.created_at + timedelta(minutes=15)
+        return timezone.now() > self.created_at + PASSWORD_RESET_TOKEN_EXPIRY_TIME
 
     def __str__(self):
         return f"PasswordResetToken(user = {self.user}, token = {self.token})"
\ No newline at end of file
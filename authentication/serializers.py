@@ -201,6 +201,7 @@ class OTPSerializer(serializers.Serializer):
 
 """ OTP Verification service"""
 class VerifyOTPSerializer(serializers.Serializer):
+    email = serializers.EmailField()
     otp = serializers.CharField(max_length=6)
 
 """ Password reset request service"""
@@ -0,0 +1,42 @@
+import time
+from django.utils import timezone
+from ..models import OTP, PasswordResetToken, OTP_EXPIRY_TIME, PASSWORD_RESET_TOKEN_EXPIRY_TIME
+
+
+class AuthArtifactPurgeService:
+    """
+    Delete expired OTPs and password reset tokens (GOF: Facade).
+    Rows go in bounded batches: each batch selects at most `batch_size` pks through the
+    timestamp index and deletes them in its own short statement, so locks are held only
+    briefly and concurrent logins keep writing.
+    """
+    # (model, timestamp field, lifetime)
+    ARTIFACTS = (
+        (OTP, 'created_at', OTP_EXPIRY_TIME),
+        (PasswordResetToken, 'created_at', PASSWORD_RESET_TOKEN_EXPIRY_TIME),
+    )
+
+    def __init__(self, batch_size=1000, pause=0.0):
+        self.batch_size = batch_size
+        self.pause = pause  # Seconds to sleep between batches
+
+    def purge(self, now=None):
+        """Purge every artifact type; returns {model name: rows deleted}."""
+        now = now or timezone.now()
+        return {
+            model.__name__: self.purge_model(model, field, now - lifetime)
+            for model, field, lifetime in self.ARTIFACTS
+        }
+
+    def purge_model(self, model, field, cutoff):
+        expired = model.objects.filter(**{f'{field}__lt': cutoff}).order_by(field).values_list('pk', flat=True)
+        deleted = 0
+        while True:
+            pks = list(expired[:self.batch_size])
+            if not pks:
+                return deleted
+            deleted += model.objects.filter(pk__in=pks).delete()[0]
+            if len(pks) < self.batch_size:
+                return deleted
+            if self.pause:
+                time.sleep(self.pause)
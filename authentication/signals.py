@@ -0,0 +1,51 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from common.authentication import revoke_user_tokens
+
+User = get_user_model()
+
+# Bearer requests trust token claims (common.authentication), so changes that make a
+# claim stale revoke the user's tokens; the next login carries fresh claims (GOF: Observer).
+
+
+CLAIMED_FIELDS = ('role', 'is_staff', 'is_active')
+
+
+def _claimed_state(user):
+    # Deferred fields are left out, so a partially loaded user never looks changed
+    return {field: user.__dict__[field] for field in CLAIMED_FIELDS if field in user.__dict__}
+
+
+@receiver(post_init, sender=User)
+def remember_claimed_state(sender, instance, **kwargs):
+    instance._claimed_state = _claimed_state(instance)
+
+
+@receiver(post_save, sender=User)
+def revoke_on_account_change(sender, instance, created, **kwargs):
+    current = _claimed_state(instance)
+    if not created:
+        previous = instance._claimed_state
+        changed = any(previous[field] != value for field, value in current.items() if field in previous)
+        if changed or not instance.is_active:
+            revoke_user_tokens(instance.pk)
+    instance._claimed_state = current
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user_tokens(sender, instance, **kwargs):
+    revoke_user_tokens(instance.pk)
+
+
+@receiver(post_save, sender='doctors.DoctorProfile')
+@receiver(post_save, sender='patients.PatientProfile')
+def revoke_on_profile_soft_delete(sender, instance, created, **kwargs):
+    if instance.is_deleted:
+        revoke_user_tokens(instance.user_id)
+
+
+@receiver(post_delete, sender='doctors.DoctorProfile')
+@receiver(post_delete, sender='patients.PatientProfile')
+def revoke_on_profile_delete(sender, instance, **kwargs):
+    revoke_user_tokens(instance.user_id)
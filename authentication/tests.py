@@ -1,3 +1,230 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core import mail
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from drf_spectacular.drainage import GENERATOR_STATS
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+from common.middleware import AuthenticationMiddleware
+from common.throttling import CacheRateThrottle, IPRateThrottle
+from doctors.models import DoctorProfile
+from patients.models import PatientProfile
+from .models import OTP, PasswordResetToken
+from .services.purge_service import AuthArtifactPurgeService
 
-# Create your tests here.
+User = get_user_model()
+
+
+class AuthenticationMiddlewareTests(TestCase):
+    """Role resolution reads User.role and never touches the profile tables."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = AuthenticationMiddleware(lambda request: HttpResponse())
+
+    def call(self, path, user):
+        request = self.factory.get(path)
+        request.user = user
+        return request, self.middleware(request)
+
+    def test_role_comes_from_user_role_without_queries(self):
+        User.objects.create_user('mwdoc', 'mwdoc@example.com', 'pass1234', role='is_doctor')
+        user = User.objects.get(username='mwdoc')
+        with self.assertNumQueries(0):
+            request, response = self.call('/doctors/appointments/', user)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(request.user_role, 'doctor')
+
+    def test_staff_fallback_and_invalid_role(self):
+        staff = User.objects.create_user('mwstaff', 'mwstaff@example.com', 'pass1234', role='is_superuser', is_staff=True)
+        self.assertEqual(self.call('/patients/staff/appointments/export/', staff)[0].user_role, 'staff')
+        other = User.objects.create_user('mwother', 'mwother@example.com', 'pass1234', role='is_superuser')
+        self.assertEqual(self.call('/doctors/appointments/', other)[1].status_code, 403)
+
+    def test_public_prefixes_skip_checks(self):
+        self.assertEqual(self.call('/auth/login/', AnonymousUser())[1].status_code, 200)
+        self.assertEqual(self.call('/doctors/appointments/', AnonymousUser())[1].status_code, 401)
+
+
+class StatelessJWTTests(TestCase):
+    """Bearer requests are verified once and served from token claims."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('jwtdoc', 'jwtdoc@example.com', 'pass1234', role='is_doctor')
+        cls.doctor = DoctorProfile.objects.create(user=cls.user, specialty='Cardiology', license_number='LIC-JWT')
+
+    def get(self, path, token):
+        return self.client.get(path, HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_token_request_decodes_once_and_skips_user_lookup(self):
+        token = self.user.tokens()['access']
+        original = JWTAuthentication.get_validated_token
+        with mock.patch.object(JWTAuthentication, 'get_validated_token', autospec=True, side_effect=original) as decode:
+            with CaptureQueriesContext(connection) as context:
+                response = self.get('/doctors/schedules/', token)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(decode.call_count, 1)
+        user_table = User._meta.db_table
+        self.assertFalse([query for query in context.captured_queries if f'FROM "{user_table}"' in query['sql']])
+
+    def test_claims_carry_role_and_profile(self):
+        claims = AccessToken(self.user.tokens()['access'])
+        self.assertEqual((claims['role'], claims['doctor_profile_id'], claims['patient_profile_id']), ('is_doctor', self.doctor.pk, None))
+
+    def test_schema_documents_the_bearer_scheme(self):
+        with GENERATOR_STATS.silence():  # Known "unable to guess serializer" warnings for APIViews
+            schema = self.client.get('/api/schema/', {'format': 'json'}).json()
+        self.assertIn('jwtAuth', schema['components']['securitySchemes'])
+        self.assertIn({'jwtAuth': []}, schema['paths']['/doctors/schedules/']['get']['security'])
+
+    def test_invalid_token_is_rejected_by_middleware(self):
+        self.assertEqual(self.get('/doctors/schedules/', 'not-a-token').status_code, 401)
+
+    def test_profiles_created_with_a_token_carry_the_user_names(self):
+        user = User.objects.create_user(
+            'jwtnamed', 'jwtnamed@example.com', 'pass1234', role='is_doctor', first_name='Gregory', last_name='Housewright'
+        )
+        response = self.client.post(
+            '/doctors/profiles/', {'specialty': 'Neurology', 'license_number': 'LIC-JWT-NAMED'},
+            HTTP_AUTHORIZATION=f"Bearer {user.tokens()['access']}", content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['user_full_name'], 'Gregory Housewright')
+        found = self.get('/doctors/directory/?q=housewright', self.user.tokens()['access']).json()['results']
+        self.assertEqual([entry['user_full_name'] for entry in found], ['Gregory Housewright'])
+
+        patient = User.objects.create_user(
+            'jwtpatient', 'jwtpatient@example.com', 'pass1234', role='is_patient', first_name='Lisa', last_name='Cuddy'
+        )
+        response = self.client.post(
+            '/patients/profiles/', {'user': str(patient.pk), 'date_of_birth': '1990-01-01', 'gender': 'female'},
+            HTTP_AUTHORIZATION=f"Bearer {patient.tokens()['access']}", content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['user_full_name'], 'Lisa Cuddy')
+        self.assertTrue(PatientProfile.objects.filter(user=patient).exists())
+
+    def test_deactivated_or_deleted_user_token_is_rejected(self):
+        caches[settings.THROTTLE_CACHE_ALIAS].clear()
+        token = self.user.tokens()['access']
+        self.assertEqual(self.get('/doctors/schedules/', token).status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.get('/doctors/schedules/', token).status_code, 401)
+        self.user.is_active = True
+        self.user.save()
+        self.assertEqual(self.get('/doctors/schedules/', token).status_code, 401)
+        self.assertEqual(self.get('/doctors/schedules/', self.user.tokens()['access']).status_code, 200)
+        other = User.objects.create_user('jwtgone', 'jwtgone@example.com', 'pass1234', role='is_patient')
+        other_token = other.tokens()['access']
+        other.delete()
+        self.assertEqual(self.get('/patients/appointments/', other_token).status_code, 401)
+
+    def test_role_or_profile_change_revokes_claims(self):
+        caches[settings.THROTTLE_CACHE_ALIAS].clear()
+        user = User.objects.create_user('jwtmoved', 'jwtmoved@example.com', 'pass1234', role='is_doctor')
+        doctor = DoctorProfile.objects.create(user=user, specialty='Neurology', license_number='LIC-JWT-MOVED')
+        token = user.tokens()['access']
+        User.objects.only('first_name').get(pk=user.pk).save(update_fields=['first_name'])  # Deferred claims: no change
+        user.last_name = 'Renamed'
+        user.save()
+        self.assertEqual(self.get('/doctors/schedules/', token).status_code, 200)
+        doctor.soft_delete()
+        self.assertEqual(self.get('/doctors/schedules/', token).status_code, 401)
+        doctor.restore()
+        token = User.objects.get(pk=user.pk).tokens()['access']
+        self.assertEqual(self.get('/doctors/schedules/', token).status_code, 200)
+        user.role = 'is_patient'
+        user.save()
+        self.assertEqual(self.get('/doctors/schedules/', token).status_code, 401)
+
+
+class AuthThrottleTests(TestCase):
+    """Auth endpoints are rate limited per IP, email and user from the cache alone."""
+
+    def setUp(self):
+        caches[settings.THROTTLE_CACHE_ALIAS].clear()
+
+    def test_rejected_login_makes_no_queries(self):
+        for _ in range(5):
+            self.assertNotEqual(self.client.post('/auth/login/', {'email': 'nobody@example.com', 'password': 'x'}).status_code, 429)
+        with self.assertNumQueries(0):
+            response = self.client.post('/auth/login/', {'email': 'NOBODY@example.com ', 'password': 'x'})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response.headers)
+        self.assertNotEqual(self.client.post('/auth/login/', {'email': 'other@example.com', 'password': 'x'}).status_code, 429)
+
+    def test_ip_limit_spans_emails(self):
+        with mock.patch.dict(IPRateThrottle.THROTTLE_RATES, {'auth_ip': '2/min'}):
+            statuses = [
+                self.client.post('/auth/password-reset/', {'email': f'ip{index}@example.com'}).status_code for index in range(3)
+            ]
+        self.assertEqual(statuses, [404, 404, 429])
+
+    def test_otp_resend_window_slides(self):
+        User.objects.create_user('resender', 'resender@example.com', 'pass1234', role='is_patient')
+        post = lambda: self.client.post('/auth/otp/resend/', {'email': 'resender@example.com'})
+        with mock.patch.dict(IPRateThrottle.THROTTLE_RATES, {'auth_email': '10/min'}):
+            self.assertEqual([post().status_code for _ in range(3)], [200, 200, 200])
+            with self.assertNumQueries(0):
+                self.assertEqual(post().status_code, 429)
+            self.assertEqual(len(mail.outbox), 3)
+            later = CacheRateThrottle.timer() + 24 * 3600 + 1
+            with mock.patch.object(CacheRateThrottle, 'timer', lambda self: later):
+                self.assertEqual(post().status_code, 200)
+
+
+class OTPVerificationTests(TestCase):
+    """OTPs are verified per (email, code) and expired artifacts are purged in batches."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.first = User.objects.create_user('otpfirst', 'otpfirst@example.com', 'pass1234', role='is_patient')
+        cls.second = User.objects.create_user('otpsecond', 'otpsecond@example.com', 'pass1234', role='is_patient')
+
+    def setUp(self):
+        caches[settings.THROTTLE_CACHE_ALIAS].clear()
+
+    def verify(self, email, otp):
+        return self.client.post('/auth/verify-otp/', {'email': email, 'otp': otp})
+
+    def test_colliding_codes_verify_the_right_user(self):
+        OTP.objects.create(user=self.first, otp='123456')
+        OTP.objects.create(user=self.second, otp='123456')
+        self.assertEqual(self.verify('otpsecond@example.com', '123456').status_code, 200)
+        self.assertEqual(User.objects.filter(is_verified=True).get(), self.second)
+        self.assertEqual(self.verify('otpsecond@example.com', '123456').status_code, 404)
+        self.assertEqual(self.verify('otpfirst@example.com', '654321').status_code, 404)
+
+    def test_expired_code_is_rejected(self):
+        otp = OTP.objects.create(user=self.first, otp='111111')
+        OTP.objects.filter(pk=otp.pk).update(created_at=timezone.now() - timedelta(minutes=5))
+        self.assertEqual(self.verify('otpfirst@example.com', '111111').status_code, 400)
+
+    def test_purge_removes_only_expired_rows_in_batches(self):
+        old = timezone.now() - timedelta(days=2)
+        OTP.objects.bulk_create([OTP(user=self.first, otp=f'{index:06d}') for index in range(5)])
+        OTP.objects.update(created_at=old)
+        fresh = OTP.objects.create(user=self.second, otp='222222')
+        PasswordResetToken.objects.create(user=self.first, token='t' * 64)
+        PasswordResetToken.objects.update(created_at=old)
+        with CaptureQueriesContext(connection) as context:
+            counts = AuthArtifactPurgeService(batch_size=2).purge()
+        self.assertEqual(counts, {'OTP': 5, 'PasswordResetToken': 1})
+        self.assertEqual(list(OTP.objects.all()), [fresh])
+        otp_deletes = [query for query in context.captured_queries if query['sql'].startswith(f'DELETE FROM "{OTP._meta.db_table}"')]
+        self.assertEqual(len(otp_deletes), 3)
+        output = StringIO()
+        call_command('purge_auth_artifacts', stdout=output)
+        self.assertIn('Purged 0 OTP', output.getvalue())
@@ -0,0 +1,23 @@
+import time
+from rest_framework_simplejwt.tokens import RefreshToken
+from common.authentication import ROLE_CLAIM, STAFF_CLAIM, ACTIVE_CLAIM, AUTH_TIME_CLAIM, DOCTOR_PROFILE_CLAIM, PATIENT_PROFILE_CLAIM
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token carrying the claims common.authentication.StatelessJWTAuthentication
+    trusts (role, staff and active flags, profile IDs, login time). Access tokens copy them, including ones
+    minted later by the refresh endpoint, so authenticated requests never load the user.
+    """
+    @classmethod
+    def for_user(cls, user):
+        from doctors.models import DoctorProfile
+        from patients.models import PatientProfile
+        token = super().for_user(user)
+        token[ROLE_CLAIM] = user.role
+        token[STAFF_CLAIM] = user.is_staff
+        token[ACTIVE_CLAIM] = user.is_active
+        token[AUTH_TIME_CLAIM] = time.time()
+        token[DOCTOR_PROFILE_CLAIM] = DoctorProfile.objects.filter(user=user).values_list('pk', flat=True).first()
+        token[PATIENT_PROFILE_CLAIM] = PatientProfile.objects.filter(user=user).values_list('pk', flat=True).first()
+        return token
@@ -5,6 +5,7 @@ from .views import (
     PasswordResetConfirmationView, LogoutAPIView,UserDetailUpdateDeleteView
 )
 from rest_framework_simplejwt.views import (TokenRefreshView,)
+from common.throttling import IPRateThrottle
 
 urlpatterns = [
     
@@ -15,7 +16,7 @@ urlpatterns = [
     path('user/<uuid:pk>/', UserDetailUpdateDeleteView.as_view(), name='user-detail-update-delete'),
     path('login/', LoginView.as_view(), name='login'),
     path('logout/', LogoutAPIView.as_view(), name='logout'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/refresh/', TokenRefreshView.as_view(throttle_classes=[IPRateThrottle]), name='token_refresh'),
     path('otp/resend/', ResendOTPView.as_view(), name='otp_resend'),
     path('verify-otp/', VerifyOTPView.as_view(), name='verify_otp'),
     path('password-reset/', PasswordResetRequestView.as_view(), name='password_reset_request'),
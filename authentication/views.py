@@ -1,7 +1,7 @@
 from rest_framework import status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from .models import User, OTP, OTPRequestTracker
+from .models import User, OTP
 from .serializers import (
     RegisterSerializer, LoginSerializer, OTPSerializer,
     PasswordResetRequestSerializer, PasswordResetConfirmSerializer,
@@ -17,9 +17,12 @@ from django.shortcuts import get_object_or_404
 from rest_framework.permissions import IsAuthenticated,AllowAny
 from django.db.models import Q
 from django.utils import timezone
+from common.throttling import AUTH_THROTTLE_CLASSES, OTPResendRateThrottle
 
 class RegisterView(APIView):
     permission_classes = [AllowAny]
+    authentication_classes = []  # Public: no session/token lookup, so throttled requests never hit the database
+    throttle_classes = AUTH_THROTTLE_CLASSES
     def post(self, request):
         serializer = RegisterSerializer(data=request.data)
 
@@ -40,6 +43,7 @@ class RegisterView(APIView):
     
 class UserDetailUpdateDeleteView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = AUTH_THROTTLE_CLASSES
 
     def get_object(self, pk):
         return get_object_or_404(User, pk=pk)
@@ -93,6 +97,8 @@ class UserDetailUpdateDeleteView(APIView):
 
 class LoginView(APIView):
     permission_classes = [AllowAny]
+    authentication_classes = []
+    throttle_classes = AUTH_THROTTLE_CLASSES
     def post(self, request):
         serializer = LoginSerializer(data=request.data, context={'request': request})
 
@@ -112,33 +118,31 @@ class LoginView(APIView):
     
 class VerifyOTPView(APIView):
     permission_classes = [AllowAny]
+    authentication_classes = []
+    throttle_classes = AUTH_THROTTLE_CLASSES
     def post(self, request):
         serializer = VerifyOTPSerializer(data=request.data)
         if serializer.is_valid():
             otp_code = serializer.validated_data['otp']
 
-            try:
-                otp_instance = OTP.objects.get(otp=otp_code)
-                user = otp_instance.user  # direct access
-
-                print("user : ", user.email)  # .email to log properly
+            # (user, otp) index via the unique email; codes alone collide across users
+            otp_instance = OTP.objects.select_related('user').filter(
+                user__email=serializer.validated_data['email'], otp=otp_code, is_verified=False
+            ).order_by('-created_at').first()
+            if otp_instance is None:
+                return Response({'error': "Invalid OTP or already verified"}, status=status.HTTP_404_NOT_FOUND)
 
-                if otp_instance.is_expired():
-                    return Response({'error': 'OTP has expired. Please request a new one.'}, status=status.HTTP_400_BAD_REQUEST)
+            if otp_instance.is_expired():
+                return Response({'error': 'OTP has expired. Please request a new one.'}, status=status.HTTP_400_BAD_REQUEST)
 
-                if otp_instance.otp == otp_code:
-                    user.is_verified = True
-                    user.save()
+            user = otp_instance.user
+            user.is_verified = True
+            user.save(update_fields=['is_verified', 'updated_at'])
 
-                    otp_instance.is_verified = True
-                    otp_instance.save()
+            otp_instance.is_verified = True
+            otp_instance.save(update_fields=['is_verified', 'updated_at'])
 
-                    return Response({"message": "OTP verified successfully."}, status=status.HTTP_200_OK)
-                else:
-                    return Response({'message': "Invalid OTP"}, status=status.HTTP_400_BAD_REQUEST)
-
-            except OTP.DoesNotExist:
-                return Response({'error': "Invalid OTP or already verified"}, status=status.HTTP_404_NOT_FOUND)
+            return Response({"message": "OTP verified successfully."}, status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -146,7 +150,8 @@ class VerifyOTPView(APIView):
 class LogoutAPIView(APIView):
     serializer_class = LogoutSerializer
     permission_classes = [IsAuthenticated]
-    
+    throttle_classes = AUTH_THROTTLE_CLASSES
+
     def post(self, request):
         serializer = self.serializer_class(data=request.data)
         if serializer.is_valid(raise_exception=True):
@@ -156,35 +161,27 @@ class LogoutAPIView(APIView):
     
 class ResendOTPView(APIView):
     permission_classes = [AllowAny]
+    authentication_classes = []
+    throttle_classes = AUTH_THROTTLE_CLASSES + [OTPResendRateThrottle]  # 3 OTP e-mails per address per day
     def post(self, request):
         serializer =  OTPSerializer(data = request.data)
         if serializer.is_valid():
             email = serializer.validated_data['email']
             user = User.objects.filter(email = email).first()
             if user:
-                otp_tracker, _ = OTPRequestTracker.objects.get_or_create(user = user)
-
-                if otp_tracker.can_request_otp():
-                    OTP.objects.filter(user = user , is_verified = False).delete()
-
-                    """ Generate OTP and update counter """
-                    otp = OTP.objects.create(user = user, otp = generate_otp())
+                OTP.objects.filter(user = user , is_verified = False).delete()
 
-                    otp_tracker.increment_request_count()
+                """ Generate OTP (resends are capped by OTPResendRateThrottle) """
+                otp = OTP.objects.create(user = user, otp = generate_otp())
 
-                    """ Sending Email """
-                    send_email(
-                        subject = 'Your OTP Code.',
-                        message = f"Hello {user.username}, \n\nYour OTP code is {otp.otp}. It expires in 150 seconds.",
-                        to_email=user.email
-                    )
+                """ Sending Email """
+                send_email(
+                    subject = 'Your OTP Code.',
+                    message = f"Hello {user.username}, \n\nYour OTP code is {otp.otp}. It expires in 150 seconds.",
+                    to_email=user.email
+                )
 
-                    return Response({'message' : 'OTP resent to your email. '}, status = status.HTTP_200_OK)
-                else:
-                    return Response(
-                        {'error' : "Maximum OTP resend attempts exceeded. Try again after 24 hours."},
-                        status = status.HTTP_429_TOO_MANY_REQUESTS
-                    )
+                return Response({'message' : 'OTP resent to your email. '}, status = status.HTTP_200_OK)
 
             else:
                 return Response(
@@ -197,6 +194,8 @@ class ResendOTPView(APIView):
 
 class PasswordResetRequestView(APIView):
     permission_classes = [AllowAny]
+    authentication_classes = []
+    throttle_classes = AUTH_THROTTLE_CLASSES
     def post(self, request):
         serializer = PasswordResetRequestSerializer(data=request.data)
         if serializer.is_valid():
@@ -222,6 +221,8 @@ class PasswordResetRequestView(APIView):
 
 class PasswordResetConfirmationView(APIView):
     permission_classes = [AllowAny]
+    authentication_classes = []
+    throttle_classes = AUTH_THROTTLE_CLASSES
 
     def post(self,request, uidb64, token):
         data = {
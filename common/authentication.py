@@ -0,0 +1,96 @@
+import time
+import uuid
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+# Claims added to every token by authentication.tokens.ClaimsRefreshToken
+ROLE_CLAIM = 'role'
+STAFF_CLAIM = 'is_staff'
+ACTIVE_CLAIM = 'is_active'
+DOCTOR_PROFILE_CLAIM = 'doctor_profile_id'
+PATIENT_PROFILE_CLAIM = 'patient_profile_id'
+AUTH_TIME_CLAIM = 'auth_time'  # Login time; kept by refresh and rotation, unlike iat
+
+# Per-request memo on the Django HttpRequest, shared by the middleware and DRF
+_RESULT_ATTR = '_stateless_jwt_result'
+_UNSET = object()
+
+# Marks request.user instances built from claims alone (no names, email, ...)
+_CLAIMS_ONLY_ATTR = '_claims_only'
+
+# Per-user revocation cutoff: tokens from logins at or before it are rejected. Set when
+# a claim goes stale (deactivation, deletion, role or profile change) and kept in the
+# THROTTLE_CACHE_ALIAS cache, which settings require to be shared outside DEBUG. It
+# outlives every refresh token, so stale claims cannot come back through refresh.
+_REVOKED_KEY = 'auth:revoked:{}'
+
+
+def _revoked_cache():
+    return caches[settings.THROTTLE_CACHE_ALIAS]
+
+
+def revoke_user_tokens(user_pk):
+    """Reject every token issued to the user so far; the next login gets fresh claims."""
+    timeout = int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+    _revoked_cache().set(_REVOKED_KEY.format(user_pk), time.time(), timeout=timeout)
+
+
+def is_revoked(user_pk, auth_time):
+    cutoff = _revoked_cache().get(_REVOKED_KEY.format(user_pk))
+    return cutoff is not None and (auth_time or 0) <= cutoff
+
+
+def with_names(user):
+    """`user` with first and last name loaded; a claims-only user is re-read (names only)."""
+    if getattr(user, _CLAIMS_ONLY_ATTR, False):
+        return get_user_model().objects.only('first_name', 'last_name').get(pk=user.pk)
+    return user
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Bearer-token authentication that verifies the token once per request and trusts
+    its claims (GOF: Proxy in front of JWTAuthentication). The outcome is memoized on
+    the underlying HttpRequest, so common.middleware.AuthenticationMiddleware and DRF
+    share one decode. request.user is an unsaved User carrying the pk, role, staff
+    flag and profile IDs from the claims: filters and FK assignments work by pk, and
+    no User row is read (use with_names() where names are needed). Tokens whose claims
+    went stale are rejected through one cache read (revoke_user_tokens). Tokens
+    issued before the claims existed fall back to a lookup.
+    """
+    def authenticate(self, request):
+        http_request = getattr(request, '_request', request)
+        result = getattr(http_request, _RESULT_ATTR, _UNSET)
+        if result is _UNSET:
+            try:
+                result = super().authenticate(http_request)
+            except AuthenticationFailed as exc:
+                result = exc
+            setattr(http_request, _RESULT_ATTR, result)
+        if isinstance(result, AuthenticationFailed):
+            raise result
+        return result
+
+    def get_user(self, validated_token):
+        if ROLE_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        try:
+            user_id = uuid.UUID(str(validated_token[api_settings.USER_ID_CLAIM]))
+        except (KeyError, ValueError):
+            raise AuthenticationFailed("Token contained no recognizable user identification", code='bad_token')
+        if not validated_token.get(ACTIVE_CLAIM, True):
+            raise AuthenticationFailed("User is inactive", code='user_inactive')
+        if is_revoked(user_id, validated_token.get(AUTH_TIME_CLAIM)):
+            raise AuthenticationFailed("Token has been revoked; please log in again", code='token_revoked')
+        user = get_user_model()(
+            pk=user_id, role=validated_token[ROLE_CLAIM], is_staff=validated_token.get(STAFF_CLAIM, False)
+        )
+        setattr(user, _CLAIMS_ONLY_ATTR, True)
+        # Left as _state.adding, so an accidental save() fails on the pk instead of blanking the row
+        user.doctor_profile_id = validated_token.get(DOCTOR_PROFILE_CLAIM)
+        user.patient_profile_id = validated_token.get(PATIENT_PROFILE_CLAIM)
+        return user
@@ -0,0 +1,42 @@
+import hashlib
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+# Conditional GET helpers for APIViews: validators come from one aggregate query, so an
+# unchanged resource is answered with 304 before any row is loaded or serialized.
+
+
+def make_etag(request, *parts):
+    """Strong ETag over the URL (query string included, e.g. ?fields=), the user and parts."""
+    key = repr((request.get_full_path(), str(getattr(request.user, 'pk', '')), *parts))
+    return f'"{hashlib.md5(key.encode()).hexdigest()}"'
+
+
+def queryset_validators(request, queryset, related=()):
+    """
+    (etag, last_modified) for the rows of a queryset from max(updated_at) and count(*).
+    `related` names relations whose updated_at also shows in the body (e.g. 'user' for
+    a serialized full name). Hard deletes change the count; edits move the max.
+    """
+    aggregates = {'count': Count('pk'), 'last': Max('updated_at')}
+    aggregates.update({f'last_{index}': Max(f'{path}__updated_at') for index, path in enumerate(related)})
+    stats = queryset.order_by().aggregate(**aggregates)
+    stamps = [stats[name] for name in stats if name.startswith('last') and stats[name]]
+    last_modified = max(stamps) if stamps else None
+    return make_etag(request, *(stats[name] for name in sorted(stats))), last_modified
+
+
+def not_modified(request, etag, last_modified=None):
+    """Return a 304 (or 412) response when the client's validators settle the request, else None."""
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    return with_validators(response, etag, last_modified) if response is not None else None
+
+
+def with_validators(response, etag, last_modified=None):
+    """Attach ETag and Last-Modified to an outgoing response."""
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
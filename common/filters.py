@@ -0,0 +1,37 @@
+import django_filters
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import ValidationError
+
+# Filter class -> OpenAPI type, checked in order so subclasses match before their bases
+_FILTER_TYPES = (
+    (django_filters.BooleanFilter, OpenApiTypes.BOOL),
+    (django_filters.DateTimeFilter, OpenApiTypes.DATETIME),
+    (django_filters.DateFilter, OpenApiTypes.DATE),
+    (django_filters.TimeFilter, OpenApiTypes.TIME),
+    (django_filters.NumberFilter, OpenApiTypes.INT),
+)
+
+
+def apply_filterset(filterset_class, data, queryset):
+    """
+    Filter a queryset with a FilterSet (the APIViews do not run filter backends).
+    Invalid input raises ValidationError, so the client gets a 400 with per-field errors.
+    """
+    filterset = filterset_class(data, queryset=queryset)
+    if not filterset.is_valid():
+        raise ValidationError(filterset.errors)
+    return filterset.qs
+
+
+def filterset_parameters(filterset_class):
+    """drf-spectacular query parameters documenting every filter of a FilterSet."""
+    parameters = []
+    for name, filter_ in filterset_class.base_filters.items():
+        api_type = next((api_type for cls, api_type in _FILTER_TYPES if isinstance(filter_, cls)), OpenApiTypes.STR)
+        choices = filter_.extra.get('choices')
+        parameters.append(OpenApiParameter(
+            name, api_type, OpenApiParameter.QUERY, required=filter_.extra.get('required', False),
+            description=filter_.label or '', enum=[value for value, _ in choices] if choices else None,
+        ))
+    return parameters
@@ -0,0 +1,7 @@
+from django.db import models
+
+
+class SoftDeleteManager(models.Manager):
+    """Default manager that hides soft-deleted rows (GOF: Proxy over the base queryset)."""
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
@@ -1,62 +1,87 @@
 from django.http import JsonResponse
-from django.contrib.auth import get_user_model
 from rest_framework import status
-from patients.models import PatientProfile
-from doctors.models import DoctorProfile
+from rest_framework.exceptions import AuthenticationFailed
+from .authentication import StatelessJWTAuthentication
 
-User = get_user_model()
+# Public endpoints (no auth or role check). A tuple lets str.startswith test every
+# prefix in one C-level call instead of rebuilding and scanning a list per request.
+PUBLIC_PATH_PREFIXES = (
+    # Auth – Public
+    '/auth/register/',
+    '/auth/login/',
+    '/auth/token/refresh/',
+    '/auth/otp/resend/',
+    '/auth/verify-otp/',
+    '/auth/password-reset/',
+    '/auth/password-reset-confirm/',
+
+    # Admin
+    '/admin/',
+
+    # API Docs
+    '/api/schema/',
+    '/api/docs/',
+    '/api/redoc/',
+)
+
+# User.role -> request.user_role
+ROLE_MAP = {
+    'is_doctor': 'doctor',
+    'is_patient': 'patient',
+}
+
+
+def resolve_role(user):
+    """Request role from the stored User.role (staff as a fallback); None if the user has no valid role."""
+    role = ROLE_MAP.get(user.role)
+    if role is None and user.is_staff:
+        role = 'staff'
+    return role
 
 
 class AuthenticationMiddleware:
     """
     Custom middleware to enforce authentication and role checks on every request.
     Attaches user_role to request if valid (GOF: Chain of Responsibility).
+    The role comes from User.role, so the check adds no queries beyond loading the user.
+    Bearer tokens are verified by StatelessJWTAuthentication, whose memoized result DRF
+    reuses, so a token request is decoded once and reads no User row.
     """
     def __init__(self, get_response):
         self.get_response = get_response
+        self.jwt = StatelessJWTAuthentication()
+
+    def authenticated_user(self, request):
+        """Session user, else the bearer-token user; None when neither is valid."""
+        if request.user.is_authenticated:
+            return request.user
+        try:
+            result = self.jwt.authenticate(request)
+        except AuthenticationFailed:
+            return None
+        return result[0] if result else None
 
     def __call__(self, request):
         # Skip auth checks for public endpoints (e.g., login, register)
-        public_paths = [
-                # Auth – Public
-                '/auth/register/',
-                '/auth/login/',
-                '/auth/token/refresh/',
-                '/auth/otp/resend/',
-                '/auth/verify-otp/',
-                '/auth/password-reset/',
-                '/auth/password-reset-confirm/',
-
-                # Admin
-                '/admin/',
-
-                # API Docs
-                '/api/schema/',
-                '/api/docs/',
-                '/api/redoc/',
-            ]  # Adjust as needed
-        if any(request.path.startswith(path) for path in public_paths):
+        if request.path.startswith(PUBLIC_PATH_PREFIXES):
             return self.get_response(request)
 
-        # Check if user is authenticated
-        if not request.user.is_authenticated:
+        # Check if user is authenticated (session or bearer token)
+        user = self.authenticated_user(request)
+        if user is None:
             return JsonResponse(
                 {"error": "Authentication required."},
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
-        # Check for valid role (patient or doctor profile exists)
-        user = request.user
-        if hasattr(user, 'patient_profile') and user.patient_profile:
-            request.user_role = 'patient'
-        elif hasattr(user, 'doctor_profile') and user.doctor_profile:
-            request.user_role = 'doctor'
-        else:
+        # Check for valid role (doctor or patient account, or clinic staff)
+        request.user_role = resolve_role(user)
+        if request.user_role is None:
             return JsonResponse(
-                {"error": "Invalid user role. Must be patient or doctor."},
+                {"error": "Invalid user role. Must be patient, doctor or staff."},
                 status=status.HTTP_403_FORBIDDEN
             )
 
         # Proceed with the request
         response = self.get_response(request)
-        return response
\ No newline at end of file
+        return response
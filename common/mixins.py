@@ -1,5 +1,6 @@
 from django.db import models
 from django.utils import timezone
+from .managers import SoftDeleteManager
 
 
 class TimestampMixin(models.Model):
@@ -12,10 +13,17 @@ class TimestampMixin(models.Model):
 
 
 class SoftDeleteMixin(models.Model):
-    """Mixin to add soft delete functionality (GOF: Strategy for deletion behavior)."""
+    """
+    Mixin to add soft delete functionality (GOF: Strategy for deletion behavior).
+    `objects` hides soft-deleted rows; `all_with_deleted` includes them. Related-object
+    access and saves use the plain base manager, so history stays reachable.
+    """
     is_deleted = models.BooleanField(default=False)
     deleted_at = models.DateTimeField(null=True, blank=True)
 
+    objects = SoftDeleteManager()
+    all_with_deleted = models.Manager()
+
     class Meta:
         abstract = True
 
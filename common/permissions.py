@@ -10,4 +10,10 @@ class IsOwnerOrAdmin(BasePermission):
 class IsAuthenticatedAndActive(BasePermission):
     """Permission to ensure user is authenticated and active."""
     def has_permission(self, request, view):
-        return request.user and request.user.is_authenticated and request.user.is_active
\ No newline at end of file
+        return request.user and request.user.is_authenticated and request.user.is_active
+
+
+class IsStaff(BasePermission):
+    """Permission for clinic staff (is_staff users) only."""
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated and request.user.is_staff)
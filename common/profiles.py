@@ -0,0 +1,75 @@
+from django.http import Http404
+from doctors.models import DoctorProfile
+from patients.models import PatientProfile
+
+# Per-request memo on the Django HttpRequest: {profile model label: pk or instance}
+_IDS_ATTR = '_profile_ids'
+_PROFILES_ATTR = '_profiles'
+
+
+def _http_request(request):
+    return getattr(request, '_request', request)
+
+
+def _memo(request, attr):
+    http_request = _http_request(request)
+    if not hasattr(http_request, attr):
+        setattr(http_request, attr, {})
+    return getattr(http_request, attr)
+
+
+def _claimed_id(request, model):
+    # doctor_profile_id / patient_profile_id, named after the user's reverse accessor. Only a
+    # set claim is trusted: None may predate a profile created after the token was issued.
+    return getattr(request.user, f"{model._meta.get_field('user').remote_field.related_name}_id", None)
+
+
+def _not_found(model):
+    return Http404(f"No {model._meta.verbose_name} for this user.")
+
+
+def resolve_profile_id(request, model):
+    """
+    The caller's live profile pk for `model`, resolved once per request (GOF: Proxy).
+    Bearer-token users carry it as a claim (see common.authentication), so this is
+    free; session users (and tokens minted before the profile existed) cost one
+    indexed lookup. Raises Http404 without a profile.
+    """
+    memo = _memo(request, _IDS_ATTR)
+    key = model._meta.label
+    if key not in memo:
+        memo[key] = _claimed_id(request, model) or model.objects.filter(user=request.user).values_list('pk', flat=True).first()
+    if memo[key] is None:
+        raise _not_found(model)
+    return memo[key]
+
+
+def resolve_profile(request, model):
+    """The caller's profile instance, for views that need its fields; one query per request."""
+    memo = _memo(request, _PROFILES_ATTR)
+    key = model._meta.label
+    if key not in memo:
+        ids = _memo(request, _IDS_ATTR)
+        profile_id = ids.get(key) or _claimed_id(request, model)
+        lookup = {'pk': profile_id} if profile_id else {'user': request.user}
+        memo[key] = model.objects.filter(**lookup).first()
+        ids[key] = memo[key].pk if memo[key] else None
+    if memo[key] is None:
+        raise _not_found(model)
+    return memo[key]
+
+
+def doctor_id(request):
+    return resolve_profile_id(request, DoctorProfile)
+
+
+def patient_id(request):
+    return resolve_profile_id(request, PatientProfile)
+
+
+def get_doctor(request):
+    return resolve_profile(request, DoctorProfile)
+
+
+def get_patient(request):
+    return resolve_profile(request, PatientProfile)
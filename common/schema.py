@@ -0,0 +1,6 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class StatelessJWTScheme(SimpleJWTScheme):
+    """Documents StatelessJWTAuthentication as the same `jwtAuth` bearer scheme as simplejwt's."""
+    target_class = 'common.authentication.StatelessJWTAuthentication'
@@ -0,0 +1,65 @@
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_QUERY_PARAM = 'fields'
+OMIT_QUERY_PARAM = 'omit'
+
+
+def _split(value):
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+
+def requested_fields(request, available):
+    """
+    Output fields kept by ?fields= / ?omit= on a read request, in declaration order.
+    Returns None when the request asks for the full representation. Unknown names
+    are ignored so clients can share one field list across endpoints.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    fields = _split(request.query_params.get(FIELDS_QUERY_PARAM))
+    omit = _split(request.query_params.get(OMIT_QUERY_PARAM))
+    if not fields and not omit:
+        return None
+    return [name for name in available if (not fields or name in fields) and name not in omit]
+
+
+class SparseFieldsetMixin:
+    """
+    ModelSerializer mixin for sparse fieldsets (GOF: Decorator over the field set).
+    Pass the request in the serializer context to trim the output, and run the
+    queryset through sparse_queryset() so only the needed columns are loaded and
+    joins for unrequested related fields are dropped.
+    `sparse_sources` maps output fields whose source crosses a relation (or reads
+    several columns) to the model paths they need.
+    """
+    sparse_sources = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        keep = requested_fields(self.context.get('request'), list(self.fields))
+        if keep is not None:
+            for name in set(self.fields) - set(keep):
+                self.fields.pop(name)
+
+    @classmethod
+    def sparse_queryset(cls, queryset, request, required=()):
+        """Restrict a queryset to the columns the requested fields read (plus `required`)."""
+        keep = requested_fields(request, cls.Meta.fields)
+        if keep is None:
+            return queryset
+        local = {field.name for field in queryset.model._meta.concrete_fields}
+        columns = {queryset.model._meta.pk.name, *(name.lstrip('-') for name in required)}
+        joins = set()
+        for name in keep:
+            if name in local:
+                columns.add(name)
+            for path in cls.sparse_sources.get(name, ()):
+                parts = path.split('__')
+                # Traversed foreign keys must be loaded too, or only() would defer them
+                columns.update('__'.join(parts[:index]) for index in range(1, len(parts) + 1))
+                if len(parts) > 1:
+                    joins.add('__'.join(parts[:-1]))
+        queryset = queryset.select_related(None)
+        if joins:
+            queryset = queryset.select_related(*joins)
+        return queryset.only(*columns)
@@ -0,0 +1,79 @@
+import re
+from contextlib import contextmanager
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+# Shared test assertions for query shape and query count regressions (imported by the apps' tests.py).
+
+# SQLite reports a full pass over a table as "SCAN <table>" (optionally "USING ... INDEX"
+# when it walks a whole index); a targeted lookup is reported as "SEARCH".
+SQLITE_SCAN = re.compile(r'\bSCAN (?!CONSTANT ROW)(\w+)')
+
+
+def query_plan(queryset):
+    """
+    Return the database plan for a queryset as text. On PostgreSQL sequential scans are
+    disabled for the statement so the planner reports an index path whenever one exists,
+    independent of how small the test tables are.
+    """
+    if connection.vendor == 'postgresql':
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            return queryset.explain()
+    return queryset.explain()
+
+
+class QueryPlanAssertionsMixin:
+    """TestCase mixin asserting that a queryset is answered from a given index."""
+
+    def assertUsesIndex(self, queryset, *indexes):
+        """
+        The plan must read one of `indexes` (index names; for auto-named unique_together
+        indexes, the start of the name). Several names are only for lookups that are
+        equally served by a partial index the backend may not be able to match: SQLite
+        never matches bound parameters against a partial index condition.
+        """
+        plan = query_plan(queryset)
+        if connection.vendor == 'postgresql':
+            self.assertNotIn('Seq Scan', plan, f"Sequential scan in plan:\n{plan}")
+        elif connection.vendor == 'sqlite':
+            self.assertIsNone(SQLITE_SCAN.search(plan), f"Full scan in plan:\n{plan}")
+        self.assertTrue(any(index in plan for index in indexes), f"None of {indexes} in plan:\n{plan}")
+        return plan
+
+
+def count_queries(func):
+    """Run func and return how many queries it issued."""
+    with CaptureQueriesContext(connection) as context:
+        func()
+    return len(context.captured_queries)
+
+
+class QueryBudgetAssertionsMixin:
+    """TestCase mixin asserting that an endpoint's query count does not grow with its data."""
+
+    def assertConstantQueries(self, func, grow, sizes=(1, 500)):
+        """
+        grow(n) brings the dataset up to n rows; func is then measured at each size.
+        Fails when the counts differ (an N+1 somewhere) and returns the common count.
+        """
+        counts = {}
+        for size in sizes:
+            grow(size)
+            counts[size] = count_queries(func)
+        self.assertEqual(len(set(counts.values())), 1, f"Query count grows with rows: {counts}")
+        return counts[sizes[0]]
+
+
+@contextmanager
+def scratch_database(interactive=True, verbosity=0):
+    """
+    Run the block against a freshly created and migrated test database, as the test runner
+    does, so benchmark commands never seed the configured database. It is destroyed on exit.
+    """
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=verbosity, autoclobber=not interactive, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
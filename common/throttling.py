@@ -0,0 +1,61 @@
+import hashlib
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class CacheRateThrottle(SimpleRateThrottle):
+    """
+    Sliding-window rate limit kept in the shared THROTTLE_CACHE_ALIAS cache (GOF: Template
+    Method; subclasses pick the identity). Each key holds the request timestamps inside the
+    window, so a rejection reads one cache entry and never touches the database.
+    Requests without an identity for the scope (no email, anonymous user) are not limited.
+    """
+    cache = caches[settings.THROTTLE_CACHE_ALIAS]
+
+    def get_identity(self, request, view):
+        raise NotImplementedError
+
+    def get_cache_key(self, request, view):
+        identity = self.get_identity(request, view)
+        if not identity:
+            return None
+        # Hashed so emails and tokens make valid keys for any backend (e.g. memcached)
+        digest = hashlib.md5(str(identity).encode(), usedforsecurity=False).hexdigest()
+        return self.cache_format % {'scope': self.scope, 'ident': digest}
+
+
+class IPRateThrottle(CacheRateThrottle):
+    """Per client address (honours NUM_PROXIES for X-Forwarded-For)."""
+    scope = 'auth_ip'
+
+    def get_identity(self, request, view):
+        return self.get_ident(request)
+
+
+class EmailRateThrottle(CacheRateThrottle):
+    """Per email address in the request body, case-insensitive."""
+    scope = 'auth_email'
+
+    def get_identity(self, request, view):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        return email.strip().lower() if isinstance(email, str) else None
+
+
+class CacheUserRateThrottle(CacheRateThrottle):
+    """Per account: the authenticated user, else the account named in the URL (password reset links)."""
+    scope = 'auth_user'
+
+    def get_identity(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return request.user.pk
+        return view.kwargs.get('uidb64')
+
+
+class OTPResendRateThrottle(EmailRateThrottle):
+    """OTP e-mails sent per address over a day."""
+    scope = 'otp_resend'
+
+
+# Applied to every authentication endpoint
+AUTH_THROTTLE_CLASSES = [IPRateThrottle, EmailRateThrottle, CacheUserRateThrottle]
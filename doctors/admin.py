@@ -1,12 +1,31 @@
 from django.contrib import admin
-from .models import DoctorProfile, Schedule
+from .models import DoctorProfile, Schedule, ScheduleOverride, SlotBitmap
 
 @admin.register(DoctorProfile)
 class DoctorProfileAdmin(admin.ModelAdmin):
     list_display = ['user', 'specialty', 'license_number', 'experience_years']
     search_fields = ['user__username', 'specialty']
+    list_filter = ['is_deleted']
+
+    def get_queryset(self, request):
+        # Admins see soft-deleted rows too
+        return self.model.all_with_deleted.all()
 
 @admin.register(Schedule)
 class ScheduleAdmin(admin.ModelAdmin):
     list_display = ['doctor', 'day_of_week', 'start_time', 'end_time', 'is_available']
-    list_filter = ['day_of_week', 'is_available']
+    list_filter = ['day_of_week', 'is_available', 'is_deleted']
+
+    def get_queryset(self, request):
+        # Admins see soft-deleted rows too
+        return self.model.all_with_deleted.all()
+
+@admin.register(ScheduleOverride)
+class ScheduleOverrideAdmin(admin.ModelAdmin):
+    list_display = ['doctor', 'date', 'override_type', 'start_time', 'end_time']
+    list_filter = ['override_type', 'date']
+
+@admin.register(SlotBitmap)
+class SlotBitmapAdmin(admin.ModelAdmin):
+    list_display = ['doctor', 'date', 'updated_at']
+    list_filter = ['date']
@@ -0,0 +1,19 @@
+import django_filters
+from .models import DoctorProfile
+from .utils.constants import SPECIALTIES
+
+
+class DoctorDirectoryFilter(django_filters.FilterSet):
+    """Directory filters; specialty uses the (specialty, id) index on live doctors."""
+    specialty = django_filters.ChoiceFilter(choices=[(name, name) for name in SPECIALTIES], label="Specialty")
+    min_experience = django_filters.NumberFilter(field_name='experience_years', lookup_expr='gte', label="At least this many years")
+    max_experience = django_filters.NumberFilter(field_name='experience_years', lookup_expr='lte', label="At most this many years")
+    q = django_filters.CharFilter(method='skip', label="Search terms matched as prefixes of name, specialty and bio words")
+
+    class Meta:
+        model = DoctorProfile
+        fields = ['specialty', 'min_experience', 'max_experience', 'q']
+
+    def skip(self, queryset, name, value):
+        # Ranking needs the whole query, so DoctorDirectoryService applies the search terms
+        return queryset
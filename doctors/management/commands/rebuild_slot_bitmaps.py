@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from doctors.models import DoctorProfile
+from doctors.services.bitmap_service import SlotBitmapService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-doctor slot bitmaps from schedules and active appointments."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30, help="Number of days ahead to rebuild (default 30)")
+        parser.add_argument('--doctor', type=int, action='append', help="Only rebuild for this doctor profile ID")
+
+    def handle(self, *args, **options):
+        doctors = None
+        if options['doctor']:
+            doctors = DoctorProfile.objects.filter(id__in=options['doctor'])
+        count = SlotBitmapService().rebuild(days=options['days'], doctors=doctors)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} slot bitmaps."))
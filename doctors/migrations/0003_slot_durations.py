@@ -0,0 +1,24 @@
+# Generated by Django 6.0 on 2026-10-17 22:09
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doctors', '0002_slotbitmap'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='doctorprofile',
+            name='service_durations',
+            field=models.JSONField(blank=True, default=dict, help_text='Per service type slot length in minutes, e.g. {"lab": 15}'),
+        ),
+        migrations.AddField(
+            model_name='doctorprofile',
+            name='slot_duration_minutes',
+            field=models.PositiveSmallIntegerField(default=60, help_text='Default slot length in minutes (5-60, multiple of 5)', validators=[django.core.validators.MinValueValidator(5), django.core.validators.MaxValueValidator(60)]),
+        ),
+    ]
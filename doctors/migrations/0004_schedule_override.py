@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-17 23:06
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doctors', '0003_slot_durations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduleOverride',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField(help_text='Date the override applies to')),
+                ('override_type', models.CharField(choices=[('leave', 'Leave'), ('holiday', 'Holiday'), ('extra_shift', 'Extra shift')], help_text='Kind of override', max_length=20)),
+                ('start_time', models.TimeField(blank=True, help_text='Start time for an extra shift', null=True)),
+                ('end_time', models.TimeField(blank=True, help_text='End time for an extra shift', null=True)),
+                ('break_start', models.TimeField(blank=True, help_text='Break start time', null=True)),
+                ('break_end', models.TimeField(blank=True, help_text='Break end time', null=True)),
+                ('reason', models.CharField(blank=True, help_text='Optional note, e.g. public holiday name', max_length=255)),
+                ('doctor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_overrides', to='doctors.doctorprofile')),
+            ],
+            options={
+                'ordering': ['date'],
+                'unique_together': {('doctor', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-17 23:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doctors', '0004_schedule_override'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['doctor', 'day_of_week'], name='schedule_available_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-17 23:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doctors', '0005_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='schedule',
+            name='schedule_available_idx',
+        ),
+        migrations.AlterUniqueTogether(
+            name='schedule',
+            unique_together=set(),
+        ),
+        migrations.AddIndex(
+            model_name='doctorprofile',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['specialty', 'id'], name='doctor_live_specialty_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(condition=models.Q(('is_available', True), ('is_deleted', False)), fields=['doctor', 'day_of_week'], name='schedule_available_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='schedule',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_deleted', False)), fields=('doctor', 'day_of_week'), name='unique_live_schedule_day'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+from django.db import migrations, models
+
+
+# Full-text index over live doctors. The expression must match what
+# DoctorDirectoryService emits (SearchVector('search_text', config='simple')) for
+# PostgreSQL to use it.
+POSTGRES_CREATE = """
+CREATE INDEX IF NOT EXISTS doctor_search_tsv_idx ON doctors_doctorprofile
+USING gin (to_tsvector('simple'::regconfig, COALESCE(search_text, '')))
+WHERE NOT is_deleted;
+"""
+
+POSTGRES_DROP = "DROP INDEX IF EXISTS doctor_search_tsv_idx;"
+
+BATCH_SIZE = 1000
+
+
+def populate_search_text(apps, schema_editor):
+    DoctorProfile = apps.get_model('doctors', 'DoctorProfile')
+    profiles = DoctorProfile._base_manager.select_related('user').only(
+        'id', 'specialty', 'bio', 'user__first_name', 'user__last_name'
+    )
+    batch = []
+    for profile in profiles.iterator(chunk_size=BATCH_SIZE):
+        parts = (profile.user.first_name, profile.user.last_name, profile.specialty, profile.bio)
+        profile.search_text = ' '.join(' '.join(part or '' for part in parts).lower().split())
+        batch.append(profile)
+        if len(batch) >= BATCH_SIZE:
+            DoctorProfile._base_manager.bulk_update(batch, ['search_text'])
+            batch = []
+    if batch:
+        DoctorProfile._base_manager.bulk_update(batch, ['search_text'])
+
+
+def create_search_index(apps, schema_editor):
+    # SQLite falls back to icontains scans, which is fine for test-sized tables
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(POSTGRES_CREATE)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(POSTGRES_DROP)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doctors', '0006_soft_delete_managers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='doctorprofile',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(populate_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
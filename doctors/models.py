@@ -1,6 +1,9 @@
 from django.db import models
+from django.core.validators import MinValueValidator, MaxValueValidator
 from django.contrib.auth import get_user_model
 from common.mixins import TimestampMixin, SoftDeleteMixin  # Added
+from .utils.constants import CLOSED_OVERRIDE_TYPES
+from .utils.helpers import build_search_text
 
 User = get_user_model()
 
@@ -13,10 +16,42 @@ class DoctorProfile(TimestampMixin, SoftDeleteMixin):
     experience_years = models.PositiveIntegerField(default=0, help_text="Years of experience")
     contact_phone = models.CharField(max_length=15, blank=True, help_text="Contact phone number")
     bio = models.TextField(blank=True, help_text="Short biography")
+    slot_duration_minutes = models.PositiveSmallIntegerField(
+        default=60, validators=[MinValueValidator(5), MaxValueValidator(60)],
+        help_text="Default slot length in minutes (5-60, multiple of 5)"
+    )
+    service_durations = models.JSONField(
+        default=dict, blank=True, help_text="Per service type slot length in minutes, e.g. {\"lab\": 15}"
+    )
+    # Denormalized name + specialty + bio for directory search. Kept current by save()
+    # and by doctors.signals on user name changes; indexed on PostgreSQL (migration 0007).
+    search_text = models.TextField(blank=True, default='', editable=False)
+
+    # Fields that feed search_text
+    SEARCH_FIELDS = ('specialty', 'bio')
+
+    class Meta:
+        # Partial indexes cover live rows only, so they stay small as deleted history grows
+        indexes = [
+            models.Index(fields=['specialty', 'id'], condition=models.Q(is_deleted=False), name='doctor_live_specialty_idx'),
+        ]
 
     def __str__(self):
         return f"Dr. {self.user.get_full_name()} - {self.specialty}"
 
+    def build_search_text(self, first_name=None, last_name=None):
+        if first_name is None and last_name is None:
+            first_name, last_name = self.user.first_name, self.user.last_name
+        return build_search_text(first_name, last_name, self.specialty, self.bio)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or set(update_fields) & set(self.SEARCH_FIELDS):
+            self.search_text = self.build_search_text()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'search_text'}
+        super().save(*args, **kwargs)
+
 
 class Schedule(TimestampMixin, SoftDeleteMixin):
     """Model for doctor schedules, supporting weekly availability (GOF: Strategy for time slot logic)."""
@@ -36,7 +71,89 @@ class Schedule(TimestampMixin, SoftDeleteMixin):
     is_available = models.BooleanField(default=True, help_text="Is this schedule active?")
 
     class Meta:
-        unique_together = ('doctor', 'day_of_week')
+        # One live row per weekday; soft-deleted rows do not block a replacement
+        constraints = [
+            models.UniqueConstraint(
+                fields=['doctor', 'day_of_week'], condition=models.Q(is_deleted=False), name='unique_live_schedule_day'
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['doctor', 'day_of_week'], condition=models.Q(is_available=True, is_deleted=False),
+                name='schedule_available_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.doctor} - {self.day_of_week}: {self.start_time} to {self.end_time}"
+
+
+class ScheduleOverride(TimestampMixin):
+    """
+    Date-specific exception to the weekly Schedule. Leave and holidays close the date;
+    an extra shift replaces that date's weekly hours (or opens a normally free day).
+    """
+    doctor = models.ForeignKey(DoctorProfile, on_delete=models.CASCADE, related_name='schedule_overrides')
+    date = models.DateField(help_text="Date the override applies to")
+    override_type = models.CharField(
+        max_length=20,
+        choices=[('leave', 'Leave'), ('holiday', 'Holiday'), ('extra_shift', 'Extra shift')],
+        help_text="Kind of override"
+    )
+    start_time = models.TimeField(null=True, blank=True, help_text="Start time for an extra shift")
+    end_time = models.TimeField(null=True, blank=True, help_text="End time for an extra shift")
+    break_start = models.TimeField(null=True, blank=True, help_text="Break start time")
+    break_end = models.TimeField(null=True, blank=True, help_text="Break end time")
+    reason = models.CharField(max_length=255, blank=True, help_text="Optional note, e.g. public holiday name")
+
+    class Meta:
+        # The unique index on (doctor, date) also serves every date-range lookup
+        unique_together = ('doctor', 'date')
+        ordering = ['date']
+
+    @property
+    def is_available(self):
+        """True when the doctor works on this date (mirrors Schedule.is_available)."""
+        return self.override_type not in CLOSED_OVERRIDE_TYPES and bool(self.start_time and self.end_time)
+
+    def __str__(self):
+        return f"{self.doctor} - {self.override_type} on {self.date}"
+
+
+class SlotBitmap(TimestampMixin):
+    """
+    Per-doctor, per-date availability bitmap with one bit per SLOT_UNIT_MINUTES.
+    Working bits come from the effective schedule for the date (weekly Schedule or a
+    ScheduleOverride, breaks cleared); booked bits track
+    active appointments. Both are stored as hex strings of Python ints.
+    """
+    doctor = models.ForeignKey(DoctorProfile, on_delete=models.CASCADE, related_name='slot_bitmaps')
+    date = models.DateField(help_text="Date the bitmap covers")
+    working_bits = models.CharField(max_length=80, default='0', help_text="Hex bitmap of working units")
+    booked_bits = models.CharField(max_length=80, default='0', help_text="Hex bitmap of booked units")
+
+    class Meta:
+        unique_together = ('doctor', 'date')
+
+    @property
+    def working(self):
+        return int(self.working_bits, 16)
+
+    @working.setter
+    def working(self, value):
+        self.working_bits = format(value, 'x')
+
+    @property
+    def booked(self):
+        return int(self.booked_bits, 16)
+
+    @booked.setter
+    def booked(self, value):
+        self.booked_bits = format(value, 'x')
+
+    @property
+    def free(self):
+        return self.working & ~self.booked
+
+    def __str__(self):
+        return f"{self.doctor} - bitmap for {self.date}"
@@ -1,23 +1,39 @@
 from rest_framework import serializers
-from .models import DoctorProfile, Schedule
+from .models import DoctorProfile, Schedule, ScheduleOverride
 from common.exceptions import InvalidScheduleError
+from common.serializers import SparseFieldsetMixin
+from .utils.constants import SPECIALTIES, MAX_SEARCH_DAYS, DEFAULT_SERVICE_DURATIONS, CLOSED_OVERRIDE_TYPES
 
 
-class DoctorProfileSerializer(serializers.ModelSerializer):
+class DoctorProfileSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for doctor profiles."""
+    sparse_sources = {'user_full_name': ['user__first_name', 'user__last_name']}
     user_full_name = serializers.CharField(source='user.get_full_name', read_only=True)
 
     class Meta:
         model = DoctorProfile
         fields = [
             'id', 'user', 'specialty', 'license_number', 'experience_years',
-            'contact_phone', 'bio', 'user_full_name', 'created_at', 'updated_at'
+            'contact_phone', 'bio', 'slot_duration_minutes', 'service_durations',
+            'user_full_name', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class ScheduleSerializer(serializers.ModelSerializer):
+class DoctorDirectorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Public directory entry for a doctor (no license or contact details)."""
+    sparse_sources = {'user_full_name': ['user__first_name', 'user__last_name']}
+    user_full_name = serializers.CharField(source='user.get_full_name', read_only=True)
+
+    class Meta:
+        model = DoctorProfile
+        fields = ['id', 'user_full_name', 'specialty', 'experience_years', 'bio']
+        read_only_fields = fields
+
+
+class ScheduleSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for doctor schedules with validation for conflicts."""
+    sparse_sources = {'doctor_name': ['doctor__user__first_name', 'doctor__user__last_name']}
     doctor_name = serializers.CharField(source='doctor.user.get_full_name', read_only=True)
 
     class Meta:
@@ -38,4 +54,59 @@ class ScheduleSerializer(serializers.ModelSerializer):
             raise InvalidScheduleError("Start time must be before end time.")
         if break_start and break_end and (break_start < start or break_end > end):
             raise InvalidScheduleError("Break times must be within working hours.")
-        return data
\ No newline at end of file
+        return data
+
+
+class ScheduleOverrideSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Serializer for date-specific schedule overrides (leave, holidays, extra shifts)."""
+    sparse_sources = {'is_available': ['override_type', 'start_time', 'end_time']}
+
+    class Meta:
+        model = ScheduleOverride
+        fields = [
+            'id', 'doctor', 'date', 'override_type', 'start_time', 'end_time',
+            'break_start', 'break_end', 'reason', 'is_available', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'doctor', 'is_available', 'created_at', 'updated_at']
+
+    def validate(self, data):
+        """Closed days carry no hours; extra shifts need valid hours."""
+        override_type = data.get('override_type', getattr(self.instance, 'override_type', None))
+        if override_type in CLOSED_OVERRIDE_TYPES:
+            data.update(start_time=None, end_time=None, break_start=None, break_end=None)
+            return data
+        start = data.get('start_time', getattr(self.instance, 'start_time', None))
+        end = data.get('end_time', getattr(self.instance, 'end_time', None))
+        break_start = data.get('break_start', getattr(self.instance, 'break_start', None))
+        break_end = data.get('break_end', getattr(self.instance, 'break_end', None))
+        if not start or not end:
+            raise InvalidScheduleError("Extra shifts need a start and end time.")
+        if start >= end:
+            raise InvalidScheduleError("Start time must be before end time.")
+        if break_start and break_end and (break_start < start or break_end > end):
+            raise InvalidScheduleError("Break times must be within working hours.")
+        return data
+
+
+class AvailabilitySearchSerializer(serializers.Serializer):
+    """Validate query params for the multi-doctor availability search."""
+    specialty = serializers.ChoiceField(choices=SPECIALTIES, required=False)
+    doctor_ids = serializers.CharField(required=False, help_text="Comma-separated doctor profile IDs")
+    service_type = serializers.ChoiceField(choices=list(DEFAULT_SERVICE_DURATIONS), required=False)
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+
+    def validate_doctor_ids(self, value):
+        try:
+            return [int(doctor_id) for doctor_id in value.split(',') if doctor_id.strip()]
+        except ValueError:
+            raise serializers.ValidationError("Doctor IDs must be comma-separated integers.")
+
+    def validate(self, data):
+        if not data.get('specialty') and not data.get('doctor_ids'):
+            raise serializers.ValidationError("Provide a specialty or doctor_ids.")
+        if data['start_date'] > data['end_date']:
+            raise serializers.ValidationError("Start date must be on or before end date.")
+        if (data['end_date'] - data['start_date']).days >= MAX_SEARCH_DAYS:
+            raise serializers.ValidationError(f"Date range cannot exceed {MAX_SEARCH_DAYS} days.")
+        return data
@@ -1,15 +1,23 @@
+from patients.filters import AppointmentFilter
 from patients.models import Appointment
 from patients.serializers import AppointmentSerializer
+from patients.utils.constants import APPOINTMENT_ORDERING
+from common.filters import apply_filterset
 
 
 class AppointmentService:
     """Service for doctor to view/manage appointments."""
-    def get_appointments(self, doctor, status=None):
-        """Retrieve doctor's appointments."""
-        queryset = Appointment.objects.filter(doctor=doctor)
+    def get_appointments(self, doctor, status=None, filters=None):
+        """
+        Retrieve doctor's appointments with patient and doctor names joined in.
+        `filters` is query data for AppointmentFilter (ValidationError on bad input).
+        """
+        queryset = Appointment.objects.filter(doctor=doctor).select_related('patient__user', 'doctor__user')
         if status:
             queryset = queryset.filter(status=status)
-        return queryset.order_by('appointment_date')
+        if filters:
+            queryset = apply_filterset(AppointmentFilter, filters, queryset)
+        return queryset.order_by(*APPOINTMENT_ORDERING)
 
     def confirm_appointment(self, appointment):
         """Confirm an appointment."""
@@ -20,6 +28,14 @@ class AppointmentService:
             return appointment
         raise ValueError("Cannot confirm appointment.")
 
+    def complete_appointment(self, appointment):
+        """Mark a booked or confirmed appointment as completed (frees its slot)."""
+        if appointment.status in ('booked', 'confirmed'):
+            appointment.status = 'completed'
+            appointment.save()
+            return appointment
+        raise ValueError("Cannot complete appointment.")
+
     def view_upcoming(self, doctor):
         """Get upcoming appointments."""
         from django.utils import timezone
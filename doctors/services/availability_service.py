@@ -0,0 +1,92 @@
+from collections import defaultdict
+from patients.models import Appointment
+from ..utils.constants import ACTIVE_APPOINTMENT_STATUSES
+from ..utils.helpers import time_to_minutes, minutes_to_time
+from .override_service import ScheduleResolver
+
+
+def merge_intervals(intervals):
+    """Merge (start, end) minute intervals into a sorted list of disjoint intervals."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+class AvailabilityEngine:
+    """
+    Compute free slots in memory from the effective schedule and the day's bookings.
+    Loads everything up front (three queries) and sweeps slots against the sorted
+    booked intervals instead of querying per slot (GOF: Strategy reused for schedule fit).
+    """
+    def __init__(self, strategy, slot_minutes=60):
+        self.strategy = strategy
+        self.slot_minutes = slot_minutes
+        self.resolver = ScheduleResolver()
+
+    def load_schedule(self, doctor, date):
+        """Fetch the effective schedule for the date (override first, then the weekly row)."""
+        return self.resolver.resolve(doctor, date)
+
+    def load_booked_intervals(self, doctor, date):
+        """Fetch all active appointments for the doctor and date as minute intervals."""
+        rows = Appointment.objects.filter(
+            doctor=doctor, appointment_date=date, status__in=ACTIVE_APPOINTMENT_STATUSES
+        ).values_list('start_time', 'end_time')
+        return [(time_to_minutes(start), time_to_minutes(end)) for start, end in rows]
+
+    def free_slots(self, schedule, booked_intervals, slot_minutes=None):
+        """Sweep fixed-length slots across the working day, skipping breaks and bookings."""
+        if not schedule:
+            return []
+        slot_minutes = slot_minutes or self.slot_minutes
+        booked = merge_intervals(booked_intervals)
+        day_end = time_to_minutes(schedule.end_time)
+        current = time_to_minutes(schedule.start_time)
+        index = 0
+        slots = []
+        while current + slot_minutes <= day_end:
+            slot_end = current + slot_minutes
+            # Booked intervals ending before this slot can never overlap a later one
+            while index < len(booked) and booked[index][1] <= current:
+                index += 1
+            overlaps = index < len(booked) and booked[index][0] < slot_end
+            start_time, end_time = minutes_to_time(current), minutes_to_time(slot_end)
+            if not overlaps and self.strategy.fits_schedule(schedule, start_time, end_time):
+                slots.append((start_time, end_time))
+            current = slot_end
+        return slots
+
+    def get_available_slots(self, doctor, date):
+        """Load the schedule and bookings once, then compute the free slots."""
+        schedule = self.load_schedule(doctor, date)
+        if not schedule:
+            return []
+        return self.free_slots(schedule, self.load_booked_intervals(doctor, date))
+
+    def search_available_slots(self, doctors, start_date, end_date, slot_minutes=None):
+        """
+        Compute free slots for many doctors over a date range.
+        Weekly schedules, overrides and appointments are loaded with one batched query
+        each, keyed by doctor, so the query count does not grow with doctors or days.
+        slot_minutes optionally maps doctor_id to that doctor's slot length.
+        Returns {doctor_id: {date: [(start, end), ...]}} with only non-empty dates.
+        """
+        schedules = self.resolver.resolve_range(doctors, start_date, end_date)
+        booked = defaultdict(list)
+        rows = Appointment.objects.filter(
+            doctor__in=doctors, appointment_date__range=(start_date, end_date),
+            status__in=ACTIVE_APPOINTMENT_STATUSES
+        ).values_list('doctor_id', 'appointment_date', 'start_time', 'end_time')
+        for doctor_id, day, start, end in rows:
+            booked[(doctor_id, day)].append((time_to_minutes(start), time_to_minutes(end)))
+
+        results = defaultdict(dict)
+        for (doctor_id, day), schedule in schedules.items():
+            slots = self.free_slots(schedule, booked.get((doctor_id, day), []), (slot_minutes or {}).get(doctor_id))
+            if slots:
+                results[doctor_id][day] = slots
+        return results
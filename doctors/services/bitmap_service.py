@@ -0,0 +1,253 @@
+from collections import defaultdict
+from django.db import connection, transaction
+from django.utils import timezone
+from ..models import SlotBitmap
+from patients.models import Appointment
+from common.utils import add_days_to_date
+from ..utils.constants import ACTIVE_APPOINTMENT_STATUSES, SLOT_UNIT_MINUTES, SLOT_DURATION_MINUTES
+from ..utils.helpers import time_to_minutes, minutes_to_time
+from .cache_service import AvailabilityCache
+from .override_service import ScheduleResolver
+
+
+def covering_mask(start_time, end_time):
+    """Bits for every unit the interval touches (used for bookings and breaks)."""
+    first = time_to_minutes(start_time) // SLOT_UNIT_MINUTES
+    last = -(-time_to_minutes(end_time) // SLOT_UNIT_MINUTES)
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+def inner_mask(start_time, end_time):
+    """Bits for units lying fully inside the interval (used for working hours)."""
+    first = -(-time_to_minutes(start_time) // SLOT_UNIT_MINUTES)
+    last = time_to_minutes(end_time) // SLOT_UNIT_MINUTES
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+def is_unit_aligned(start_time, end_time):
+    """True when both ends fall on a unit boundary, so units are never shared."""
+    return (time_to_minutes(start_time) % SLOT_UNIT_MINUTES == 0 and
+            time_to_minutes(end_time) % SLOT_UNIT_MINUTES == 0)
+
+
+def working_mask(schedule):
+    """Working hours of a schedule row minus its break."""
+    if not schedule:
+        return 0
+    mask = inner_mask(schedule.start_time, schedule.end_time)
+    if schedule.break_start and schedule.break_end:
+        mask &= ~covering_mask(schedule.break_start, schedule.break_end)
+    return mask
+
+
+def masks_allow(working, booked, start_time, end_time):
+    """Slot lies inside working units and touches no booked unit."""
+    mask = covering_mask(start_time, end_time)
+    return mask != 0 and working & ~booked & mask == mask
+
+
+def fit_mask(free, width):
+    """Bits where `width` consecutive free units start (AND of shifts, doubling the span each step)."""
+    fits, span = free, 1
+    while span < width:
+        step = min(span, width - span)
+        fits &= fits >> step
+        span += step
+    return fits
+
+
+def is_active(appointment):
+    """Active appointments are the ones that occupy their slot."""
+    return appointment.status in ACTIVE_APPOINTMENT_STATUSES and not appointment.is_deleted
+
+
+def booked_excluding(booked, doctor, date, exclude):
+    """Booked mask for a doctor-day without `exclude`'s own units (when it occupies that day)."""
+    if exclude is not None and exclude.doctor_id == getattr(doctor, 'pk', doctor) \
+            and exclude.appointment_date == date and is_active(exclude):
+        booked &= ~covering_mask(exclude.start_time, exclude.end_time)
+    return booked
+
+
+def booked_mask(intervals):
+    """OR together the covering masks of (start, end) time intervals."""
+    mask = 0
+    for start, end in intervals:
+        mask |= covering_mask(start, end)
+    return mask
+
+
+class SlotBitmapService:
+    """
+    Maintains SlotBitmap rows and answers availability with bit operations.
+    Rows are built lazily on first read and patched incrementally on every
+    appointment state change (see doctors.signals). Reads go through AvailabilityCache.
+    """
+    def __init__(self):
+        self.cache = AvailabilityCache()
+        self.resolver = ScheduleResolver()
+
+    def _schedule_for(self, doctor, date):
+        return self.resolver.resolve(doctor, date)
+
+    def _booked_intervals(self, doctor, date):
+        return Appointment.objects.filter(
+            doctor=doctor, appointment_date=date, status__in=ACTIVE_APPOINTMENT_STATUSES
+        ).values_list('start_time', 'end_time')
+
+    def build(self, doctor, date):
+        """Compute (working, booked) masks for a doctor and date from the source tables."""
+        return working_mask(self._schedule_for(doctor, date)), booked_mask(self._booked_intervals(doctor, date))
+
+    def get_bitmap(self, doctor, date):
+        """Fetch the bitmap row, building and storing it on first access."""
+        bitmap = SlotBitmap.objects.filter(doctor=doctor, date=date).first()
+        if bitmap:
+            return bitmap
+        working, booked = self.build(doctor, date)
+        bitmap, _ = SlotBitmap.objects.get_or_create(
+            doctor=doctor, date=date,
+            defaults={'working_bits': format(working, 'x'), 'booked_bits': format(booked, 'x')}
+        )
+        return bitmap
+
+    def get_masks(self, doctor, date):
+        """Return (working, booked) masks, served from the availability cache when possible."""
+        def load():
+            bitmap = self.get_bitmap(doctor, date)
+            return bitmap.working, bitmap.booked
+        return self.cache.get_or_load(doctor, date, load)
+
+    def lock_day(self, doctor, date, timeout_ms=None):
+        """
+        Lock the doctor-day bitmap row for the current transaction, creating it first if
+        needed. Bookings for the same doctor and date serialize on this row while other
+        doctors and days proceed in parallel. Must be called inside transaction.atomic().
+        """
+        if timeout_ms and connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(f"SET LOCAL lock_timeout = {int(timeout_ms)}")
+        bitmap = SlotBitmap.objects.select_for_update().filter(doctor=doctor, date=date).first()
+        if bitmap is None:
+            self.get_bitmap(doctor, date)
+            bitmap = SlotBitmap.objects.select_for_update().get(doctor=doctor, date=date)
+        return bitmap
+
+    def is_free(self, doctor, date, start_time, end_time):
+        """Slot lies inside working hours and touches no booked unit."""
+        working, booked = self.get_masks(doctor, date)
+        return masks_allow(working, booked, start_time, end_time)
+
+    def overlaps_booking(self, doctor, date, start_time, end_time, exclude=None):
+        """Slot touches a booked unit, optionally ignoring one appointment's own bits."""
+        _, booked = self.get_masks(doctor, date)
+        booked = booked_excluding(booked, doctor, date, exclude)
+        return booked & covering_mask(start_time, end_time) != 0
+
+    def free_slots(self, doctor, date, slot_minutes=SLOT_DURATION_MINUTES, mode='grid'):
+        """
+        List free (start, end) slots of slot_minutes length.
+        grid: fixed grid anchored at the first working unit (the schedule start).
+        packed: slots placed back to back from the start of each free gap, so bookings
+        of mixed lengths sit flush against each other and breaks instead of leaving
+        sub-slot fragments between them.
+        """
+        working, booked = self.get_masks(doctor, date)
+        free = working & ~booked
+        if not free:
+            return []
+        width = slot_minutes // SLOT_UNIT_MINUTES
+        fits = fit_mask(free, width)
+        if mode == 'packed':
+            starts = []
+            gap_starts = free & ~(free << 1)
+            while gap_starts:
+                lowest = gap_starts & -gap_starts
+                unit = lowest.bit_length() - 1
+                while fits >> unit & 1:
+                    starts.append(unit)
+                    unit += width
+                gap_starts ^= lowest
+        else:
+            anchor = (working & -working).bit_length() - 1
+            starts = [unit for unit in range(anchor, fits.bit_length(), width) if fits >> unit & 1]
+        return [
+            (minutes_to_time(unit * SLOT_UNIT_MINUTES), minutes_to_time((unit + width) * SLOT_UNIT_MINUTES))
+            for unit in starts
+        ]
+
+    def apply_change(self, appointment, previous=None):
+        """
+        Patch bitmaps after an appointment changes state.
+        previous is the (date, start, end, was_active) tuple before the change, if any.
+        """
+        if previous:
+            old_date, old_start, old_end, was_active = previous
+            if was_active:
+                self._release(appointment.doctor_id, old_date, old_start, old_end)
+        if is_active(appointment):
+            with transaction.atomic():
+                bitmap = SlotBitmap.objects.select_for_update().filter(
+                    doctor_id=appointment.doctor_id, date=appointment.appointment_date
+                ).first()
+                if bitmap:
+                    bitmap.booked |= covering_mask(appointment.start_time, appointment.end_time)
+                    bitmap.save(update_fields=['booked_bits', 'updated_at'])
+
+    @transaction.atomic
+    def _release(self, doctor_id, date, start_time, end_time):
+        bitmap = SlotBitmap.objects.select_for_update().filter(doctor_id=doctor_id, date=date).first()
+        if not bitmap:
+            return
+        if is_unit_aligned(start_time, end_time):
+            bitmap.booked &= ~covering_mask(start_time, end_time)
+        else:
+            # A partial unit may be shared with a neighbouring booking; recompute the day
+            bitmap.booked = booked_mask(self._booked_intervals(doctor_id, date))
+        bitmap.save(update_fields=['booked_bits', 'updated_at'])
+
+    def release(self, appointment):
+        """Free an appointment's units, e.g. after it is deleted."""
+        if is_active(appointment):
+            self._release(appointment.doctor_id, appointment.appointment_date, appointment.start_time, appointment.end_time)
+
+    def invalidate(self, doctor):
+        """Drop a doctor's current and future bitmaps after a schedule change."""
+        SlotBitmap.objects.filter(doctor=doctor, date__gte=timezone.now().date()).delete()
+
+    def rebuild(self, days=30, doctors=None):
+        """Delete and rebuild bitmaps for the next `days` days with batched queries."""
+        start = timezone.now().date()
+        end = add_days_to_date(start, days - 1)
+        # Only the rebuilt window; rows (and cached masks) outside it stay valid
+        existing = SlotBitmap.objects.filter(date__range=(start, end))
+        appointments = Appointment.objects.filter(
+            appointment_date__range=(start, end), status__in=ACTIVE_APPOINTMENT_STATUSES
+        )
+        if doctors is not None:
+            existing = existing.filter(doctor__in=doctors)
+            appointments = appointments.filter(doctor__in=doctors)
+        existing.delete()
+
+        booked = defaultdict(list)
+        for doctor_id, day, start_time, end_time in appointments.values_list(
+            'doctor_id', 'appointment_date', 'start_time', 'end_time'
+        ):
+            booked[(doctor_id, day)].append((start_time, end_time))
+
+        rows = [
+            SlotBitmap(
+                doctor_id=doctor_id, date=day,
+                working_bits=format(working_mask(schedule), 'x'),
+                booked_bits=format(booked_mask(booked.get((doctor_id, day), [])), 'x'),
+            )
+            for (doctor_id, day), schedule in self.resolver.resolve_range(doctors, start, end).items()
+        ]
+        SlotBitmap.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+        for doctor_id in {row.doctor_id for row in rows}:
+            self.cache.invalidate_doctor(doctor_id)
+        return len(rows)
@@ -0,0 +1,65 @@
+import threading
+from django.conf import settings
+from django.core.cache import caches
+
+
+class AvailabilityCache:
+    """
+    Doctor/date scoped cache of (working, booked) bitmap masks (GOF: Proxy in front of SlotBitmapService).
+    A per-doctor generation number lets a schedule change drop every cached date at once.
+    Hit/miss counters are kept per process.
+    """
+    _lock = threading.Lock()
+    hits = 0
+    misses = 0
+
+    def __init__(self):
+        self.cache = caches[getattr(settings, 'AVAILABILITY_CACHE_ALIAS', 'default')]
+        self.timeout = getattr(settings, 'AVAILABILITY_CACHE_TIMEOUT', 300)
+
+    @staticmethod
+    def _doctor_id(doctor):
+        return getattr(doctor, 'pk', doctor)
+
+    def _generation_key(self, doctor_id):
+        return f"availability:gen:{doctor_id}"
+
+    def _key(self, doctor_id, date):
+        generation = self.cache.get(self._generation_key(doctor_id), 0)
+        return f"availability:{doctor_id}:{date.isoformat()}:{generation}"
+
+    @classmethod
+    def _record(cls, hit):
+        with cls._lock:
+            if hit:
+                cls.hits += 1
+            else:
+                cls.misses += 1
+
+    @classmethod
+    def stats(cls):
+        """Return hit/miss counters for this process."""
+        total = cls.hits + cls.misses
+        return {'hits': cls.hits, 'misses': cls.misses, 'hit_ratio': cls.hits / total if total else 0.0}
+
+    def get_or_load(self, doctor, date, loader):
+        """Return cached masks for a doctor and date, calling loader() on a miss."""
+        key = self._key(self._doctor_id(doctor), date)
+        value = self.cache.get(key)
+        if value is not None:
+            self._record(hit=True)
+            return value
+        self._record(hit=False)
+        value = loader()
+        self.cache.set(key, value, self.timeout)
+        return value
+
+    def invalidate(self, doctor, date):
+        """Drop the cached masks for one doctor and date."""
+        self.cache.delete(self._key(self._doctor_id(doctor), date))
+
+    def invalidate_doctor(self, doctor):
+        """Drop every cached date for a doctor by bumping its generation."""
+        key = self._generation_key(self._doctor_id(doctor))
+        if not self.cache.add(key, 1, None):
+            self.cache.incr(key)
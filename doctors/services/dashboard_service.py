@@ -0,0 +1,74 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count
+from django.utils import timezone
+from patients.models import Appointment, WaitingList
+from patients.utils.constants import APPOINTMENT_STATUSES
+from .bitmap_service import SlotBitmapService
+from ..utils.constants import DASHBOARD_DAYS, SLOT_UNIT_MINUTES
+
+
+class DashboardService:
+    """
+    Doctor home-screen aggregates (GOF: Facade over appointments, waiting list and bitmaps).
+    Per-day status counts come from one GROUP BY over the (doctor, date, status) index,
+    the waiting-list length from one COUNT, and today's utilization from the cached slot
+    bitmap. The result is cached per doctor and dropped by doctors.signals on change.
+    """
+    def __init__(self):
+        self.cache = caches[getattr(settings, 'AVAILABILITY_CACHE_ALIAS', 'default')]
+        self.timeout = getattr(settings, 'DASHBOARD_CACHE_TIMEOUT', 60)
+        self.bitmaps = SlotBitmapService()
+
+    @staticmethod
+    def _key(doctor_id):
+        return f"dashboard:{doctor_id}"
+
+    def get(self, doctor, today=None):
+        """Return the dashboard for a doctor, from cache when it is still for today."""
+        today = today or timezone.localdate()
+        cached = self.cache.get(self._key(doctor.pk))
+        if cached is not None and cached['today'] == today.isoformat():
+            return cached
+        dashboard = self.build(doctor, today)
+        self.cache.set(self._key(doctor.pk), dashboard, self.timeout)
+        return dashboard
+
+    def build(self, doctor, today):
+        """Compute the dashboard from the source tables."""
+        last_day = today + timedelta(days=DASHBOARD_DAYS - 1)
+        rows = Appointment.objects.filter(
+            doctor=doctor, appointment_date__range=(today, last_day)
+        ).values_list('appointment_date', 'status').annotate(total=Count('id')).order_by()
+        days = {
+            today + timedelta(days=offset): dict.fromkeys(APPOINTMENT_STATUSES, 0)
+            for offset in range(DASHBOARD_DAYS)
+        }
+        for day, status, total in rows:
+            days[day][status] = total
+        waiting = WaitingList.objects.filter(doctor=doctor, requested_date__gte=today, is_notified=False).count()
+        return {
+            'today': today.isoformat(),
+            'days': [
+                {'date': day.isoformat(), 'total': sum(counts.values()), 'by_status': counts}
+                for day, counts in days.items()
+            ],
+            'utilization': self.utilization(doctor, today),
+            'waiting_list': waiting,
+        }
+
+    def utilization(self, doctor, day):
+        """Booked share of the working minutes on a day, from the slot bitmap."""
+        working, booked = self.bitmaps.get_masks(doctor, day)
+        working_minutes = working.bit_count() * SLOT_UNIT_MINUTES
+        booked_minutes = (working & booked).bit_count() * SLOT_UNIT_MINUTES
+        return {
+            'working_minutes': working_minutes,
+            'booked_minutes': booked_minutes,
+            'ratio': round(booked_minutes / working_minutes, 4) if working_minutes else 0.0,
+        }
+
+    def invalidate(self, doctor):
+        """Drop a doctor's cached dashboard."""
+        self.cache.delete(self._key(getattr(doctor, 'pk', doctor)))
@@ -0,0 +1,37 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import FloatField, Value
+from django.db.models.functions import Cast
+from ..models import DoctorProfile
+from ..utils.constants import DIRECTORY_SEARCH_CONFIG
+from ..utils.helpers import search_terms
+
+
+class DoctorDirectoryService:
+    """
+    Ranked doctor directory search over the denormalized DoctorProfile.search_text.
+    PostgreSQL matches every term as a word prefix with to_tsquery against the GIN
+    index from migration 0007 and ranks with ts_rank; other backends fall back to
+    one icontains predicate per term with a flat rank.
+    Results carry a `rank` annotation for keyset pagination on DIRECTORY_ORDERING.
+    """
+    def search(self, queryset=None, query=None):
+        queryset = DoctorProfile.objects.all() if queryset is None else queryset
+        terms = search_terms(query)
+        if not terms:
+            return queryset.annotate(rank=Value(0.0, output_field=FloatField()))
+        if connection.vendor == 'postgresql':
+            return self._full_text(queryset, terms)
+        for term in terms:
+            queryset = queryset.filter(search_text__icontains=term)
+        return queryset.annotate(rank=Value(0.0, output_field=FloatField()))
+
+    @staticmethod
+    def _full_text(queryset, terms):
+        vector = SearchVector('search_text', config=DIRECTORY_SEARCH_CONFIG)
+        # Terms are \w+ only, so they are safe inside a raw tsquery
+        search = SearchQuery(' & '.join(f'{term}:*' for term in terms), config=DIRECTORY_SEARCH_CONFIG, search_type='raw')
+        # float8 so the rank survives the JSON cursor round trip exactly
+        return queryset.alias(document=vector).filter(document=search).annotate(
+            rank=Cast(SearchRank(vector, search), FloatField())
+        )
@@ -9,7 +9,7 @@ class DoctorProfileFactory:
     """Factory for creating DoctorProfile instances (GOF: Factory Pattern)."""
     @staticmethod
     def create_profile(user, specialty, license_number, **kwargs):
-        if DoctorProfile.objects.filter(license_number=license_number).exists():
+        if DoctorProfile.all_with_deleted.filter(license_number=license_number).exists():
             raise ValueError("License number already exists.")
         profile = DoctorProfile.objects.create(
             user=user, specialty=specialty, license_number=license_number, **kwargs
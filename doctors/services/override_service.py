@@ -0,0 +1,47 @@
+from ..models import Schedule, ScheduleOverride
+from common.utils import add_days_to_date
+
+
+class ScheduleResolver:
+    """
+    Resolve a doctor's effective hours per date (GOF: Strategy input for availability).
+    A ScheduleOverride for the date wins over the weekly Schedule row for its weekday.
+    Weekly rows and overrides are read with one indexed query each, so a date range
+    costs two queries however many doctors, days or overrides it spans. Resolved
+    objects expose start_time, end_time, break_start and break_end like Schedule.
+    """
+    def resolve(self, doctor, date):
+        """Effective schedule for one doctor and date, or None when the doctor is off."""
+        doctor_id = getattr(doctor, 'pk', doctor)
+        return self.resolve_range([doctor_id], date, date).get((doctor_id, date))
+
+    def resolve_range(self, doctors, start_date, end_date):
+        """
+        Effective schedules for doctors (ids, instances or a queryset; None for all)
+        over an inclusive date range. Returns {(doctor_id, date): schedule} holding
+        only the dates the doctor works.
+        """
+        days = []
+        current = start_date
+        while current <= end_date:
+            days.append((current, current.strftime('%A').lower()))
+            current = add_days_to_date(current, 1)
+        schedules = Schedule.objects.filter(is_available=True, day_of_week__in={weekday for _, weekday in days})
+        overrides = ScheduleOverride.objects.filter(date__range=(start_date, end_date))
+        if doctors is not None:
+            schedules = schedules.filter(doctor__in=doctors)
+            overrides = overrides.filter(doctor__in=doctors)
+
+        weekly = {}
+        for schedule in schedules:
+            weekly.setdefault(schedule.day_of_week, []).append(schedule)
+        resolved = {}
+        for day, weekday in days:
+            for schedule in weekly.get(weekday, []):
+                resolved[(schedule.doctor_id, day)] = schedule
+        for override in overrides:
+            if override.is_available:
+                resolved[(override.doctor_id, override.date)] = override
+            else:
+                resolved.pop((override.doctor_id, override.date), None)
+        return resolved
@@ -1,11 +1,11 @@
-from ..models import Schedule
-from ..serializers import ScheduleSerializer
+from ..models import DoctorProfile, Schedule, ScheduleOverride
+from ..serializers import ScheduleSerializer, ScheduleOverrideSerializer
 from common.exceptions import InvalidScheduleError
-from patients.models import Appointment
-from datetime import datetime, time, timedelta
 from ..utils.validators import validate_schedule  # Added
-from ..utils.helpers import add_hours_to_time  # Added for slot calc
-from common.utils import get_current_datetime  # Added
+from .availability_service import AvailabilityEngine
+from .bitmap_service import SlotBitmapService
+from .override_service import ScheduleResolver
+from ..utils.helpers import get_slot_minutes
 
 
 class ScheduleFactory:
@@ -25,14 +25,22 @@ class AvailabilityStrategy:
     def check_availability(self, doctor, date, start_time, end_time):
         raise NotImplementedError
 
+    @staticmethod
+    def fits_schedule(schedule, start_time, end_time):
+        raise NotImplementedError
+
 
 class WeeklyAvailabilityStrategy(AvailabilityStrategy):
-    """Check against weekly schedule."""
+    """Check against the weekly schedule, honouring date-specific overrides."""
     def check_availability(self, doctor, date, start_time, end_time):
-        day = date.strftime('%A').lower()
-        schedule = Schedule.objects.filter(doctor=doctor, day_of_week=day, is_available=True).first()
+        schedule = ScheduleResolver().resolve(doctor, date)
         if not schedule:
             return False
+        return self.fits_schedule(schedule, start_time, end_time)
+
+    @staticmethod
+    def fits_schedule(schedule, start_time, end_time):
+        """Check a slot against an already loaded schedule row."""
         # Check within hours, excluding breaks
         if not (schedule.start_time <= start_time < schedule.end_time and
                 schedule.start_time < end_time <= schedule.end_time):
@@ -48,10 +56,11 @@ class ScheduleService:
     """Service for schedule operations."""
     def __init__(self):
         self.strategy = WeeklyAvailabilityStrategy()  # Default strategy
+        self.bitmaps = SlotBitmapService()
 
     def get_schedules(self, doctor):
         """Retrieve doctor's schedules."""
-        return Schedule.objects.filter(doctor=doctor)
+        return Schedule.objects.filter(doctor=doctor).select_related('doctor__user')
 
     def create_schedule(self, doctor, data):
         """Create a new schedule."""
@@ -68,29 +77,71 @@ class ScheduleService:
             return serializer.save()
         raise InvalidScheduleError(serializer.errors)
 
+    def delete_schedule(self, schedule):
+        """Delete schedule (derived bitmaps are dropped by doctors.signals)."""
+        schedule.delete()
+
+    def get_overrides(self, doctor, start_date=None, end_date=None):
+        """Retrieve doctor's date overrides, optionally within a date range."""
+        overrides = ScheduleOverride.objects.filter(doctor=doctor)
+        if start_date:
+            overrides = overrides.filter(date__gte=start_date)
+        if end_date:
+            overrides = overrides.filter(date__lte=end_date)
+        return overrides
+
+    def create_override(self, doctor, data):
+        """Create a date override (derived bitmaps are dropped by doctors.signals)."""
+        serializer = ScheduleOverrideSerializer(data=data)
+        if serializer.is_valid():
+            if ScheduleOverride.objects.filter(doctor=doctor, date=serializer.validated_data['date']).exists():
+                raise InvalidScheduleError("An override already exists for this date.")
+            return serializer.save(doctor=doctor)
+        raise InvalidScheduleError(serializer.errors)
+
+    def update_override(self, override, data):
+        """Update a date override."""
+        serializer = ScheduleOverrideSerializer(override, data=data, partial=True)
+        if serializer.is_valid():
+            new_date = serializer.validated_data.get('date', override.date)
+            if ScheduleOverride.objects.filter(doctor=override.doctor, date=new_date).exclude(pk=override.pk).exists():
+                raise InvalidScheduleError("An override already exists for this date.")
+            return serializer.save()
+        raise InvalidScheduleError(serializer.errors)
+
+    def delete_override(self, override):
+        """Delete a date override, restoring the weekly hours for that date."""
+        override.delete()
+
     def check_availability(self, doctor, date, start_time, end_time):
-        """Check if slot is available using strategy."""
-        if not self.strategy.check_availability(doctor, date, start_time, end_time):
-            return False
-        # Check for existing appointments
-        if Appointment.objects.filter(
-            doctor=doctor, appointment_date=date,
-            start_time__lt=end_time, end_time__gt=start_time, status__in=['booked', 'confirmed']
-        ).exists():
-            return False
-        return True
+        """Check if slot is inside working hours and free, using the slot bitmap."""
+        return self.bitmaps.is_free(doctor, date, start_time, end_time)
 
-    def get_available_slots(self, doctor, date):
-        """Get available slots for a date."""
-        day = date.strftime('%A').lower()
-        schedule = Schedule.objects.filter(doctor=doctor, day_of_week=day, is_available=True).first()
-        if not schedule:
-            return []
-        slots = []
-        current = schedule.start_time
-        while current < schedule.end_time:
-            end_slot = add_hours_to_time(date, current, 1)  # Use helper to add hour
-            if end_slot <= schedule.end_time and self.check_availability(doctor, date, current, end_slot):
-                slots.append((current, end_slot))
-            current = end_slot
-        return slots
\ No newline at end of file
+    def get_available_slots(self, doctor, date, service_type=None, mode='grid'):
+        """Get available slots for a date from the slot bitmap, sized for the service type."""
+        return self.bitmaps.free_slots(doctor, date, get_slot_minutes(doctor, service_type), mode)
+
+    def search_available_slots(self, start_date, end_date, specialty=None, doctor_ids=None, service_type=None):
+        """Get free slots for every matching doctor over a date range (batched queries)."""
+        doctors = DoctorProfile.objects.all()
+        if specialty:
+            doctors = doctors.filter(specialty=specialty)
+        if doctor_ids:
+            doctors = doctors.filter(id__in=doctor_ids)
+        doctors = list(doctors.select_related('user').only(
+            'id', 'specialty', 'slot_duration_minutes', 'service_durations', 'user__first_name', 'user__last_name'
+        ).order_by('id'))
+        engine = AvailabilityEngine(self.strategy)
+        slots = engine.search_available_slots(
+            [doctor.id for doctor in doctors], start_date, end_date,
+            slot_minutes={doctor.id: get_slot_minutes(doctor, service_type) for doctor in doctors},
+        )
+        return [
+            {
+                'doctor': doctor.id,
+                'doctor_name': doctor.user.get_full_name,
+                'specialty': doctor.specialty,
+                'slots': dict(sorted(slots[doctor.id].items())),
+            }
+            for doctor in doctors if doctor.id in slots
+        ]
@@ -0,0 +1,108 @@
+from django.db import transaction
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from .models import DoctorProfile, Schedule, ScheduleOverride, SlotBitmap
+from patients.models import Appointment, WaitingList
+from .services.bitmap_service import SlotBitmapService, is_active
+from .services.cache_service import AvailabilityCache
+from .services.dashboard_service import DashboardService
+
+# Keep slot bitmaps and the availability cache in step with the source rows
+# (GOF: Observer). Covers service calls, admin edits and SoftDeleteMixin.soft_delete.
+
+
+def _slot_state(appointment):
+    return (appointment.appointment_date, appointment.start_time, appointment.end_time, is_active(appointment))
+
+
+@receiver(post_init, sender=Appointment)
+def remember_appointment_slot(sender, instance, **kwargs):
+    instance._slot_state = _slot_state(instance) if instance.pk else None
+
+
+@receiver(post_save, sender=Appointment)
+def sync_appointment_slot(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_slot_state', None)
+    current = _slot_state(instance)
+    if previous != current:
+        SlotBitmapService().apply_change(instance, previous)
+    instance._slot_state = current
+
+
+@receiver(post_delete, sender=Appointment)
+def release_appointment_slot(sender, instance, **kwargs):
+    SlotBitmapService().release(instance)
+
+
+def _after_commit_too(callback):
+    # Evict now so this transaction reads fresh data, and again on commit in case a
+    # concurrent reader cached the old committed value in between. Nothing is written
+    # through, so a rollback can only cost a cache miss.
+    callback()
+    transaction.on_commit(callback)
+
+
+@receiver(post_save, sender=Appointment)
+@receiver(post_delete, sender=Appointment)
+@receiver(post_save, sender=WaitingList)
+@receiver(post_delete, sender=WaitingList)
+@receiver(post_save, sender=Schedule)
+@receiver(post_delete, sender=Schedule)
+@receiver(post_save, sender=ScheduleOverride)
+@receiver(post_delete, sender=ScheduleOverride)
+def invalidate_dashboard(sender, instance, **kwargs):
+    # Counts, waiting list and today's utilization all hang off the doctor
+    _after_commit_too(lambda: DashboardService().invalidate(instance.doctor_id))
+
+
+@receiver(post_save, sender=Schedule)
+@receiver(post_delete, sender=Schedule)
+def invalidate_schedule_bitmaps(sender, instance, **kwargs):
+    SlotBitmapService().invalidate(instance.doctor_id)
+    _after_commit_too(lambda: AvailabilityCache().invalidate_doctor(instance.doctor_id))
+
+
+@receiver(post_init, sender=ScheduleOverride)
+def remember_override_date(sender, instance, **kwargs):
+    instance._override_date = instance.date if instance.pk else None
+
+
+@receiver(post_save, sender=ScheduleOverride)
+@receiver(post_delete, sender=ScheduleOverride)
+def invalidate_override_bitmaps(sender, instance, **kwargs):
+    # Only the override's own dates change; drop those bitmaps (before and after a move)
+    dates = {instance.date, getattr(instance, '_override_date', None)} - {None}
+    SlotBitmap.objects.filter(doctor_id=instance.doctor_id, date__in=dates).delete()
+    cache = AvailabilityCache()
+    _after_commit_too(lambda: [cache.invalidate(instance.doctor_id, day) for day in dates])
+    instance._override_date = instance.date
+
+
+@receiver(post_save, sender=SlotBitmap)
+@receiver(post_delete, sender=SlotBitmap)
+def drop_cached_masks(sender, instance, **kwargs):
+    _after_commit_too(lambda: AvailabilityCache().invalidate(instance.doctor_id, instance.date))
+
+
+def _user_names(user):
+    # Read from __dict__ so deferred name fields are not fetched just to compare them
+    return user.__dict__.get('first_name'), user.__dict__.get('last_name')
+
+
+@receiver(post_init, sender=get_user_model())
+def remember_user_names(sender, instance, **kwargs):
+    instance._search_names = _user_names(instance)
+
+
+@receiver(post_save, sender=get_user_model())
+def refresh_doctor_search_text(sender, instance, created, **kwargs):
+    # Doctor names live on User, so a rename must refresh the denormalized search column
+    names = _user_names(instance)
+    if not created and names != getattr(instance, '_search_names', names):
+        first_name, last_name = instance.first_name, instance.last_name
+        for profile in DoctorProfile.all_with_deleted.filter(user=instance).only('id', 'specialty', 'bio'):
+            DoctorProfile.all_with_deleted.filter(pk=profile.pk).update(
+                search_text=profile.build_search_text(first_name, last_name)
+            )
+    instance._search_names = names
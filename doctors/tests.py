@@ -1,3 +1,630 @@
+from datetime import date, time, timedelta
+from io import StringIO
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from .models import DoctorProfile, Schedule, ScheduleOverride, SlotBitmap
+from .services.schedule_service import ScheduleService, WeeklyAvailabilityStrategy
+from .services.availability_service import AvailabilityEngine
+from .services.appointment_service import AppointmentService
+from .services.cache_service import AvailabilityCache
+from .services.override_service import ScheduleResolver
+from .services.dashboard_service import DashboardService
+from patients.models import PatientProfile, Appointment, WaitingList
+from patients.serializers import AppointmentSerializer
+from patients.services.booking_service import BookingService
+from common.exceptions import AppointmentConflictError
+from common.testing import QueryPlanAssertionsMixin, QueryBudgetAssertionsMixin
 
-# Create your tests here.
+User = get_user_model()
+
+
+class AvailabilityTestCase(TestCase):
+    """Base class that resets the availability cache between tests."""
+
+    def setUp(self):
+        caches['availability'].clear()
+
+
+class AvailableSlotsTests(AvailabilityTestCase):
+    """Tests for the in-memory availability engine behind get_available_slots."""
+
+    @classmethod
+    def setUpTestData(cls):
+        doctor_user = User.objects.create_user('drwho', 'dr@example.com', 'pass1234', role='is_doctor')
+        patient_user = User.objects.create_user('amy', 'amy@example.com', 'pass1234', role='is_patient')
+        cls.doctor = DoctorProfile.objects.create(user=doctor_user, specialty='Cardiology', license_number='LIC-1')
+        cls.patient = PatientProfile.objects.create(user=patient_user, date_of_birth=date(1990, 1, 1), gender='female')
+        cls.day = date(2030, 1, 7)  # A Monday
+        Schedule.objects.create(
+            doctor=cls.doctor, day_of_week='monday', start_time=time(9), end_time=time(17),
+            break_start=time(12), break_end=time(13)
+        )
+        bookings = [(time(10), time(11), 'booked'), (time(14, 30), time(15, 30), 'confirmed'), (time(16), time(17), 'canceled')]
+        for index, (start, end, status) in enumerate(bookings):
+            Appointment.objects.create(
+                patient=cls.patient, doctor=cls.doctor, appointment_date=cls.day, start_time=start,
+                end_time=end, service_type='consultation', status=status, appointment_id=f'APT-T{index}'
+            )
+
+    def test_slots_skip_breaks_and_active_bookings(self):
+        slots = ScheduleService().get_available_slots(self.doctor, self.day)
+        self.assertEqual(slots, [(time(9), time(10)), (time(11), time(12)), (time(13), time(14)), (time(16), time(17))])
+
+    def test_slots_match_per_slot_availability_checks(self):
+        service = ScheduleService()
+        expected = [
+            (time(hour), time(hour + 1)) for hour in range(9, 17)
+            if service.check_availability(self.doctor, self.day, time(hour), time(hour + 1))
+        ]
+        self.assertEqual(service.get_available_slots(self.doctor, self.day), expected)
+
+    def test_engine_uses_at_most_three_queries(self):
+        engine = AvailabilityEngine(WeeklyAvailabilityStrategy())
+        with self.assertNumQueries(3):
+            slots = engine.get_available_slots(self.doctor, self.day)
+        self.assertEqual(slots, ScheduleService().get_available_slots(self.doctor, self.day))
+
+    def test_warm_read_is_served_from_cache(self):
+        service = ScheduleService()
+        service.get_available_slots(self.doctor, self.day)
+        with self.assertNumQueries(0):
+            service.get_available_slots(self.doctor, self.day)
+            service.check_availability(self.doctor, self.day, time(9), time(10))
+
+    def test_no_schedule_returns_no_slots(self):
+        self.assertEqual(ScheduleService().get_available_slots(self.doctor, date(2030, 1, 8)), [])
+
+
+class AvailabilitySearchTests(AvailabilityTestCase):
+    """Tests for the batched multi-doctor availability search."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.doctors = []
+        for index in range(3):
+            user = User.objects.create_user(f'doc{index}', f'doc{index}@example.com', 'pass1234', role='is_doctor')
+            doctor = DoctorProfile.objects.create(user=user, specialty='Neurology', license_number=f'LIC-N{index}')
+            for day in ('monday', 'wednesday'):
+                Schedule.objects.create(doctor=doctor, day_of_week=day, start_time=time(9), end_time=time(12))
+            cls.doctors.append(doctor)
+        patient_user = User.objects.create_user('rory', 'rory@example.com', 'pass1234', role='is_patient')
+        cls.patient_user = patient_user
+        cls.patient = PatientProfile.objects.create(user=patient_user, date_of_birth=date(1990, 1, 1), gender='male')
+        Appointment.objects.create(
+            patient=cls.patient, doctor=cls.doctors[0], appointment_date=date(2030, 1, 7), start_time=time(9),
+            end_time=time(10), service_type='consultation', appointment_id='APT-S1'
+        )
+
+    def test_search_returns_slots_per_doctor_and_date(self):
+        results = ScheduleService().search_available_slots(date(2030, 1, 7), date(2030, 1, 13), specialty='Neurology')
+        self.assertEqual([result['doctor'] for result in results], [doctor.id for doctor in self.doctors])
+        first = results[0]['slots']
+        self.assertEqual(list(first), [date(2030, 1, 7), date(2030, 1, 9)])
+        self.assertEqual(first[date(2030, 1, 7)], [(time(10), time(11)), (time(11), time(12))])
+        self.assertEqual(len(results[1]['slots'][date(2030, 1, 7)]), 3)
+
+    def test_search_query_count_is_independent_of_range_and_doctors(self):
+        with self.assertNumQueries(4):
+            ScheduleService().search_available_slots(date(2030, 1, 7), date(2030, 2, 5), specialty='Neurology')
+        with self.assertNumQueries(4):
+            ScheduleService().search_available_slots(
+                date(2030, 1, 7), date(2030, 1, 7), doctor_ids=[self.doctors[1].id]
+            )
+
+    def test_search_endpoint_validates_range(self):
+        self.client.force_login(self.patient_user)
+        response = self.client.get(
+            '/doctors/availability/search/', {'specialty': 'Neurology', 'start_date': '2030-01-01', 'end_date': '2030-03-01'}
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(
+            '/doctors/availability/search/',
+            {'doctor_ids': f'{self.doctors[0].id}', 'start_date': '2030-01-07', 'end_date': '2030-01-07'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['slots'], {'2030-01-07': ['10:00 AM - 11:00 AM', '11:00 AM - 12:00 PM']})
+
+
+class SlotBitmapTests(AvailabilityTestCase):
+    """Tests for the incrementally maintained slot bitmap."""
+
+    @classmethod
+    def setUpTestData(cls):
+        doctor_user = User.objects.create_user('house', 'house@example.com', 'pass1234', role='is_doctor')
+        patient_user = User.objects.create_user('clara', 'clara@example.com', 'pass1234', role='is_patient')
+        cls.doctor = DoctorProfile.objects.create(user=doctor_user, specialty='Dermatology', license_number='LIC-B1')
+        cls.patient = PatientProfile.objects.create(user=patient_user, date_of_birth=date(1990, 1, 1), gender='female')
+        cls.day = date(2030, 1, 7)
+        Schedule.objects.create(
+            doctor=cls.doctor, day_of_week='monday', start_time=time(9), end_time=time(13),
+            break_start=time(11), break_end=time(11, 30)
+        )
+
+    def book(self, start, end):
+        return BookingService().book_appointment(self.patient, {
+            'doctor': self.doctor.id, 'appointment_date': self.day, 'start_time': start,
+            'end_time': end, 'service_type': 'consultation', 'appointment_id': f'APT-{start:%H%M}',
+        })
+
+    def test_breaks_are_not_available(self):
+        service = ScheduleService()
+        self.assertFalse(service.check_availability(self.doctor, self.day, time(11), time(11, 15)))
+        self.assertEqual(
+            service.get_available_slots(self.doctor, self.day),
+            [(time(9), time(10)), (time(10), time(11)), (time(12), time(13))]
+        )
+
+    def test_booking_cancel_and_complete_update_bitmap(self):
+        service = ScheduleService()
+        service.get_available_slots(self.doctor, self.day)
+        appointment = self.book(time(9), time(9, 30))
+        self.assertFalse(service.check_availability(self.doctor, self.day, time(9, 15), time(9, 45)))
+        self.assertTrue(service.check_availability(self.doctor, self.day, time(9, 30), time(10)))
+        AppointmentService().complete_appointment(appointment)
+        self.assertTrue(service.check_availability(self.doctor, self.day, time(9), time(9, 30)))
+
+    def test_complete_endpoint_frees_the_slot(self):
+        service = ScheduleService()
+        appointment = self.book(time(9), time(9, 30))
+        self.client.force_login(self.doctor.user)
+        self.assertEqual(self.client.post(f'/doctors/appointments/{appointment.pk}/complete/').status_code, 200)
+        appointment.refresh_from_db()
+        self.assertEqual(appointment.status, 'completed')
+        self.assertTrue(service.check_availability(self.doctor, self.day, time(9), time(9, 30)))
+
+    def test_serializer_validate_uses_bitmap(self):
+        self.book(time(10), time(10, 30))
+        serializer = AppointmentSerializer(data={
+            'patient': self.patient.id, 'doctor': self.doctor.id, 'appointment_date': '2030-01-07',
+            'start_time': '10:15', 'end_time': '10:45', 'service_type': 'lab',
+        })
+        with self.assertRaises(AppointmentConflictError):
+            serializer.is_valid()
+
+    def test_schedule_change_invalidates_and_command_rebuilds(self):
+        service = ScheduleService()
+        service.get_available_slots(self.doctor, self.day)
+        service.update_schedule(self.doctor.schedules.get(), {'end_time': time(12)})
+        self.assertFalse(SlotBitmap.objects.filter(doctor=self.doctor, date=self.day).exists())
+        self.assertEqual(service.get_available_slots(self.doctor, self.day)[-1], (time(10), time(11)))
+        output = StringIO()
+        call_command('rebuild_slot_bitmaps', days=7, stdout=output)
+        self.assertEqual(output.getvalue().strip(), "Rebuilt 1 slot bitmaps.")
+        # The rebuilt week plus the untouched row outside it
+        self.assertEqual(SlotBitmap.objects.filter(doctor=self.doctor).count(), 2)
+        self.assertTrue(SlotBitmap.objects.filter(doctor=self.doctor, date=self.day).exists())
+
+    def test_cache_counts_hits_and_misses(self):
+        service = ScheduleService()
+        before = AvailabilityCache.stats()
+        service.get_available_slots(self.doctor, self.day)
+        service.get_available_slots(self.doctor, self.day)
+        after = AvailabilityCache.stats()
+        self.assertEqual(after['misses'] - before['misses'], 1)
+        self.assertEqual(after['hits'] - before['hits'], 1)
+
+    def test_soft_delete_and_direct_saves_invalidate_cache(self):
+        service = ScheduleService()
+        appointment = self.book(time(12), time(13))
+        self.assertEqual(service.get_available_slots(self.doctor, self.day)[-1], (time(10), time(11)))
+        appointment.soft_delete()
+        self.assertEqual(service.get_available_slots(self.doctor, self.day)[-1], (time(12), time(13)))
+        schedule = self.doctor.schedules.get()
+        schedule.is_available = False
+        schedule.save()
+        self.assertEqual(service.get_available_slots(self.doctor, self.day), [])
+
+
+class SlotDurationTests(AvailabilityTestCase):
+    """Tests for configurable slot lengths and the packed slot mode."""
+
+    @classmethod
+    def setUpTestData(cls):
+        doctor_user = User.objects.create_user('grey', 'grey@example.com', 'pass1234', role='is_doctor')
+        patient_user = User.objects.create_user('donna', 'donna@example.com', 'pass1234', role='is_patient')
+        cls.doctor = DoctorProfile.objects.create(
+            user=doctor_user, specialty='Pediatrics', license_number='LIC-D1',
+            slot_duration_minutes=30, service_durations={'lab': 5}
+        )
+        cls.patient = PatientProfile.objects.create(user=patient_user, date_of_birth=date(1990, 1, 1), gender='female')
+        cls.day = date(2030, 1, 7)
+        Schedule.objects.create(doctor=cls.doctor, day_of_week='monday', start_time=time(9), end_time=time(11))
+        Appointment.objects.create(
+            patient=cls.patient, doctor=cls.doctor, appointment_date=cls.day, start_time=time(9),
+            end_time=time(9, 20), service_type='follow_up', appointment_id='APT-D1'
+        )
+
+    def test_doctor_and_service_durations(self):
+        service = ScheduleService()
+        self.assertEqual(service.get_available_slots(self.doctor, self.day)[0], (time(9, 30), time(10)))
+        lab_slots = service.get_available_slots(self.doctor, self.day, service_type='lab')
+        self.assertEqual(len(lab_slots), 20)
+        self.assertEqual(lab_slots[0], (time(9, 20), time(9, 25)))
+        consultation = service.get_available_slots(self.doctor, self.day, service_type='consultation')
+        self.assertEqual(consultation, [(time(10), time(11))])
+
+    def test_packed_mode_starts_slots_at_gap_edges(self):
+        slots = ScheduleService().get_available_slots(self.doctor, self.day, mode='packed')
+        self.assertEqual(slots, [(time(9, 20), time(9, 50)), (time(9, 50), time(10, 20)), (time(10, 20), time(10, 50))])
+
+    def test_invalid_slot_length_is_rejected(self):
+        from django.core.exceptions import ValidationError
+        from .utils.validators import validate_profile
+        with self.assertRaises(ValidationError):
+            validate_profile({'slot_duration_minutes': 7})
+        with self.assertRaises(ValidationError):
+            validate_profile({'service_durations': {'lab': 90}})
+
+
+class ScheduleOverrideTests(AvailabilityTestCase):
+    """Date-specific overrides take precedence over the weekly schedule."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user('drstrange', 'strange@example.com', 'pass1234', role='is_doctor')
+        cls.user = user
+        cls.doctor = DoctorProfile.objects.create(user=user, specialty='Neurology', license_number='LIC-O1')
+        Schedule.objects.create(doctor=cls.doctor, day_of_week='monday', start_time=time(9), end_time=time(12))
+        cls.monday = date(2030, 1, 7)
+        cls.tuesday = date(2030, 1, 8)
+
+    def test_leave_closes_and_extra_shift_opens_a_date(self):
+        service = ScheduleService()
+        self.assertEqual(len(service.get_available_slots(self.doctor, self.monday)), 3)
+        ScheduleOverride.objects.create(doctor=self.doctor, date=self.monday, override_type='leave')
+        ScheduleOverride.objects.create(
+            doctor=self.doctor, date=self.tuesday, override_type='extra_shift', start_time=time(14), end_time=time(16)
+        )
+        self.assertEqual(service.get_available_slots(self.doctor, self.monday), [])
+        self.assertEqual(service.get_available_slots(self.doctor, self.tuesday), [(time(14), time(15)), (time(15), time(16))])
+        self.assertFalse(WeeklyAvailabilityStrategy().check_availability(self.doctor, self.monday, time(9), time(10)))
+        self.assertEqual(service.get_available_slots(self.doctor, date(2030, 1, 14)), [(time(9), time(10)), (time(10), time(11)), (time(11), time(12))])
+
+    def test_removing_override_restores_weekly_hours(self):
+        service = ScheduleService()
+        override = ScheduleOverride.objects.create(doctor=self.doctor, date=self.monday, override_type='holiday')
+        self.assertEqual(service.get_available_slots(self.doctor, self.monday), [])
+        override.delete()
+        self.assertEqual(len(service.get_available_slots(self.doctor, self.monday)), 3)
+
+    def test_range_resolution_uses_two_queries(self):
+        for offset in range(0, 28, 7):
+            ScheduleOverride.objects.create(
+                doctor=self.doctor, date=date(2030, 1, 7 + offset), override_type='extra_shift',
+                start_time=time(13), end_time=time(14)
+            )
+        with self.assertNumQueries(2):
+            resolved = ScheduleResolver().resolve_range([self.doctor.id], date(2030, 1, 1), date(2030, 1, 31))
+        self.assertEqual(len(resolved), 4)
+        self.assertEqual(resolved[(self.doctor.id, date(2030, 1, 14))].start_time, time(13))
+
+    def test_override_endpoint_validates_extra_shift_hours(self):
+        self.client.force_login(self.user)
+        response = self.client.post(
+            '/doctors/schedules/overrides/', {'date': '2030-01-07', 'override_type': 'extra_shift'}
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(
+            '/doctors/schedules/overrides/', {'date': '2030-01-07', 'override_type': 'leave', 'reason': 'Conference'}
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(response.json()['is_available'])
+
+
+class ScheduleQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+    """Weekly schedule lookups must be answered from an index."""
+
+    # The partial available-days index, or the live-day unique index where it cannot be matched
+    WEEKDAY_INDEXES = ('schedule_available_idx', 'unique_live_schedule_day')
+
+    @classmethod
+    def setUpTestData(cls):
+        for index in range(10):
+            user = User.objects.create_user(f'plandoc{index}', f'plandoc{index}@example.com', 'pass1234', role='is_doctor')
+            doctor = DoctorProfile.objects.create(user=user, specialty='Pediatrics', license_number=f'LIC-P{index}')
+            Schedule.objects.bulk_create([
+                Schedule(doctor=doctor, day_of_week=day, start_time=time(9), end_time=time(17), is_available=day != 'sunday')
+                for day in ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+            ])
+        cls.doctor = doctor
+
+    def test_weekday_lookup_uses_index(self):
+        self.assertUsesIndex(
+            Schedule.objects.filter(doctor=self.doctor, day_of_week='monday', is_available=True), *self.WEEKDAY_INDEXES
+        )
+
+    def test_range_resolution_uses_index(self):
+        self.assertUsesIndex(Schedule.objects.filter(
+            doctor__in=[self.doctor.id], day_of_week__in=['monday', 'tuesday'], is_available=True
+        ), *self.WEEKDAY_INDEXES)
+        self.assertUsesIndex(
+            ScheduleOverride.objects.filter(doctor__in=[self.doctor.id], date__range=(date(2030, 1, 1), date(2030, 1, 31))),
+            'doctors_scheduleoverride_doctor_id_date'
+        )
+
+
+class SoftDeleteTests(AvailabilityTestCase):
+    """Default managers hide soft-deleted rows; all_with_deleted keeps them reachable."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user('drhyde', 'hyde@example.com', 'pass1234', role='is_doctor')
+        cls.doctor = DoctorProfile.objects.create(user=user, specialty='Dermatology', license_number='LIC-D1')
+        cls.monday = date(2030, 1, 7)
+
+    def test_soft_deleted_schedule_leaves_availability(self):
+        schedule = Schedule.objects.create(doctor=self.doctor, day_of_week='monday', start_time=time(9), end_time=time(11))
+        service = ScheduleService()
+        self.assertEqual(len(service.get_available_slots(self.doctor, self.monday)), 2)
+        schedule.soft_delete()
+        self.assertEqual(service.get_available_slots(self.doctor, self.monday), [])
+        self.assertFalse(WeeklyAvailabilityStrategy().check_availability(self.doctor, self.monday, time(9), time(10)))
+        self.assertFalse(self.doctor.schedules.exists())
+        self.assertTrue(Schedule.all_with_deleted.filter(pk=schedule.pk).exists())
+        # The deleted row no longer blocks a replacement for the same weekday
+        Schedule.objects.create(doctor=self.doctor, day_of_week='monday', start_time=time(14), end_time=time(15))
+        self.assertEqual(service.get_available_slots(self.doctor, self.monday), [(time(14), time(15))])
+
+    def test_soft_deleted_profile_is_hidden_but_restorable(self):
+        self.doctor.soft_delete()
+        self.assertFalse(DoctorProfile.objects.filter(pk=self.doctor.pk).exists())
+        profile = DoctorProfile.all_with_deleted.get(pk=self.doctor.pk)
+        profile.restore()
+        self.assertTrue(DoctorProfile.objects.filter(pk=self.doctor.pk).exists())
+
+
+class ListQueryBudgetTests(QueryBudgetAssertionsMixin, AvailabilityTestCase):
+    """Doctor list endpoints cost the same number of queries for 1 or 500 rows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user('drbudget', 'budget@example.com', 'pass1234', role='is_doctor')
+        cls.user = user
+        cls.doctor = DoctorProfile.objects.create(user=user, specialty='Cardiology', license_number='LIC-B1')
+        patient_user = User.objects.create_user('budgetee', 'budgetee@example.com', 'pass1234', role='is_patient')
+        cls.patient = PatientProfile.objects.create(user=patient_user, date_of_birth=date(1990, 1, 1), gender='other')
+
+    def add_appointments(self, total):
+        existing = Appointment.objects.count()
+        Appointment.objects.bulk_create([
+            Appointment(
+                patient=self.patient, doctor=self.doctor, appointment_date=date(2030, 1, 1) + timedelta(days=index // 10),
+                start_time=time(8 + index % 10), end_time=time(9 + index % 10), service_type='consultation',
+                appointment_id=f'APT-DBUDGET-{index}'
+            )
+            for index in range(existing, total)
+        ])
+
+    def test_appointment_list(self):
+        self.client.force_login(self.user)
+        self.assertConstantQueries(lambda: self.client.get('/doctors/appointments/', {'page_size': 100}), self.add_appointments)
+        self.assertEqual(len(self.client.get('/doctors/appointments/', {'page_size': 100}).json()['results']), 100)
+
+    def test_schedule_list(self):
+        self.client.force_login(self.user)
+        days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+        def add_schedules(total):
+            for day in days[self.doctor.schedules.count():total]:
+                Schedule.objects.create(doctor=self.doctor, day_of_week=day, start_time=time(9), end_time=time(17))
+        self.assertConstantQueries(lambda: self.client.get('/doctors/schedules/'), add_schedules, sizes=(1, 7))
+        self.assertEqual(len(self.client.get('/doctors/schedules/').json()), 7)
+
+
+class SparseFieldsetTests(AvailabilityTestCase):
+    """Doctor endpoints honour ?fields= and ?omit= in the payload and the query."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('drsparse', 'sparse@example.com', 'pass1234', role='is_doctor')
+        cls.doctor = DoctorProfile.objects.create(
+            user=cls.user, specialty='Cardiology', license_number='LIC-S1', bio='A very long biography. ' * 50
+        )
+
+    def test_profile_fields_drop_bio_column(self):
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f'/doctors/profiles/{self.doctor.pk}/', {'fields': 'id,specialty'})
+        self.assertEqual(response.json(), {'id': self.doctor.pk, 'specialty': 'Cardiology'})
+        self.assertNotIn('"bio"', context.captured_queries[-1]['sql'])
+        self.assertIn('bio', self.client.get('/doctors/profiles/', {'omit': 'user_full_name'}).json()[0])
+
+
+class ConditionalGetTests(AvailabilityTestCase):
+    """Schedule and slot endpoints answer revalidation with 304 before loading rows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('dretag', 'etag@example.com', 'pass1234', role='is_doctor')
+        patient_user = User.objects.create_user('etagpat', 'etagpat@example.com', 'pass1234', role='is_patient')
+        cls.doctor = DoctorProfile.objects.create(user=cls.user, specialty='Cardiology', license_number='LIC-E1')
+        cls.patient = PatientProfile.objects.create(user=patient_user, date_of_birth=date(1990, 1, 1), gender='male')
+        cls.schedule = Schedule.objects.create(doctor=cls.doctor, day_of_week='monday', start_time=time(9), end_time=time(12))
+        cls.day = date(2030, 1, 7)  # A Monday
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_unchanged_schedules_return_304_without_loading_rows(self):
+        response = self.client.get('/doctors/schedules/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Last-Modified'])
+        with CaptureQueriesContext(connection) as context:
+            cached = self.client.get('/doctors/schedules/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached['ETag'], response['ETag'])
+        self.assertFalse(any('"start_time"' in query['sql'] for query in context.captured_queries))
+
+    def test_schedule_change_invalidates_etag(self):
+        etag = self.client.get(f'/doctors/schedules/{self.schedule.pk}/')['ETag']
+        self.assertEqual(self.client.get(f'/doctors/schedules/{self.schedule.pk}/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        Schedule.objects.create(doctor=self.doctor, day_of_week='tuesday', start_time=time(9), end_time=time(12))
+        self.assertEqual(self.client.get('/doctors/schedules/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.schedule.end_time = time(13)
+        self.schedule.save()
+        response = self.client.get(f'/doctors/schedules/{self.schedule.pk}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_sparse_request_has_its_own_etag(self):
+        full = self.client.get(f'/doctors/profiles/{self.doctor.pk}/')['ETag']
+        self.assertNotEqual(self.client.get(f'/doctors/profiles/{self.doctor.pk}/', {'fields': 'id'})['ETag'], full)
+
+    def test_slots_etag_follows_bookings(self):
+        url = '/doctors/schedules/available-slots/'
+        first = self.client.get(url, {'date': self.day.isoformat()})
+        etag = first['ETag']
+        self.assertEqual(self.client.get(url, {'date': self.day.isoformat()}, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        Appointment.objects.create(
+            patient=self.patient, doctor=self.doctor, appointment_date=self.day, start_time=time(9),
+            end_time=time(10), service_type='consultation', appointment_id='APT-E1'
+        )
+        response = self.client.get(url, {'date': self.day.isoformat()}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['available_slots']), len(first.json()['available_slots']) - 1)
+
+
+class DoctorDirectoryTests(AvailabilityTestCase):
+    """Directory search over the denormalized search_text column."""
+
+    @classmethod
+    def setUpTestData(cls):
+        specs = [
+            ('Gregory', 'House', 'Neurology', 20, 'Diagnostics and rare diseases'),
+            ('Lisa', 'Cuddy', 'Pediatrics', 12, 'Endocrinology background'),
+            ('James', 'Wilson', 'Cardiology', 15, 'Oncology and palliative care'),
+            ('Gregor', 'Mendel', 'Cardiology', 3, 'Genetics'),
+        ]
+        cls.doctors = []
+        for index, (first, last, specialty, years, bio) in enumerate(specs):
+            user = User.objects.create_user(f'dir{index}', f'dir{index}@example.com', 'pass1234', role='is_doctor', first_name=first, last_name=last)
+            cls.doctors.append(DoctorProfile.objects.create(
+                user=user, specialty=specialty, license_number=f'LIC-D{index}', experience_years=years, bio=bio
+            ))
+        cls.viewer = cls.doctors[0].user
+
+    def search(self, **params):
+        self.client.force_login(self.viewer)
+        response = self.client.get('/doctors/directory/', params)
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.json()['results']]
+
+    def test_terms_match_name_prefixes_and_bio(self):
+        self.assertEqual(self.search(q='greg'), [self.doctors[0].pk, self.doctors[3].pk])
+        self.assertEqual(self.search(q='Greg house'), [self.doctors[0].pk])
+        self.assertEqual(self.search(q='oncology'), [self.doctors[2].pk])
+
+    def test_specialty_and_experience_filters(self):
+        self.assertEqual(self.search(specialty='Cardiology', min_experience=10), [self.doctors[2].pk])
+        self.client.force_login(self.viewer)
+        self.assertEqual(self.client.get('/doctors/directory/', {'specialty': 'Astrology'}).status_code, 400)
+
+    def test_search_text_follows_profile_and_user_changes(self):
+        doctor = self.doctors[1]
+        doctor.bio = 'Hospital administration'
+        doctor.save(update_fields=['bio'])
+        self.assertEqual(self.search(q='administration'), [doctor.pk])
+        user = doctor.user
+        user.last_name = 'Partridge'
+        user.save()
+        self.assertEqual(self.search(q='partridge'), [doctor.pk])
+        self.assertEqual(self.search(q='cuddy'), [])
+
+    def test_pages_cover_results_and_skip_deleted(self):
+        self.doctors[3].soft_delete()
+        self.client.force_login(self.viewer)
+        body = self.client.get('/doctors/directory/', {'page_size': 2}).json()
+        ids = [row['id'] for row in body['results']]
+        ids += [row['id'] for row in self.client.get(body['next']).json()['results']]
+        self.assertEqual(ids, [doctor.pk for doctor in self.doctors[:3]])
+
+
+class DoctorDashboardTests(AvailabilityTestCase):
+    """Dashboard aggregates: bounded queries, cached, dropped on change."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('drdash', 'dash@example.com', 'pass1234', role='is_doctor')
+        patient_user = User.objects.create_user('dashpat', 'dashpat@example.com', 'pass1234', role='is_patient')
+        cls.doctor = DoctorProfile.objects.create(user=cls.user, specialty='Cardiology', license_number='LIC-DASH')
+        cls.patient = PatientProfile.objects.create(user=patient_user, date_of_birth=date(1990, 1, 1), gender='male')
+        cls.today = date(2030, 1, 7)  # A Monday
+        Schedule.objects.create(doctor=cls.doctor, day_of_week='monday', start_time=time(9), end_time=time(13))
+        for hour, status in [(9, 'booked'), (10, 'confirmed'), (11, 'canceled')]:
+            Appointment.objects.create(
+                patient=cls.patient, doctor=cls.doctor, appointment_date=cls.today, start_time=time(hour),
+                end_time=time(hour + 1), service_type='consultation', status=status
+            )
+        Appointment.objects.create(
+            patient=cls.patient, doctor=cls.doctor, appointment_date=cls.today + timedelta(days=20),
+            start_time=time(9), end_time=time(10), service_type='lab'
+        )
+        WaitingList.objects.create(patient=cls.patient, doctor=cls.doctor, requested_date=cls.today, requested_time=time(9))
+
+    def test_dashboard_aggregates(self):
+        dashboard = DashboardService().get(self.doctor, self.today)
+        self.assertEqual(len(dashboard['days']), 14)
+        self.assertEqual(dashboard['days'][0]['by_status'], {'booked': 1, 'confirmed': 1, 'canceled': 1, 'completed': 0, 'rescheduled': 0})
+        self.assertEqual(sum(day['total'] for day in dashboard['days']), 3)  # Day 20 is outside the window
+        self.assertEqual(dashboard['utilization'], {'working_minutes': 240, 'booked_minutes': 120, 'ratio': 0.5})
+        self.assertEqual(dashboard['waiting_list'], 1)
+
+    def test_cached_until_an_appointment_changes(self):
+        service = DashboardService()
+        service.get(self.doctor, self.today)
+        with self.assertNumQueries(0):
+            service.get(self.doctor, self.today)
+        Appointment.objects.create(
+            patient=self.patient, doctor=self.doctor, appointment_date=self.today, start_time=time(12),
+            end_time=time(13), service_type='consultation'
+        )
+        dashboard = service.get(self.doctor, self.today)
+        self.assertEqual(dashboard['days'][0]['by_status']['booked'], 2)
+        self.assertEqual(dashboard['utilization']['ratio'], 0.75)
+
+    def test_endpoint(self):
+        self.client.force_login(self.user)
+        body = self.client.get('/doctors/dashboard/').json()
+        self.assertEqual(set(body), {'today', 'days', 'utilization', 'waiting_list'})
+
+
+class ProfileResolutionTests(AvailabilityTestCase):
+    """Doctor endpoints take the profile ID from the token and scope lookups by it."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('drclaim', 'drclaim@example.com', 'pass1234', role='is_doctor')
+        cls.doctor = DoctorProfile.objects.create(user=cls.user, specialty='Cardiology', license_number='LIC-CL1')
+        other = User.objects.create_user('drother', 'drother@example.com', 'pass1234', role='is_doctor')
+        cls.other = DoctorProfile.objects.create(user=other, specialty='Cardiology', license_number='LIC-CL2')
+        cls.schedule = Schedule.objects.create(doctor=cls.doctor, day_of_week='monday', start_time=time(9), end_time=time(17))
+        cls.foreign = Schedule.objects.create(doctor=cls.other, day_of_week='monday', start_time=time(9), end_time=time(17))
+
+    def get(self, path, token):
+        return self.client.get(path, HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_token_saves_the_profile_query(self):
+        token = self.user.tokens()['access']
+        with CaptureQueriesContext(connection) as context:
+            response = self.get(f'/doctors/schedules/{self.schedule.pk}/', token)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([query for query in context.captured_queries if f'FROM "{DoctorProfile._meta.db_table}"' in query['sql']])
+
+    def test_lookups_stay_scoped_to_the_caller(self):
+        token = self.user.tokens()['access']
+        self.assertEqual(self.get(f'/doctors/schedules/{self.foreign.pk}/', token).status_code, 404)
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(f'/doctors/schedules/{self.foreign.pk}/').status_code, 404)
+        self.assertEqual(self.client.get(f'/doctors/schedules/{self.schedule.pk}/').status_code, 200)
+
+    def test_profile_created_after_login_is_found(self):
+        user = User.objects.create_user('drlate', 'drlate@example.com', 'pass1234', role='is_doctor')
+        token = user.tokens()['access']
+        self.assertEqual(self.get('/doctors/schedules/', token).status_code, 404)
+        DoctorProfile.objects.create(user=user, specialty='Cardiology', license_number='LIC-CL3')
+        self.assertEqual(self.get('/doctors/schedules/', token).status_code, 200)
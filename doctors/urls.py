@@ -1,22 +1,34 @@
 from django.urls import path
 from .views import (
-    DoctorProfileListCreateView, DoctorProfileDetailView,
+    DoctorProfileListCreateView, DoctorProfileDetailView, DoctorDirectoryView,
     ScheduleListCreateView, ScheduleDetailView, ScheduleAvailableSlotsView,
-    AppointmentListView, AppointmentDetailView, AppointmentConfirmView
+    ScheduleOverrideListCreateView, ScheduleOverrideDetailView,
+    AvailabilitySearchView,
+    DoctorDashboardView,
+    AppointmentListView, AppointmentExportView, AppointmentDetailView, AppointmentConfirmView, AppointmentCompleteView
 )
 
 urlpatterns = [
     # Doctor Profile Endpoints
     path('profiles/', DoctorProfileListCreateView.as_view(), name='doctor-profile-list-create'),
-    path('profiles/<uuid:pk>/', DoctorProfileDetailView.as_view(), name='doctor-profile-detail'),
+    path('profiles/<int:pk>/', DoctorProfileDetailView.as_view(), name='doctor-profile-detail'),
+    path('directory/', DoctorDirectoryView.as_view(), name='doctor-directory'),
 
     # Schedule Endpoints
     path('schedules/', ScheduleListCreateView.as_view(), name='schedule-list-create'),
-    path('schedules/<uuid:pk>/', ScheduleDetailView.as_view(), name='schedule-detail'),
+    path('schedules/<int:pk>/', ScheduleDetailView.as_view(), name='schedule-detail'),
     path('schedules/available-slots/', ScheduleAvailableSlotsView.as_view(), name='schedule-available-slots'),
+    path('schedules/overrides/', ScheduleOverrideListCreateView.as_view(), name='schedule-override-list-create'),
+    path('schedules/overrides/<int:pk>/', ScheduleOverrideDetailView.as_view(), name='schedule-override-detail'),
+    path('availability/search/', AvailabilitySearchView.as_view(), name='availability-search'),
+
+    # Dashboard
+    path('dashboard/', DoctorDashboardView.as_view(), name='doctor-dashboard'),
 
     # Appointment Endpoints (Doctor-side)
     path('appointments/', AppointmentListView.as_view(), name='appointment-list'),
-    path('appointments/<uuid:pk>/', AppointmentDetailView.as_view(), name='appointment-detail'),
-    path('appointments/<uuid:pk>/confirm/', AppointmentConfirmView.as_view(), name='appointment-confirm'),
+    path('appointments/export/', AppointmentExportView.as_view(), name='appointment-export'),
+    path('appointments/<int:pk>/', AppointmentDetailView.as_view(), name='appointment-detail'),
+    path('appointments/<int:pk>/confirm/', AppointmentConfirmView.as_view(), name='appointment-confirm'),
+    path('appointments/<int:pk>/complete/', AppointmentCompleteView.as_view(), name='appointment-complete'),
 ]
\ No newline at end of file
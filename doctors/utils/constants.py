@@ -2,11 +2,24 @@
 
 DEFAULT_WORKING_HOURS_START = '09:00'
 DEFAULT_WORKING_HOURS_END = '17:00'
-SLOT_DURATION_HOURS = 1
+SLOT_DURATION_MINUTES = 60  # Default slot length when a doctor has not configured one
+MIN_SLOT_MINUTES = 5
+MAX_SLOT_MINUTES = 60
+DEFAULT_SERVICE_DURATIONS = {'consultation': 60, 'lab': 15, 'follow_up': 30}
+SLOT_MODES = ['grid', 'packed']
 CANCELLATION_POLICY_HOURS = 24
+ACTIVE_APPOINTMENT_STATUSES = ['booked', 'confirmed', 'rescheduled']  # Statuses that occupy their slot
+MAX_SEARCH_DAYS = 30
+OVERRIDE_TYPES = ['leave', 'holiday', 'extra_shift']
+CLOSED_OVERRIDE_TYPES = ['leave', 'holiday']  # Doctor is off for the whole date
+SLOT_UNIT_MINUTES = 5  # Bitmap granularity: one bit per unit
+UNITS_PER_DAY = 24 * 60 // SLOT_UNIT_MINUTES
 SPECIALTIES = [
     'Cardiology', 'Dermatology', 'Neurology', 'Pediatrics', 'Orthopedics'
 ]
 DAYS_OF_WEEK = [
     'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday'
-]
\ No newline at end of file
+]
+DIRECTORY_ORDERING = ('-rank', 'id')  # Keyset order for ranked directory search
+DIRECTORY_SEARCH_CONFIG = 'simple'  # Text search config; names are not stemmed
+DASHBOARD_DAYS = 14  # Days (from today) covered by the doctor dashboard
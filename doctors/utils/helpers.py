@@ -1,5 +1,7 @@
-from datetime import datetime, timedelta
+import re
+from datetime import datetime, time, timedelta
 from django.utils import timezone
+from .constants import SLOT_DURATION_MINUTES, DEFAULT_SERVICE_DURATIONS
 
 
 def add_hours_to_time(date, base_time, hours):
@@ -18,6 +20,30 @@ def add_hours_to_time(date, base_time, hours):
     return dt.time()
 
 
+def time_to_minutes(value):
+    """Convert a time object to minutes since midnight."""
+    return value.hour * 60 + value.minute
+
+
+def minutes_to_time(minutes):
+    """Convert minutes since midnight back to a time object."""
+    return time(minutes // 60, minutes % 60)
+
+
+def get_slot_minutes(doctor, service_type=None):
+    """
+    Resolve the slot length for a doctor: their per-service override, then the
+    service default, then the doctor's own slot length.
+    """
+    if service_type:
+        overrides = getattr(doctor, 'service_durations', None) or {}
+        if service_type in overrides:
+            return int(overrides[service_type])
+        if service_type in DEFAULT_SERVICE_DURATIONS:
+            return DEFAULT_SERVICE_DURATIONS[service_type]
+    return getattr(doctor, 'slot_duration_minutes', None) or SLOT_DURATION_MINUTES
+
+
 def is_time_within_range(check_time, start, end):
     """Check if time is within range."""
     return start <= check_time <= end
@@ -31,4 +57,13 @@ def format_slot_display(start, end):
 def calculate_age_from_dob(dob):
     """Calculate age from date of birth."""
     today = timezone.now().date()
-    return today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
\ No newline at end of file
+    return today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
+
+def build_search_text(*parts):
+    """Lower-cased, whitespace-collapsed text for the doctor directory search column."""
+    return ' '.join(' '.join(part or '' for part in parts).lower().split())
+
+
+def search_terms(query):
+    """Split a directory search query into lower-cased word terms."""
+    return re.findall(r'\w+', (query or '').lower())
@@ -1,5 +1,7 @@
 from django.core.exceptions import ValidationError
-from .constants import DAYS_OF_WEEK, SPECIALTIES
+from .constants import (
+    DAYS_OF_WEEK, SPECIALTIES, OVERRIDE_TYPES, MIN_SLOT_MINUTES, MAX_SLOT_MINUTES, SLOT_UNIT_MINUTES, DEFAULT_SERVICE_DURATIONS
+)
 from .helpers import is_time_within_range
 
 class ValidationStrategy:
@@ -24,18 +26,51 @@ class ScheduleValidationStrategy(ValidationStrategy):
             if not is_time_within_range(break_start, start, end) or not is_time_within_range(break_end, start, end):
                 raise ValidationError("Break times must be within working hours.")
 
+class ScheduleOverrideValidationStrategy(ValidationStrategy):
+    """Validate schedule override data."""
+    def validate(self, data):
+        override_type = data.get('override_type')
+        if override_type is not None and override_type not in OVERRIDE_TYPES:
+            raise ValidationError("Invalid override type.")
+
 class ProfileValidationStrategy(ValidationStrategy):
     """Validate doctor profile data."""
     def validate(self, data):
         specialty = data.get('specialty')
         if specialty and specialty not in SPECIALTIES:
             raise ValidationError("Invalid specialty.")
+        slot_duration = data.get('slot_duration_minutes')
+        if slot_duration is not None:
+            validate_slot_minutes(slot_duration)
+        service_durations = data.get('service_durations') or {}
+        if not isinstance(service_durations, dict):
+            raise ValidationError("Service durations must be an object of service type to minutes.")
+        for service_type, minutes in service_durations.items():
+            if service_type not in DEFAULT_SERVICE_DURATIONS:
+                raise ValidationError(f"Invalid service type: {service_type}.")
+            validate_slot_minutes(minutes)
+
+def validate_slot_minutes(value):
+    """Slot lengths must be 5-60 minutes and align with the bitmap unit."""
+    try:
+        minutes = int(value)
+    except (TypeError, ValueError):
+        raise ValidationError("Slot length must be a number of minutes.")
+    if not MIN_SLOT_MINUTES <= minutes <= MAX_SLOT_MINUTES or minutes % SLOT_UNIT_MINUTES:
+        raise ValidationError(
+            f"Slot length must be {MIN_SLOT_MINUTES}-{MAX_SLOT_MINUTES} minutes in steps of {SLOT_UNIT_MINUTES}."
+        )
 
 def validate_schedule(data):
     """Helper to run schedule validation."""
     strategy = ScheduleValidationStrategy()
     strategy.validate(data)
 
+def validate_schedule_override(data):
+    """Helper to run schedule override validation."""
+    strategy = ScheduleOverrideValidationStrategy()
+    strategy.validate(data)
+
 def validate_profile(data):
     """Helper to run profile validation."""
     strategy = ProfileValidationStrategy()
@@ -3,16 +3,32 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from .models import DoctorProfile, Schedule
-from .serializers import DoctorProfileSerializer, ScheduleSerializer
+from .models import DoctorProfile, Schedule, ScheduleOverride
+from .serializers import (
+    DoctorProfileSerializer, DoctorDirectorySerializer, ScheduleSerializer, ScheduleOverrideSerializer,
+    AvailabilitySearchSerializer
+)
 from .services.doctor_service import DoctorService
 from .services.schedule_service import ScheduleService
 from .services.appointment_service import AppointmentService
-from patients.serializers import AppointmentSerializer
+from .services.directory_service import DoctorDirectoryService
+from .services.dashboard_service import DashboardService
+from .filters import DoctorDirectoryFilter
+from patients.serializers import AppointmentSerializer, AppointmentReadSerializer, AppointmentExportSerializer
+from patients.services.export_service import AppointmentExportService
 from patients.models import Appointment
+from patients.utils.constants import APPOINTMENT_ORDERING
+from drf_spectacular.utils import extend_schema
+from patients.filters import AppointmentFilter
+from common.filters import apply_filterset, filterset_parameters
+from common.conditional import make_etag, not_modified, queryset_validators, with_validators
+from common.pagination import KeysetPagination
+from common.serializers import requested_fields
 from common.permissions import IsAuthenticatedAndActive
-from .utils.validators import validate_profile, validate_schedule  # Used for validation
-from .utils.constants import SPECIALTIES  # Used for checks
+from common.authentication import with_names
+from common.profiles import doctor_id, get_doctor
+from .utils.validators import validate_profile, validate_schedule, validate_schedule_override  # Used for validation
+from .utils.constants import DEFAULT_SERVICE_DURATIONS, SLOT_MODES, DIRECTORY_ORDERING  # Used for checks
 from .utils.helpers import format_slot_display  # Used for formatting
 from common.exceptions import InvalidScheduleError  # Added
 
@@ -22,14 +38,20 @@ class DoctorProfileListCreateView(APIView):
 
     def get(self, request):
         profiles = DoctorProfile.objects.filter(user=request.user)
-        serializer = DoctorProfileSerializer(profiles, many=True)
-        return Response(serializer.data)
+        etag, last_modified = queryset_validators(request, profiles, related=('user',))
+        unchanged = not_modified(request, etag, last_modified)
+        if unchanged:
+            return unchanged
+        profiles = DoctorProfileSerializer.sparse_queryset(profiles.select_related('user'), request)
+        serializer = DoctorProfileSerializer(profiles, many=True, context={'request': request})
+        return with_validators(Response(serializer.data), etag, last_modified)
 
     def post(self, request):
         validate_profile(request.data)  # Use validator
         service = DoctorService()
         try:
-            profile = service.create_profile(request.user, **request.data)
+            # Bearer-token request users carry no names; search_text and the response need them
+            profile = service.create_profile(with_names(request.user), **request.data)
             serializer = DoctorProfileSerializer(profile)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         except ValueError as e:
@@ -40,9 +62,14 @@ class DoctorProfileDetailView(APIView):
     permission_classes = [IsAuthenticatedAndActive]
 
     def get(self, request, pk):
-        profile = get_object_or_404(DoctorProfile, pk=pk, user=request.user)
-        serializer = DoctorProfileSerializer(profile)
-        return Response(serializer.data)
+        profiles = DoctorProfile.objects.filter(pk=pk, user=request.user)
+        etag, last_modified = queryset_validators(request, profiles, related=('user',))
+        unchanged = not_modified(request, etag, last_modified)
+        if unchanged:
+            return unchanged
+        profile = get_object_or_404(DoctorProfileSerializer.sparse_queryset(profiles.select_related('user'), request))
+        serializer = DoctorProfileSerializer(profile, context={'request': request})
+        return with_validators(Response(serializer.data), etag, last_modified)
 
     def put(self, request, pk):
         profile = get_object_or_404(DoctorProfile, pk=pk, user=request.user)
@@ -61,18 +88,40 @@ class DoctorProfileDetailView(APIView):
         service.delete_profile(profile)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+class DoctorDirectoryView(APIView):
+    """Search the doctor directory by name/bio terms, specialty and experience (ranked, cursor-paginated)."""
+    permission_classes = [IsAuthenticatedAndActive]
+
+    @extend_schema(parameters=filterset_parameters(DoctorDirectoryFilter))
+    def get(self, request):
+        doctors = apply_filterset(DoctorDirectoryFilter, request.query_params, DoctorProfile.objects.all())
+        doctors = DoctorDirectoryService().search(doctors, request.query_params.get('q'))
+        doctors = doctors.select_related('user').only(
+            'id', 'specialty', 'experience_years', 'bio', 'user__first_name', 'user__last_name'
+        )
+        doctors = DoctorDirectorySerializer.sparse_queryset(doctors, request, required=DIRECTORY_ORDERING[1:])
+        paginator = KeysetPagination(DIRECTORY_ORDERING)
+        page = paginator.paginate_queryset(doctors, request, view=self)
+        serializer = DoctorDirectorySerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
+
 class ScheduleListCreateView(APIView):
     """List and create schedules."""
     permission_classes = [IsAuthenticatedAndActive]
 
     def get(self, request):
-        doctor = get_object_or_404(DoctorProfile, user=request.user)
-        schedules = Schedule.objects.filter(doctor=doctor)
-        serializer = ScheduleSerializer(schedules, many=True)
-        return Response(serializer.data)
+        doctor_pk = doctor_id(request)
+        schedules = Schedule.objects.filter(doctor_id=doctor_pk)
+        etag, last_modified = queryset_validators(request, schedules, related=('doctor__user',))
+        unchanged = not_modified(request, etag, last_modified)
+        if unchanged:
+            return unchanged
+        schedules = ScheduleSerializer.sparse_queryset(schedules.select_related('doctor__user'), request)
+        serializer = ScheduleSerializer(schedules, many=True, context={'request': request})
+        return with_validators(Response(serializer.data), etag, last_modified)
 
     def post(self, request):
-        doctor = get_object_or_404(DoctorProfile, user=request.user)
+        doctor = get_doctor(request)
         validate_schedule(request.data)  # Use validator
         service = ScheduleService()
         try:
@@ -87,14 +136,19 @@ class ScheduleDetailView(APIView):
     permission_classes = [IsAuthenticatedAndActive]
 
     def get(self, request, pk):
-        doctor = get_object_or_404(DoctorProfile, user=request.user)
-        schedule = get_object_or_404(Schedule, pk=pk, doctor=doctor)
-        serializer = ScheduleSerializer(schedule)
-        return Response(serializer.data)
+        doctor_pk = doctor_id(request)
+        schedules = Schedule.objects.filter(pk=pk, doctor_id=doctor_pk)
+        etag, last_modified = queryset_validators(request, schedules, related=('doctor__user',))
+        unchanged = not_modified(request, etag, last_modified)
+        if unchanged:
+            return unchanged
+        schedule = get_object_or_404(ScheduleSerializer.sparse_queryset(schedules.select_related('doctor__user'), request))
+        serializer = ScheduleSerializer(schedule, context={'request': request})
+        return with_validators(Response(serializer.data), etag, last_modified)
 
     def put(self, request, pk):
-        doctor = get_object_or_404(DoctorProfile, user=request.user)
-        schedule = get_object_or_404(Schedule, pk=pk, doctor=doctor)
+        doctor_pk = doctor_id(request)
+        schedule = get_object_or_404(Schedule, pk=pk, doctor_id=doctor_pk)
         validate_schedule(request.data)  # Use validator
         service = ScheduleService()
         try:
@@ -105,9 +159,69 @@ class ScheduleDetailView(APIView):
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, pk):
-        doctor = get_object_or_404(DoctorProfile, user=request.user)
-        schedule = get_object_or_404(Schedule, pk=pk, doctor=doctor)
-        schedule.delete()
+        doctor_pk = doctor_id(request)
+        schedule = get_object_or_404(Schedule, pk=pk, doctor_id=doctor_pk)
+        service = ScheduleService()
+        service.delete_schedule(schedule)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class ScheduleOverrideListCreateView(APIView):
+    """List and create date-specific schedule overrides."""
+    permission_classes = [IsAuthenticatedAndActive]
+
+    def get(self, request):
+        doctor_pk = doctor_id(request)
+        try:
+            start_date = request.query_params.get('start_date')
+            end_date = request.query_params.get('end_date')
+            start_date = timezone.datetime.fromisoformat(start_date).date() if start_date else None
+            end_date = timezone.datetime.fromisoformat(end_date).date() if end_date else None
+        except ValueError:
+            return Response({"error": "Invalid date format"}, status=status.HTTP_400_BAD_REQUEST)
+        service = ScheduleService()
+        overrides = ScheduleOverrideSerializer.sparse_queryset(service.get_overrides(doctor_pk, start_date, end_date), request)
+        serializer = ScheduleOverrideSerializer(overrides, many=True, context={'request': request})
+        return Response(serializer.data)
+
+    def post(self, request):
+        doctor = get_doctor(request)
+        validate_schedule_override(request.data)  # Use validator
+        service = ScheduleService()
+        try:
+            override = service.create_override(doctor, request.data)
+            serializer = ScheduleOverrideSerializer(override)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+class ScheduleOverrideDetailView(APIView):
+    """Retrieve, update, delete a schedule override."""
+    permission_classes = [IsAuthenticatedAndActive]
+
+    def get(self, request, pk):
+        doctor_pk = doctor_id(request)
+        overrides = ScheduleOverrideSerializer.sparse_queryset(ScheduleOverride.objects.all(), request)
+        override = get_object_or_404(overrides, pk=pk, doctor_id=doctor_pk)
+        serializer = ScheduleOverrideSerializer(override, context={'request': request})
+        return Response(serializer.data)
+
+    def put(self, request, pk):
+        doctor_pk = doctor_id(request)
+        override = get_object_or_404(ScheduleOverride, pk=pk, doctor_id=doctor_pk)
+        validate_schedule_override(request.data)  # Use validator
+        service = ScheduleService()
+        try:
+            updated_override = service.update_override(override, request.data)
+            serializer = ScheduleOverrideSerializer(updated_override)
+            return Response(serializer.data)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    def delete(self, request, pk):
+        doctor_pk = doctor_id(request)
+        override = get_object_or_404(ScheduleOverride, pk=pk, doctor_id=doctor_pk)
+        service = ScheduleService()
+        service.delete_override(override)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 class ScheduleAvailableSlotsView(APIView):
@@ -115,7 +229,7 @@ class ScheduleAvailableSlotsView(APIView):
     permission_classes = [IsAuthenticatedAndActive]
 
     def get(self, request):
-        doctor = get_object_or_404(DoctorProfile, user=request.user)
+        doctor = get_doctor(request)
         date_str = request.query_params.get('date')
         if not date_str:
             return Response({"error": "Date required"}, status=status.HTTP_400_BAD_REQUEST)
@@ -123,30 +237,93 @@ class ScheduleAvailableSlotsView(APIView):
             date = timezone.datetime.fromisoformat(date_str).date()
         except ValueError:
             return Response({"error": "Invalid date format"}, status=status.HTTP_400_BAD_REQUEST)
+        service_type = request.query_params.get('service_type')
+        if service_type and service_type not in DEFAULT_SERVICE_DURATIONS:
+            return Response({"error": "Invalid service type"}, status=status.HTTP_400_BAD_REQUEST)
+        mode = request.query_params.get('mode', 'grid')
+        if mode not in SLOT_MODES:
+            return Response({"error": f"Mode must be one of {SLOT_MODES}"}, status=status.HTTP_400_BAD_REQUEST)
         service = ScheduleService()
-        slots = service.get_available_slots(doctor, date)
+        # The (cached) day masks plus the doctor's slot settings fully determine the slot list
+        etag = make_etag(request, *service.bitmaps.get_masks(doctor, date), doctor.updated_at)
+        unchanged = not_modified(request, etag)
+        if unchanged:
+            return unchanged
+        slots = service.get_available_slots(doctor, date, service_type=service_type, mode=mode)
         formatted_slots = [format_slot_display(start, end) for start, end in slots]  # Use helper
-        return Response({"available_slots": formatted_slots})
+        return with_validators(Response({"available_slots": formatted_slots}), etag)
+
+class AvailabilitySearchView(APIView):
+    """Search free slots across doctors (by specialty or IDs) and a date range."""
+    permission_classes = [IsAuthenticatedAndActive]
+
+    def get(self, request):
+        params = AvailabilitySearchSerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        service = ScheduleService()
+        results = service.search_available_slots(
+            params.validated_data['start_date'], params.validated_data['end_date'],
+            specialty=params.validated_data.get('specialty'),
+            doctor_ids=params.validated_data.get('doctor_ids'),
+            service_type=params.validated_data.get('service_type'),
+        )
+        for result in results:
+            result['slots'] = {
+                day.isoformat(): [format_slot_display(start, end) for start, end in slots]
+                for day, slots in result['slots'].items()
+            }
+        return Response({"results": results})
+
+class DoctorDashboardView(APIView):
+    """Per-day appointment counts for the next two weeks, today's utilization and waiting-list length."""
+    permission_classes = [IsAuthenticatedAndActive]
+
+    def get(self, request):
+        doctor = get_doctor(request)
+        return Response(DashboardService().get(doctor))
 
 class AppointmentListView(APIView):
     """List doctor's appointments."""
     permission_classes = [IsAuthenticatedAndActive]
 
+    @extend_schema(parameters=filterset_parameters(AppointmentFilter))
     def get(self, request):
-        doctor = get_object_or_404(DoctorProfile, user=request.user)
+        doctor_pk = doctor_id(request)
         service = AppointmentService()
-        appointments = service.get_appointments(doctor)
-        serializer = AppointmentSerializer(appointments, many=True)
-        return Response(serializer.data)
+        fields = requested_fields(request, AppointmentReadSerializer.sources)
+        appointments = AppointmentReadSerializer.project(
+            service.get_appointments(doctor_pk, filters=request.query_params), fields, required=APPOINTMENT_ORDERING
+        )
+        paginator = KeysetPagination(APPOINTMENT_ORDERING)
+        page = paginator.paginate_queryset(appointments, request, view=self)
+        serializer = AppointmentReadSerializer(page, fields)
+        return paginator.get_paginated_response(serializer.data)
+
+class AppointmentExportView(APIView):
+    """Stream the doctor's appointments as CSV or NDJSON (filters: date range, status, service type)."""
+    permission_classes = [IsAuthenticatedAndActive]
+
+    def get(self, request):
+        doctor_pk = doctor_id(request)
+        params = AppointmentExportSerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        service = AppointmentExportService()
+        appointments = service.filter(Appointment.objects.filter(doctor_id=doctor_pk), **params.validated_data)
+        return service.response(appointments, params.validated_data['file_format'], filename=f'appointments-doctor-{doctor_pk}')
 
 class AppointmentDetailView(APIView):
     """Retrieve appointment."""
     permission_classes = [IsAuthenticatedAndActive]
 
     def get(self, request, pk):
-        doctor = get_object_or_404(DoctorProfile, user=request.user)
-        appointment = get_object_or_404(Appointment, pk=pk, doctor=doctor)
-        serializer = AppointmentSerializer(appointment)
+        doctor_pk = doctor_id(request)
+        appointments = AppointmentSerializer.sparse_queryset(
+            Appointment.objects.select_related('patient__user', 'doctor__user'), request
+        )
+        appointment = get_object_or_404(appointments, pk=pk, doctor_id=doctor_pk)
+        serializer = AppointmentSerializer(appointment, context={'request': request})
         return Response(serializer.data)
 
 class AppointmentConfirmView(APIView):
@@ -154,11 +331,25 @@ class AppointmentConfirmView(APIView):
     permission_classes = [IsAuthenticatedAndActive]
 
     def post(self, request, pk):
-        doctor = get_object_or_404(DoctorProfile, user=request.user)
-        appointment = get_object_or_404(Appointment, pk=pk, doctor=doctor)
+        doctor_pk = doctor_id(request)
+        appointment = get_object_or_404(Appointment, pk=pk, doctor_id=doctor_pk)
         service = AppointmentService()
         try:
             service.confirm_appointment(appointment)
             return Response({"message": "Appointment confirmed"})
         except ValueError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+class AppointmentCompleteView(APIView):
+    """Mark appointment as completed."""
+    permission_classes = [IsAuthenticatedAndActive]
+
+    def post(self, request, pk):
+        doctor_pk = doctor_id(request)
+        appointment = get_object_or_404(Appointment, pk=pk, doctor_id=doctor_pk)
+        service = AppointmentService()
+        try:
+            service.complete_appointment(appointment)
+            return Response({"message": "Appointment completed"})
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
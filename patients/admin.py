@@ -5,11 +5,20 @@ from .models import PatientProfile, Appointment, WaitingList
 class PatientProfileAdmin(admin.ModelAdmin):
     list_display = ['user', 'date_of_birth', 'gender']
     search_fields = ['user__username']
+    list_filter = ['is_deleted']
+
+    def get_queryset(self, request):
+        # Admins see soft-deleted rows too
+        return self.model.all_with_deleted.all()
 
 @admin.register(Appointment)
 class AppointmentAdmin(admin.ModelAdmin):
     list_display = ['patient', 'doctor', 'appointment_date', 'status']
-    list_filter = ['status', 'service_type']
+    list_filter = ['status', 'service_type', 'is_deleted']
+
+    def get_queryset(self, request):
+        # Admins see soft-deleted rows too
+        return self.model.all_with_deleted.all()
 
 @admin.register(WaitingList)
 class WaitingListAdmin(admin.ModelAdmin):
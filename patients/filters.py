@@ -0,0 +1,31 @@
+import django_filters
+from .models import Appointment, WaitingList
+
+
+class AppointmentFilter(django_filters.FilterSet):
+    """
+    Query filters for appointment lists. Predicates follow the appointment indexes:
+    (doctor, appointment_date, status) and (patient, appointment_date, start_time).
+    """
+    date_from = django_filters.DateFilter(field_name='appointment_date', lookup_expr='gte', label="On or after this date")
+    date_to = django_filters.DateFilter(field_name='appointment_date', lookup_expr='lte', label="On or before this date")
+    status = django_filters.ChoiceFilter(choices=Appointment._meta.get_field('status').choices, label="Appointment status")
+    service_type = django_filters.ChoiceFilter(choices=Appointment._meta.get_field('service_type').choices, label="Service type")
+    doctor = django_filters.NumberFilter(field_name='doctor_id', label="Doctor profile ID")
+    patient = django_filters.NumberFilter(field_name='patient_id', label="Patient profile ID")
+
+    class Meta:
+        model = Appointment
+        fields = ['date_from', 'date_to', 'status', 'service_type', 'doctor', 'patient']
+
+
+class WaitingListFilter(django_filters.FilterSet):
+    """Query filters for waiting-list entries (doctor, requested date range, notified flag)."""
+    date_from = django_filters.DateFilter(field_name='requested_date', lookup_expr='gte', label="Requested on or after this date")
+    date_to = django_filters.DateFilter(field_name='requested_date', lookup_expr='lte', label="Requested on or before this date")
+    doctor = django_filters.NumberFilter(field_name='doctor_id', label="Doctor profile ID")
+    is_notified = django_filters.BooleanFilter(label="Patient already notified")
+
+    class Meta:
+        model = WaitingList
+        fields = ['date_from', 'date_to', 'doctor', 'is_notified']
@@ -0,0 +1,77 @@
+import time
+from datetime import date, time as clock, timedelta
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from common.testing import scratch_database
+from doctors.models import DoctorProfile
+from patients.models import PatientProfile, Appointment
+from patients.serializers import AppointmentSerializer, AppointmentReadSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare AppointmentSerializer with the values()-based AppointmentReadSerializer on seeded "
+        "appointment lists. Runs on a scratch test database, never the configured one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000], help="Row counts to benchmark")
+        parser.add_argument('--repeat', type=int, default=3, help="Runs per path; the best time is reported")
+        parser.add_argument(
+            '--noinput', '--no-input', action='store_false', dest='interactive',
+            help="Replace a leftover test database without asking",
+        )
+
+    def handle(self, *args, **options):
+        with scratch_database(interactive=options['interactive']):
+            doctor, patient = self.seed_profiles()
+            for size in options['sizes']:
+                self.seed_appointments(doctor, patient, size)
+                self.report(doctor, size, options['repeat'])
+
+    def seed_profiles(self):
+        doctor_user = User.objects.create_user('bench-doctor', 'bench-doctor@example.com', None, role='is_doctor',
+                                               first_name='Bench', last_name='Doctor')
+        patient_user = User.objects.create_user('bench-patient', 'bench-patient@example.com', None, role='is_patient',
+                                                first_name='Bench', last_name='Patient')
+        doctor = DoctorProfile.objects.create(user=doctor_user, specialty='Cardiology', license_number='BENCH-0001')
+        patient = PatientProfile.objects.create(user=patient_user, date_of_birth=date(1990, 1, 1), gender='other')
+        return doctor, patient
+
+    def seed_appointments(self, doctor, patient, size):
+        existing = Appointment.objects.filter(doctor=doctor).count()
+        Appointment.objects.bulk_create([
+            Appointment(
+                patient=patient, doctor=doctor, appointment_date=date(2030, 1, 1) + timedelta(days=index // 10),
+                start_time=clock(8 + index % 10), end_time=clock(9 + index % 10), service_type='consultation',
+                appointment_id=f'APT-BENCH-{index}'
+            )
+            for index in range(existing, size)
+        ], batch_size=1000)
+
+    def best_of(self, repeat, func):
+        timings, output = [], None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            output = func()
+            timings.append(time.perf_counter() - started)
+        return min(timings), output
+
+    def report(self, doctor, size, repeat):
+        queryset = Appointment.objects.filter(doctor=doctor).order_by('appointment_date', 'start_time', 'id')
+        renderer = JSONRenderer()
+        model_time, model_json = self.best_of(repeat, lambda: renderer.render(
+            AppointmentSerializer(queryset.select_related('patient__user', 'doctor__user'), many=True).data
+        ))
+        fast_time, fast_json = self.best_of(repeat, lambda: renderer.render(
+            AppointmentReadSerializer(AppointmentReadSerializer.project(queryset)).data
+        ))
+        if model_json != fast_json:
+            raise CommandError(f"Outputs differ at {size} rows.")
+        self.stdout.write(
+            f"{size:>6} rows: ModelSerializer {model_time * 1000:8.1f} ms | "
+            f"values() path {fast_time * 1000:8.1f} ms | {model_time / fast_time:4.1f}x faster, identical JSON"
+        )
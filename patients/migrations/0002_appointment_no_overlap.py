@@ -0,0 +1,76 @@
+# Generated by Django 6.0 on 2026-10-17 22:11
+
+from django.db import migrations, models
+
+
+POSTGRES_CREATE = """
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+ALTER TABLE patients_appointment ADD CONSTRAINT appointment_no_overlap EXCLUDE USING gist (
+    doctor_id WITH =,
+    tsrange(appointment_date + start_time, appointment_date + end_time) WITH &&
+) WHERE (status IN ('booked', 'confirmed') AND NOT is_deleted);
+"""
+
+POSTGRES_DROP = "ALTER TABLE patients_appointment DROP CONSTRAINT IF EXISTS appointment_no_overlap;"
+
+# SQLite has no exclusion constraints; equivalent BEFORE triggers abort with a constraint error.
+SQLITE_OVERLAP_CHECK = """
+SELECT RAISE(ABORT, 'appointment_no_overlap') WHERE EXISTS (
+    SELECT 1 FROM patients_appointment
+    WHERE doctor_id = NEW.doctor_id AND appointment_date = NEW.appointment_date
+      AND status IN ('booked', 'confirmed') AND is_deleted = 0
+      AND start_time < NEW.end_time AND end_time > NEW.start_time {extra}
+);
+"""
+
+SQLITE_CREATE = [
+    "CREATE TRIGGER appointment_no_overlap_insert BEFORE INSERT ON patients_appointment "
+    "WHEN NEW.status IN ('booked', 'confirmed') AND NEW.is_deleted = 0 BEGIN "
+    + SQLITE_OVERLAP_CHECK.format(extra='') + " END;",
+    "CREATE TRIGGER appointment_no_overlap_update BEFORE UPDATE ON patients_appointment "
+    "WHEN NEW.status IN ('booked', 'confirmed') AND NEW.is_deleted = 0 BEGIN "
+    + SQLITE_OVERLAP_CHECK.format(extra='AND id != NEW.id') + " END;",
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS appointment_no_overlap_insert;",
+    "DROP TRIGGER IF EXISTS appointment_no_overlap_update;",
+]
+
+
+def create_overlap_guard(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(POSTGRES_CREATE)
+    elif vendor == 'sqlite':
+        for statement in SQLITE_CREATE:
+            schema_editor.execute(statement)
+
+
+def drop_overlap_guard(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(POSTGRES_DROP)
+    elif vendor == 'sqlite':
+        for statement in SQLITE_DROP:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doctors', '0003_slot_durations'),
+        ('patients', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='appointment',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='appointment',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_deleted', False), ('status__in', ['booked', 'confirmed'])), fields=('doctor', 'appointment_date', 'start_time'), name='unique_active_appointment_start'),
+        ),
+        migrations.RunPython(create_overlap_guard, drop_overlap_guard),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 6.0 on 2026-10-17 23:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doctors', '0005_query_indexes'),
+        ('patients', '0002_appointment_no_overlap'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='appointment',
+            index=models.Index(condition=models.Q(('is_deleted', False), ('status__in', ['booked', 'confirmed'])), fields=['doctor', 'appointment_date', 'start_time', 'end_time'], name='appt_active_slot_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='appointment',
+            index=models.Index(fields=['doctor', 'appointment_date', 'status'], name='appt_doctor_date_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='appointment',
+            index=models.Index(fields=['patient', 'appointment_date', 'start_time'], name='appt_patient_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='waitinglist',
+            index=models.Index(fields=['doctor', 'requested_date', 'is_notified'], name='waitlist_doctor_date_idx'),
+        ),
+    ]
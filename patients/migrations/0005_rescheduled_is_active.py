@@ -0,0 +1,78 @@
+# Generated by Django 6.0 on 2026-10-17 23:15
+
+from django.db import migrations, models
+
+
+# Rescheduled appointments occupy their new slot, so the overlap guard from 0002 is
+# recreated over the wider status set (and restored to the old one on reverse).
+PREVIOUS_STATUSES = ('booked', 'confirmed')
+ACTIVE_STATUSES = ('booked', 'confirmed', 'rescheduled')
+
+POSTGRES_CREATE = """
+ALTER TABLE patients_appointment DROP CONSTRAINT IF EXISTS appointment_no_overlap;
+ALTER TABLE patients_appointment ADD CONSTRAINT appointment_no_overlap EXCLUDE USING gist (
+    doctor_id WITH =,
+    tsrange(appointment_date + start_time, appointment_date + end_time) WITH &&
+) WHERE (status IN ({statuses}) AND NOT is_deleted);
+"""
+
+SQLITE_OVERLAP_CHECK = """
+SELECT RAISE(ABORT, 'appointment_no_overlap') WHERE EXISTS (
+    SELECT 1 FROM patients_appointment
+    WHERE doctor_id = NEW.doctor_id AND appointment_date = NEW.appointment_date
+      AND status IN ({statuses}) AND is_deleted = 0
+      AND start_time < NEW.end_time AND end_time > NEW.start_time {extra}
+);
+"""
+
+SQLITE_TRIGGERS = (
+    ('appointment_no_overlap_insert', 'INSERT', ''),
+    ('appointment_no_overlap_update', 'UPDATE', 'AND id != NEW.id'),
+)
+
+
+def overlap_guard(statuses):
+    def apply(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        in_list = ', '.join(f"'{status}'" for status in statuses)
+        if vendor == 'postgresql':
+            schema_editor.execute(POSTGRES_CREATE.format(statuses=in_list))
+        elif vendor == 'sqlite':
+            for name, event, extra in SQLITE_TRIGGERS:
+                schema_editor.execute(f"DROP TRIGGER IF EXISTS {name};")
+                schema_editor.execute(
+                    f"CREATE TRIGGER {name} BEFORE {event} ON patients_appointment "
+                    f"WHEN NEW.status IN ({in_list}) AND NEW.is_deleted = 0 BEGIN "
+                    + SQLITE_OVERLAP_CHECK.format(statuses=in_list, extra=extra) + " END;"
+                )
+        # Booked bits were derived from the old status set; rows are rebuilt lazily
+        apps.get_model('doctors', 'SlotBitmap').objects.all().delete()
+    return apply
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doctors', '0007_doctor_search'),
+        ('patients', '0004_soft_delete_managers'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='appointment',
+            name='unique_active_appointment_start',
+        ),
+        migrations.RemoveIndex(
+            model_name='appointment',
+            name='appt_active_slot_idx',
+        ),
+        migrations.AddIndex(
+            model_name='appointment',
+            index=models.Index(condition=models.Q(('is_deleted', False), ('status__in', ['booked', 'confirmed', 'rescheduled'])), fields=['doctor', 'appointment_date', 'start_time', 'end_time'], name='appt_active_slot_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='appointment',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_deleted', False), ('status__in', ['booked', 'confirmed', 'rescheduled'])), fields=('doctor', 'appointment_date', 'start_time'), name='unique_active_appointment_start'),
+        ),
+        migrations.RunPython(overlap_guard(ACTIVE_STATUSES), overlap_guard(PREVIOUS_STATUSES)),
+    ]
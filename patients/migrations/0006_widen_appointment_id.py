@@ -0,0 +1,26 @@
+# Generated by Django 6.0 on 2026-10-17 23:23
+
+from importlib import import_module
+from django.db import migrations, models
+
+# SQLite alters the column by rebuilding the table, which drops the overlap triggers:
+# recreate the guard from 0005 afterwards, in both directions.
+guard = import_module('patients.migrations.0005_rescheduled_is_active')
+restore_overlap_guard = guard.overlap_guard(guard.ACTIVE_STATUSES)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0005_rescheduled_is_active'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_overlap_guard),
+        migrations.AlterField(
+            model_name='appointment',
+            name='appointment_id',
+            field=models.CharField(editable=False, help_text='Unique appointment ID', max_length=32, unique=True),
+        ),
+        migrations.RunPython(restore_overlap_guard, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,9 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from doctors.models import DoctorProfile
+from doctors.utils.constants import ACTIVE_APPOINTMENT_STATUSES
 from common.mixins import TimestampMixin, SoftDeleteMixin
+from .utils.helpers import generate_appointment_id
 
 User = get_user_model()
 
@@ -45,14 +47,38 @@ class Appointment(TimestampMixin, SoftDeleteMixin):
         help_text="Appointment status"
     )
     notes = models.TextField(blank=True, help_text="Additional notes or reason")
-    appointment_id = models.CharField(max_length=20, unique=True, editable=False, help_text="Unique appointment ID")
+    appointment_id = models.CharField(max_length=32, unique=True, editable=False, help_text="Unique appointment ID")
 
     class Meta:
-        unique_together = ('doctor', 'appointment_date', 'start_time')
+        # Overlaps between active appointments are rejected by the database itself
+        # (exclusion constraint on PostgreSQL, triggers on SQLite; see migrations 0002 and 0005).
+        constraints = [
+            models.UniqueConstraint(
+                fields=['doctor', 'appointment_date', 'start_time'],
+                condition=models.Q(status__in=ACTIVE_APPOINTMENT_STATUSES, is_deleted=False),
+                name='unique_active_appointment_start',
+            ),
+        ]
+        indexes = [
+            # Availability and overlap checks only ever look at active rows
+            models.Index(
+                fields=['doctor', 'appointment_date', 'start_time', 'end_time'],
+                condition=models.Q(status__in=ACTIVE_APPOINTMENT_STATUSES, is_deleted=False),
+                name='appt_active_slot_idx',
+            ),
+            models.Index(
+                fields=['doctor', 'appointment_date', 'status'], condition=models.Q(is_deleted=False),
+                name='appt_doctor_date_status_idx',
+            ),
+            models.Index(
+                fields=['patient', 'appointment_date', 'start_time'], condition=models.Q(is_deleted=False),
+                name='appt_patient_date_idx',
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.appointment_id:
-            self.appointment_id = f"APT-{self.pk or 'NEW'}-{self.appointment_date.strftime('%Y%m%d')}"
+            self.appointment_id = generate_appointment_id(self.appointment_date)
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -68,5 +94,10 @@ class WaitingList(TimestampMixin):
     notes = models.TextField(blank=True, help_text="Additional notes")
     is_notified = models.BooleanField(default=False, help_text="Has the patient been notified of availability?")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['doctor', 'requested_date', 'is_notified'], name='waitlist_doctor_date_idx'),
+        ]
+
     def __str__(self):
         return f"Waiting: {self.patient} for {self.doctor} on {self.requested_date}"
@@ -1,11 +1,17 @@
 from rest_framework import serializers
+from django.db.models import Value
+from django.db.models.functions import Concat, Trim
+from django.utils import timezone
 from .models import PatientProfile, Appointment, WaitingList
 from doctors.models import DoctorProfile
 from common.exceptions import AppointmentConflictError
+from common.serializers import SparseFieldsetMixin
+from .utils.constants import SERVICE_TYPES, BULK_BOOKING_MAX_ITEMS, APPOINTMENT_STATUSES, EXPORT_FORMATS
 
 
-class PatientProfileSerializer(serializers.ModelSerializer):
+class PatientProfileSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for patient profiles."""
+    sparse_sources = {'user_full_name': ['user__first_name', 'user__last_name']}
     user_full_name = serializers.CharField(source='user.get_full_name', read_only=True)
 
     class Meta:
@@ -17,8 +23,12 @@ class PatientProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class AppointmentSerializer(serializers.ModelSerializer):
+class AppointmentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for appointments with conflict checks."""
+    sparse_sources = {
+        'patient_name': ['patient__user__first_name', 'patient__user__last_name'],
+        'doctor_name': ['doctor__user__first_name', 'doctor__user__last_name'],
+    }
     patient_name = serializers.CharField(source='patient.user.get_full_name', read_only=True)
     doctor_name = serializers.CharField(source='doctor.user.get_full_name', read_only=True)
 
@@ -33,20 +43,105 @@ class AppointmentSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         """Validate for overlaps and availability (GOF: Strategy for booking logic)."""
-        doctor = data.get('doctor')
-        date = data.get('appointment_date')
-        start = data.get('start_time')
-        end = data.get('end_time')
-        if Appointment.objects.filter(
-            doctor=doctor, appointment_date=date,
-            start_time__lt=end, end_time__gt=start
-        ).exclude(pk=self.instance.pk if self.instance else None).exists():
+        from doctors.services.bitmap_service import SlotBitmapService
+        doctor = data.get('doctor', getattr(self.instance, 'doctor', None))
+        date = data.get('appointment_date', getattr(self.instance, 'appointment_date', None))
+        start = data.get('start_time', getattr(self.instance, 'start_time', None))
+        end = data.get('end_time', getattr(self.instance, 'end_time', None))
+        if SlotBitmapService().overlaps_booking(doctor, date, start, end, exclude=self.instance):
             raise AppointmentConflictError("Appointment overlaps with existing booking.")
         return data
 
 
-class WaitingListSerializer(serializers.ModelSerializer):
+def _full_name(prefix):
+    # Same text as User.get_full_name(), computed by the database
+    return Trim(Concat(f'{prefix}__first_name', Value(' '), f'{prefix}__last_name'))
+
+
+def _format_datetime(value):
+    # Mirrors DRF's ISO 8601 DateTimeField output (current timezone, 'Z' for UTC)
+    value = timezone.localtime(value).isoformat()
+    return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+
+class AppointmentReadSerializer:
+    """
+    Read-only fast path for appointment lists with output identical to AppointmentSerializer.
+    Projects the needed columns and both full names with values() in one query and builds
+    plain dicts, skipping ModelSerializer field introspection and per-field dispatch.
+    With a sparse fieldset only the requested columns are selected and name joins are
+    added only for the names asked for.
+    """
+    # Output field -> values() column, in AppointmentSerializer's field order
+    sources = {
+        'id': 'id', 'patient': 'patient_id', 'doctor': 'doctor_id', 'appointment_date': 'appointment_date',
+        'start_time': 'start_time', 'end_time': 'end_time', 'service_type': 'service_type', 'status': 'status',
+        'notes': 'notes', 'appointment_id': 'appointment_id', 'patient_name': 'patient_name',
+        'doctor_name': 'doctor_name', 'created_at': 'created_at', 'updated_at': 'updated_at',
+    }
+    names = {'patient_name': 'patient__user', 'doctor_name': 'doctor__user'}
+    formats = {
+        'appointment_date': lambda value: value.isoformat(),
+        'start_time': lambda value: value.isoformat(),
+        'end_time': lambda value: value.isoformat(),
+        'created_at': _format_datetime,
+        'updated_at': _format_datetime,
+    }
+
+    def __init__(self, rows, fields=None):
+        self.rows = rows
+        self.fields = fields
+
+    @classmethod
+    def project(cls, queryset, fields=None, required=()):
+        """
+        Turn an Appointment queryset into the row dicts this serializer expects.
+        `required` adds columns the caller needs beyond the output (e.g. keyset ordering).
+        """
+        fields = list(cls.sources) if fields is None else fields
+        annotations = {name: _full_name(cls.names[name]) for name in fields if name in cls.names}
+        columns = [cls.sources[name] for name in fields]
+        columns += [name.lstrip('-') for name in required if name.lstrip('-') not in columns]
+        return queryset.annotate(**annotations).values(*columns)
+
+    @staticmethod
+    def to_representation(row):
+        return {
+            'id': row['id'],
+            'patient': row['patient_id'],
+            'doctor': row['doctor_id'],
+            'appointment_date': row['appointment_date'].isoformat(),
+            'start_time': row['start_time'].isoformat(),
+            'end_time': row['end_time'].isoformat(),
+            'service_type': row['service_type'],
+            'status': row['status'],
+            'notes': row['notes'],
+            'appointment_id': row['appointment_id'],
+            'patient_name': row['patient_name'],
+            'doctor_name': row['doctor_name'],
+            'created_at': _format_datetime(row['created_at']),
+            'updated_at': _format_datetime(row['updated_at']),
+        }
+
+    def to_sparse_representation(self, row):
+        return {
+            name: self.formats[name](row[self.sources[name]]) if name in self.formats else row[self.sources[name]]
+            for name in self.fields
+        }
+
+    @property
+    def data(self):
+        if self.fields is None:
+            return [self.to_representation(row) for row in self.rows]
+        return [self.to_sparse_representation(row) for row in self.rows]
+
+
+class WaitingListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for waiting lists."""
+    sparse_sources = {
+        'patient_name': ['patient__user__first_name', 'patient__user__last_name'],
+        'doctor_name': ['doctor__user__first_name', 'doctor__user__last_name'],
+    }
     patient_name = serializers.CharField(source='patient.user.get_full_name', read_only=True)
     doctor_name = serializers.CharField(source='doctor.user.get_full_name', read_only=True)
 
@@ -56,4 +151,41 @@ class WaitingListSerializer(serializers.ModelSerializer):
             'id', 'patient', 'doctor', 'requested_date', 'requested_time',
             'notes', 'is_notified', 'patient_name', 'doctor_name', 'created_at'
         ]
-        read_only_fields = ['id', 'created_at']
\ No newline at end of file
+        read_only_fields = ['id', 'created_at']
+
+
+class BulkAppointmentItemSerializer(serializers.Serializer):
+    """One appointment in a bulk booking request (patient is only honoured for staff)."""
+    patient = serializers.IntegerField(required=False)
+    doctor = serializers.IntegerField()
+    appointment_date = serializers.DateField()
+    start_time = serializers.TimeField()
+    end_time = serializers.TimeField()
+    service_type = serializers.ChoiceField(choices=SERVICE_TYPES)
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+
+    def validate(self, data):
+        if data['start_time'] >= data['end_time']:
+            raise serializers.ValidationError("Start time must be before end time.")
+        return data
+
+
+class BulkAppointmentSerializer(serializers.Serializer):
+    """Envelope for bulk booking; items are validated one by one by the service."""
+    appointments = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False, max_length=BULK_BOOKING_MAX_ITEMS
+    )
+
+
+class AppointmentExportSerializer(serializers.Serializer):
+    """Query parameters for streaming appointment exports."""
+    file_format = serializers.ChoiceField(choices=EXPORT_FORMATS, default='csv')  # ?format= is DRF's renderer override
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+    status = serializers.ChoiceField(choices=APPOINTMENT_STATUSES, required=False)
+    service_type = serializers.ChoiceField(choices=SERVICE_TYPES, required=False)
+
+    def validate(self, data):
+        if data.get('start_date') and data.get('end_date') and data['start_date'] > data['end_date']:
+            raise serializers.ValidationError("start_date must be on or before end_date.")
+        return data
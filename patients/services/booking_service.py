@@ -1,35 +1,179 @@
-from ..models import Appointment, WaitingList
-from ..serializers import AppointmentSerializer
-from doctors.models import DoctorProfile, Schedule
+from ..models import Appointment, WaitingList, PatientProfile
+from ..serializers import BulkAppointmentItemSerializer
+from doctors.models import DoctorProfile
 from common.exceptions import AppointmentConflictError
-from common.utils import get_current_datetime
 from ..utils.validators import validate_appointment
-from ..utils.constants import CANCELLATION_POLICY_HOURS
-from ..utils.helpers import is_past_datetime
+from ..utils.constants import (
+    CANCELLATION_POLICY_HOURS, BOOKING_LOCK_RETRIES, BOOKING_LOCK_TIMEOUT_MS, BOOKING_RETRY_BACKOFF_SECONDS
+)
+from ..utils.helpers import is_past_datetime, generate_appointment_id, is_slot_conflict
+from ..utils.constants import BULK_BOOKING_BATCH_SIZE
+from bisect import bisect_right
+from collections import defaultdict
 from datetime import timedelta
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, OperationalError, transaction
 from django.utils import timezone
+import random
+import time
 
 class AppointmentFactory:
     """Factory for creating appointments (GOF: Factory Pattern)."""
     @staticmethod
     def create_appointment(patient, doctor, data):
         validate_appointment(data)
-        appointment = Appointment.objects.create(patient=patient, doctor=doctor, **data)
+        fields = {key: value for key, value in data.items() if key not in ('patient', 'doctor')}
+        appointment = Appointment.objects.create(patient=patient, doctor=doctor, **fields)
         return appointment
 
 class BookingService:
     """Service for booking, canceling, rescheduling."""
+    def _run_locked(self, doctor, date, action):
+        """
+        Run action(bitmap) in a transaction holding the doctor-day lock.
+        Lock timeouts and deadlocks are retried a bounded number of times; violations of
+        the double-booking guards surface as AppointmentConflictError, other integrity
+        errors propagate.
+        """
+        from doctors.services.bitmap_service import SlotBitmapService
+        bitmaps = SlotBitmapService()
+        for attempt in range(1, BOOKING_LOCK_RETRIES + 1):
+            try:
+                with transaction.atomic():
+                    bitmap = bitmaps.lock_day(doctor, date, timeout_ms=BOOKING_LOCK_TIMEOUT_MS)
+                    return action(bitmap)
+            except IntegrityError as error:
+                if not is_slot_conflict(error):
+                    raise
+                raise AppointmentConflictError("Appointment overlaps with existing booking.")
+            except OperationalError:
+                if attempt == BOOKING_LOCK_RETRIES:
+                    raise
+                time.sleep(BOOKING_RETRY_BACKOFF_SECONDS * attempt * (1 + random.random()))
+
     def book_appointment(self, patient, data):
         doctor_id = data.get('doctor')
         doctor = DoctorProfile.objects.get(id=doctor_id)
-        # Check availability (integrate with doctor's schedule service)
-        from doctors.services.schedule_service import ScheduleService
-        service = ScheduleService()
-        if not service.check_availability(doctor, data['appointment_date'], data['start_time'], data['end_time']):
+        validate_appointment(data)
+        from doctors.services.bitmap_service import masks_allow
+
+        def book(bitmap):
+            # Only working hours are checked here; overlaps with other bookings are
+            # rejected by the database constraint and surface as AppointmentConflictError
+            if not masks_allow(bitmap.working, 0, data['start_time'], data['end_time']):
+                raise AppointmentConflictError("Slot is outside working hours.")
+            return AppointmentFactory.create_appointment(patient, doctor, data)
+
+        try:
+            return self._run_locked(doctor, data['appointment_date'], book)
+        except AppointmentConflictError:
             # Add to waiting list
             WaitingList.objects.create(patient=patient, doctor=doctor, requested_date=data['appointment_date'], requested_time=data['start_time'])
             raise ValueError("Slot unavailable; added to waiting list.")
-        return AppointmentFactory.create_appointment(patient, doctor, data)
+
+    def bulk_book_appointments(self, items, patient=None, allow_patient_override=False):
+        """
+        Book many appointments in one go and return one result per item, in order.
+        Existing bookings and schedules are loaded with set-based queries; conflicts
+        against them and within the batch are found in memory with sorted intervals,
+        and accepted rows are inserted with bulk_create in a single transaction.
+        """
+        from doctors.services.bitmap_service import working_mask, masks_allow
+        from doctors.services.override_service import ScheduleResolver
+        from doctors.models import SlotBitmap
+        from doctors.services.dashboard_service import DashboardService
+        from doctors.utils.constants import ACTIVE_APPOINTMENT_STATUSES
+        results = [None] * len(items)
+        pending = []
+        for index, item in enumerate(items):
+            serializer = BulkAppointmentItemSerializer(data=item)
+            if not serializer.is_valid():
+                results[index] = {'index': index, 'status': 'invalid', 'errors': serializer.errors}
+                continue
+            data = serializer.validated_data
+            try:
+                validate_appointment(data)
+            except ValidationError as e:
+                results[index] = {'index': index, 'status': 'invalid', 'errors': e.messages}
+                continue
+            requested_patient = data.get('patient')
+            if allow_patient_override and requested_patient:
+                patient_id = requested_patient
+            elif patient and requested_patient in (None, patient.id):
+                patient_id = patient.id
+            else:
+                results[index] = {'index': index, 'status': 'invalid', 'errors': ["Cannot book for this patient."]}
+                continue
+            pending.append((index, patient_id, data))
+        if not pending:
+            return results
+
+        doctor_ids = {data['doctor'] for _, _, data in pending}
+        known_doctors = set(DoctorProfile.objects.filter(id__in=doctor_ids).values_list('id', flat=True))
+        patient_ids = {patient_id for _, patient_id, _ in pending}
+        if patient and patient_ids == {patient.id}:
+            known_patients = patient_ids
+        else:
+            known_patients = set(PatientProfile.objects.filter(id__in=patient_ids).values_list('id', flat=True))
+        first_day = min(data['appointment_date'] for _, _, data in pending)
+        last_day = max(data['appointment_date'] for _, _, data in pending)
+        working = {
+            key: working_mask(schedule)
+            for key, schedule in ScheduleResolver().resolve_range(known_doctors, first_day, last_day).items()
+        }
+        starts, ends = defaultdict(list), defaultdict(list)
+        for doctor_id, day, start, end in Appointment.objects.filter(
+            doctor_id__in=known_doctors, appointment_date__range=(first_day, last_day),
+            status__in=ACTIVE_APPOINTMENT_STATUSES
+        ).order_by('start_time').values_list('doctor_id', 'appointment_date', 'start_time', 'end_time'):
+            starts[(doctor_id, day)].append(start)
+            ends[(doctor_id, day)].append(end)
+
+        rows, accepted = [], []
+        for index, patient_id, data in pending:
+            doctor_id, day = data['doctor'], data['appointment_date']
+            start, end = data['start_time'], data['end_time']
+            if doctor_id not in known_doctors or patient_id not in known_patients:
+                results[index] = {'index': index, 'status': 'invalid', 'errors': ["Unknown doctor or patient."]}
+                continue
+            mask = working.get((doctor_id, day), 0)
+            if not masks_allow(mask, 0, start, end):
+                results[index] = {'index': index, 'status': 'unavailable', 'errors': ["Slot is outside working hours."]}
+                continue
+            # Active intervals per doctor-day are disjoint and sorted, so only neighbours can overlap
+            day_starts, day_ends = starts[(doctor_id, day)], ends[(doctor_id, day)]
+            position = bisect_right(day_starts, start)
+            if (position and day_ends[position - 1] > start) or \
+                    (position < len(day_starts) and day_starts[position] < end):
+                results[index] = {'index': index, 'status': 'conflict', 'errors': ["Slot overlaps an existing booking."]}
+                continue
+            day_starts.insert(position, start)
+            day_ends.insert(position, end)
+            rows.append(Appointment(
+                patient_id=patient_id, doctor_id=doctor_id, appointment_date=day, start_time=start,
+                end_time=end, service_type=data['service_type'], notes=data.get('notes', ''),
+                appointment_id=generate_appointment_id(day),
+            ))
+            accepted.append(index)
+
+        if rows:
+            try:
+                with transaction.atomic():
+                    Appointment.objects.bulk_create(rows, batch_size=BULK_BOOKING_BATCH_SIZE)
+                    # bulk_create skips signals: drop the touched bitmaps so they rebuild lazily
+                    SlotBitmap.objects.filter(
+                        doctor_id__in={row.doctor_id for row in rows}, date__range=(first_day, last_day)
+                    ).delete()
+            except IntegrityError as error:
+                if not is_slot_conflict(error):
+                    raise
+                raise AppointmentConflictError("A concurrent booking conflicted with this batch; please retry.")
+            dashboards = DashboardService()
+            for doctor_id in {row.doctor_id for row in rows}:
+                dashboards.invalidate(doctor_id)
+        for index, row in zip(accepted, rows):
+            results[index] = {'index': index, 'status': 'booked', 'id': row.pk, 'appointment_id': row.appointment_id}
+        return results
 
     def cancel_appointment(self, appointment):
         if is_past_datetime(appointment.appointment_date) or (timezone.now() + timedelta(hours=CANCELLATION_POLICY_HOURS)) > timezone.datetime.combine(appointment.appointment_date, appointment.start_time):
@@ -42,13 +186,19 @@ class BookingService:
         new_date = data.get('appointment_date')
         new_start = data.get('start_time')
         new_end = data.get('end_time')
-        from doctors.services.schedule_service import ScheduleService
-        service = ScheduleService()
-        if not service.check_availability(appointment.doctor, new_date, new_start, new_end):
-            raise AppointmentConflictError("New slot unavailable.")
-        appointment.appointment_date = new_date
-        appointment.start_time = new_start
-        appointment.end_time = new_end
-        appointment.status = 'rescheduled'
-        appointment.save()
-        return appointment
\ No newline at end of file
+        from doctors.services.bitmap_service import masks_allow, booked_excluding
+
+        def reschedule(bitmap):
+            # The moved row leaves the active statuses, so the overlap constraint cannot
+            # catch it: check the locked day's booked units, minus the appointment's own
+            booked = booked_excluding(bitmap.booked, appointment.doctor_id, new_date, appointment)
+            if not masks_allow(bitmap.working, booked, new_start, new_end):
+                raise AppointmentConflictError("New slot unavailable.")
+            appointment.appointment_date = new_date
+            appointment.start_time = new_start
+            appointment.end_time = new_end
+            appointment.status = 'rescheduled'
+            appointment.save()
+            return appointment
+
+        return self._run_locked(appointment.doctor, new_date, reschedule)
@@ -1,3 +1,591 @@
-from django.test import TestCase
+import csv
+import json
+import sys
+import threading
+import time as timer
+from datetime import date, time, timedelta
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from doctors.models import DoctorProfile, Schedule
+from .models import PatientProfile, Appointment, WaitingList
+from doctors.services.bitmap_service import SlotBitmapService
+from doctors.utils.constants import ACTIVE_APPOINTMENT_STATUSES
+from .serializers import AppointmentSerializer, AppointmentReadSerializer
+from .services.booking_service import BookingService
+from .services.export_service import AppointmentExportService, CsvExportFormat
+from common.exceptions import AppointmentConflictError
+from common.testing import QueryPlanAssertionsMixin, QueryBudgetAssertionsMixin
+from doctors.services.appointment_service import AppointmentService
 
-# Create your tests here.
+User = get_user_model()
+
+
+def create_doctor(username, specialty='Cardiology', **kwargs):
+    user = User.objects.create_user(username, f'{username}@example.com', 'pass1234', role='is_doctor')
+    return DoctorProfile.objects.create(user=user, specialty=specialty, license_number=f'LIC-{username}', **kwargs)
+
+
+def create_patient(username):
+    user = User.objects.create_user(username, f'{username}@example.com', 'pass1234', role='is_patient')
+    return PatientProfile.objects.create(user=user, date_of_birth=date(1990, 1, 1), gender='other')
+
+
+def booking_data(doctor, day, start, end, service_type='consultation'):
+    return {'doctor': doctor.id, 'appointment_date': day, 'start_time': start, 'end_time': end, 'service_type': service_type}
+
+
+class BookingServiceTests(TestCase):
+    """Tests for the locked booking path."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.doctor = create_doctor('strange')
+        cls.patient = create_patient('martha')
+        cls.day = date(2030, 1, 7)
+        Schedule.objects.create(doctor=cls.doctor, day_of_week='monday', start_time=time(9), end_time=time(12))
+
+    def setUp(self):
+        caches['availability'].clear()
+
+    def test_overlapping_booking_goes_to_waiting_list(self):
+        service = BookingService()
+        first = service.book_appointment(self.patient, booking_data(self.doctor, self.day, time(9), time(10)))
+        second = service.book_appointment(self.patient, booking_data(self.doctor, self.day, time(10), time(11)))
+        self.assertNotEqual(first.appointment_id, second.appointment_id)
+        with self.assertRaises(ValueError):
+            service.book_appointment(self.patient, booking_data(self.doctor, self.day, time(9, 30), time(10, 30)))
+        self.assertEqual(WaitingList.objects.filter(patient=self.patient).count(), 1)
+        self.assertEqual(Appointment.objects.filter(doctor=self.doctor).count(), 2)
+
+    def test_reschedule_within_same_day_ignores_own_slot(self):
+        service = BookingService()
+        appointment = service.book_appointment(self.patient, booking_data(self.doctor, self.day, time(9), time(10)))
+        service.reschedule_appointment(
+            appointment, {'appointment_date': self.day, 'start_time': time(9, 30), 'end_time': time(10, 30)}
+        )
+        appointment.refresh_from_db()
+        self.assertEqual(appointment.start_time, time(9, 30))
+
+    def test_reschedule_onto_a_taken_slot_conflicts(self):
+        service = BookingService()
+        service.book_appointment(self.patient, booking_data(self.doctor, self.day, time(9), time(10)))
+        moved = service.book_appointment(self.patient, booking_data(self.doctor, self.day, time(11), time(12)))
+        self.client.force_login(self.patient.user)
+        response = self.client.post(
+            f'/patients/appointments/{moved.pk}/reschedule/',
+            {'appointment_date': self.day.isoformat(), 'start_time': '09:00', 'end_time': '10:00'},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 409)
+        moved.refresh_from_db()
+        self.assertEqual((moved.start_time, moved.status), (time(11), 'booked'))
+
+    def test_rescheduled_slot_stays_taken(self):
+        service = BookingService()
+        moved = service.book_appointment(self.patient, booking_data(self.doctor, self.day, time(9), time(10)))
+        service.reschedule_appointment(moved, {'appointment_date': self.day, 'start_time': time(10), 'end_time': time(11)})
+        self.assertEqual(Appointment.objects.get(pk=moved.pk).status, 'rescheduled')
+        serializer = AppointmentSerializer(data={
+            'patient': self.patient.id, 'doctor': self.doctor.id, 'appointment_date': self.day.isoformat(),
+            'start_time': '10:30', 'end_time': '11:00', 'service_type': 'follow_up',
+        })
+        with self.assertRaises(AppointmentConflictError):
+            serializer.is_valid()
+        with self.assertRaises(AppointmentConflictError):
+            service._run_locked(self.doctor, self.day, lambda bitmap: Appointment.objects.create(
+                patient=self.patient, doctor=self.doctor, appointment_date=self.day,
+                start_time=time(10), end_time=time(10, 30), service_type='lab'
+            ))
+        with self.assertRaises(ValueError):
+            service.book_appointment(self.patient, booking_data(self.doctor, self.day, time(10), time(11)))
+        self.assertEqual(list(Appointment.objects.filter(doctor=self.doctor).values_list('status', flat=True)), ['rescheduled'])
+
+
+class OverlapConstraintTests(TestCase):
+    """The database rejects overlapping active appointments for one doctor."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.doctor = create_doctor('watson')
+        cls.patient = create_patient('sherlock')
+        cls.day = date(2030, 1, 7)
+        Schedule.objects.create(doctor=cls.doctor, day_of_week='monday', start_time=time(9), end_time=time(12))
+
+    def setUp(self):
+        caches['availability'].clear()
+
+    def create(self, start, end, status='booked'):
+        return Appointment.objects.create(
+            patient=self.patient, doctor=self.doctor, appointment_date=self.day, start_time=start,
+            end_time=end, service_type='lab', status=status
+        )
+
+    def test_insert_and_update_overlaps_are_rejected(self):
+        first = self.create(time(9), time(10))
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.create(time(9, 30), time(10, 30))
+        second = self.create(time(10), time(11))
+        second.start_time = time(9, 45)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            second.save()
+        first.status = 'canceled'
+        first.save()
+        self.create(time(9), time(9, 30))
+
+    def test_inactive_rows_do_not_conflict(self):
+        self.create(time(9), time(10), status='canceled')
+        self.create(time(9), time(10))
+
+    def test_booking_translates_violation_into_conflict(self):
+        self.create(time(9, 10), time(9, 20))
+        with self.assertRaises(AppointmentConflictError):
+            BookingService()._run_locked(self.doctor, self.day, lambda bitmap: self.create(time(9), time(9, 15)))
+
+    def test_other_integrity_errors_are_not_conflicts(self):
+        taken = self.create(time(9), time(9, 15))
+        duplicate_id = lambda bitmap: Appointment.objects.create(
+            patient=self.patient, doctor=self.doctor, appointment_date=self.day, start_time=time(10),
+            end_time=time(10, 15), service_type='lab', appointment_id=taken.appointment_id
+        )
+        with self.assertRaises(IntegrityError):
+            BookingService()._run_locked(self.doctor, self.day, duplicate_id)
+
+
+class BulkBookingTests(TestCase):
+    """Bulk booking detects conflicts in memory and inserts accepted rows together."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.doctor = create_doctor('house')
+        cls.patient = create_patient('wilson')
+        cls.day = date(2030, 1, 7)
+        Schedule.objects.create(doctor=cls.doctor, day_of_week='monday', start_time=time(8), end_time=time(20))
+
+    def setUp(self):
+        caches['availability'].clear()
+
+    def item(self, start, end, **extra):
+        data = booking_data(self.doctor, self.day.isoformat(), start.isoformat(), end.isoformat())
+        data.update(extra)
+        return data
+
+    def test_results_follow_item_order(self):
+        Appointment.objects.create(
+            patient=self.patient, doctor=self.doctor, appointment_date=self.day,
+            start_time=time(8), end_time=time(9), service_type='consultation'
+        )
+        results = BookingService().bulk_book_appointments([
+            self.item(time(9), time(10)),
+            self.item(time(9, 30), time(10, 30)),
+            self.item(time(8, 30), time(9)),
+            self.item(time(20), time(21)),
+            self.item(time(11), time(10)),
+            self.item(time(10), time(11), patient=self.patient.id + 1),
+        ], patient=self.patient)
+        self.assertEqual(
+            [result['status'] for result in results],
+            ['booked', 'conflict', 'conflict', 'unavailable', 'invalid', 'invalid']
+        )
+        self.assertEqual(Appointment.objects.filter(doctor=self.doctor).count(), 2)
+        self.assertFalse(SlotBitmapService().is_free(self.doctor, self.day, time(9), time(10)))
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        items = [self.item(time(8 + hour), time(9 + hour)) for hour in range(10)]
+        with self.assertNumQueries(8):
+            results = BookingService().bulk_book_appointments(items, patient=self.patient)
+        self.assertTrue(all(result['status'] == 'booked' for result in results))
+
+    def test_appointment_id_collision_is_not_reported_as_a_conflict(self):
+        results = BookingService().bulk_book_appointments([self.item(time(8), time(9))], patient=self.patient)
+        self.assertEqual(len(results[0]['appointment_id']), len('APT-20300107-') + 16)
+        taken = results[0]['appointment_id']
+        with mock.patch('patients.services.booking_service.generate_appointment_id', return_value=taken):
+            with self.assertRaises(IntegrityError):
+                BookingService().bulk_book_appointments([self.item(time(10), time(11))], patient=self.patient)
+
+
+class QueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+    """The hot appointment and waiting list queries must be answered from an index."""
+
+    @classmethod
+    def setUpTestData(cls):
+        doctors = [create_doctor(f'plan{index}') for index in range(5)]
+        patients = [create_patient(f'planpatient{index}') for index in range(5)]
+        cls.doctor, cls.patient, cls.day = doctors[0], patients[0], date(2030, 1, 7)
+        Appointment.objects.bulk_create([
+            Appointment(
+                patient=patients[index % 5], doctor=doctors[index % 5], appointment_date=date(2030, 1, 1 + index % 28),
+                start_time=time(8 + index // 28 % 10), end_time=time(9 + index // 28 % 10), service_type='lab',
+                status=('booked', 'canceled', 'completed')[index % 3], appointment_id=f'APT-PLAN-{index}'
+            )
+            for index in range(500)
+        ])
+        WaitingList.objects.bulk_create([
+            WaitingList(
+                patient=patients[index % 5], doctor=doctors[index % 5], requested_date=date(2030, 1, 1 + index % 28),
+                requested_time=time(9), is_notified=index % 2 == 0
+            )
+            for index in range(200)
+        ])
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def test_active_slot_lookup_uses_index(self):
+        active_slot = ('appt_active_slot_idx', 'unique_active_appointment_start', 'appt_doctor_date_status_idx')
+        self.assertUsesIndex(SlotBitmapService()._booked_intervals(self.doctor, self.day), *active_slot)
+        self.assertUsesIndex(Appointment.objects.filter(
+            doctor=self.doctor, appointment_date=self.day, status__in=ACTIVE_APPOINTMENT_STATUSES,
+            is_deleted=False, start_time__lt=time(10), end_time__gt=time(9)
+        ), *active_slot)
+
+    def test_doctor_appointment_list_uses_index(self):
+        self.assertUsesIndex(AppointmentService().get_appointments(self.doctor), 'appt_doctor_date_status_idx')
+        self.assertUsesIndex(AppointmentService().get_appointments(self.doctor, status='booked'), 'appt_doctor_date_status_idx')
+
+    def test_patient_appointment_list_uses_index(self):
+        self.assertUsesIndex(
+            Appointment.objects.filter(patient=self.patient).order_by('appointment_date', 'start_time'), 'appt_patient_date_idx'
+        )
+
+    def test_waiting_list_lookup_uses_index(self):
+        self.assertUsesIndex(
+            WaitingList.objects.filter(doctor=self.doctor, requested_date=self.day, is_notified=False), 'waitlist_doctor_date_idx'
+        )
+
+
+class ListQueryBudgetTests(QueryBudgetAssertionsMixin, TestCase):
+    """Patient list endpoints cost the same number of queries for 1 or 500 rows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.doctor = create_doctor('budgetdoc')
+        cls.patient = create_patient('budgetpatient')
+
+    def add_appointments(self, total):
+        existing = Appointment.objects.count()
+        Appointment.objects.bulk_create([
+            Appointment(
+                patient=self.patient, doctor=self.doctor, appointment_date=date(2030, 1, 1) + timedelta(days=index // 10),
+                start_time=time(8 + index % 10), end_time=time(9 + index % 10), service_type='consultation',
+                appointment_id=f'APT-BUDGET-{index}'
+            )
+            for index in range(existing, total)
+        ])
+
+    def add_waiting_entries(self, total):
+        existing = WaitingList.objects.count()
+        WaitingList.objects.bulk_create([
+            WaitingList(patient=self.patient, doctor=self.doctor, requested_date=date(2030, 1, 1), requested_time=time(9))
+            for _ in range(existing, total)
+        ])
+
+    def test_appointment_list(self):
+        self.client.force_login(self.patient.user)
+        self.assertConstantQueries(lambda: self.client.get('/patients/appointments/', {'page_size': 100}), self.add_appointments)
+        self.assertEqual(len(self.client.get('/patients/appointments/', {'page_size': 100}).json()['results']), 100)
+
+    def test_waiting_list(self):
+        self.client.force_login(self.patient.user)
+        self.assertConstantQueries(lambda: self.client.get('/patients/waiting-list/', {'page_size': 100}), self.add_waiting_entries)
+        self.assertEqual(len(self.client.get('/patients/waiting-list/', {'page_size': 100}).json()['results']), 100)
+
+
+class KeysetPaginationTests(TestCase):
+    """Appointment lists page by (date, start, id) cursors without OFFSET or COUNT."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.doctor = create_doctor('pagedoc')
+        cls.patient = create_patient('pagepatient')
+        Appointment.objects.bulk_create([
+            Appointment(
+                patient=cls.patient, doctor=cls.doctor, appointment_date=date(2030, 1, 1) + timedelta(days=index % 5),
+                start_time=time(8 + index // 5), end_time=time(9 + index // 5), service_type='lab',
+                appointment_id=f'APT-PAGE-{index}'
+            )
+            for index in range(45)
+        ])
+
+    def test_pages_cover_every_row_in_order(self):
+        self.client.force_login(self.patient.user)
+        url, seen = '/patients/appointments/', []
+        with CaptureQueriesContext(connection) as context:
+            while url:
+                body = self.client.get(url, {'page_size': 10} if not seen else None).json()
+                seen.extend((row['appointment_date'], row['start_time'], row['id']) for row in body['results'])
+                url = body['next']
+        self.assertEqual(len(seen), 45)
+        self.assertEqual(seen, sorted(seen))
+        sql = ' '.join(query['sql'] for query in context.captured_queries).upper()
+        self.assertNotIn('OFFSET', sql)
+        self.assertNotIn('COUNT(', sql)
+
+    def test_invalid_cursor_is_rejected(self):
+        self.client.force_login(self.patient.user)
+        self.assertEqual(self.client.get('/patients/appointments/', {'cursor': 'garbage'}).status_code, 404)
+
+
+class AppointmentFilterTests(QueryPlanAssertionsMixin, TestCase):
+    """Declarative filters on appointment and waiting-list endpoints."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.doctor = create_doctor('filterdoc')
+        cls.patient = create_patient('filterpatient')
+        for index in range(4):
+            Appointment.objects.create(
+                patient=cls.patient, doctor=cls.doctor, appointment_date=date(2030, 1, 7) + timedelta(days=index),
+                start_time=time(9), end_time=time(10), service_type='lab' if index % 2 else 'consultation',
+                status='confirmed' if index == 3 else 'booked'
+            )
+
+    def test_patient_list_filters_by_date_range_and_service(self):
+        self.client.force_login(self.patient.user)
+        body = self.client.get('/patients/appointments/', {'date_from': '2030-01-08', 'service_type': 'lab'}).json()
+        self.assertEqual([row['appointment_date'] for row in body['results']], ['2030-01-08', '2030-01-10'])
+
+    def test_doctor_list_filters_by_status(self):
+        self.client.force_login(self.doctor.user)
+        body = self.client.get('/doctors/appointments/', {'status': 'confirmed'}).json()
+        self.assertEqual([row['appointment_date'] for row in body['results']], ['2030-01-10'])
+
+    def test_invalid_filter_values_return_400(self):
+        self.client.force_login(self.patient.user)
+        response = self.client.get('/patients/appointments/', {'date_from': 'soon', 'status': 'lost'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()), {'date_from', 'status'})
+        self.assertEqual(self.client.get('/patients/waiting-list/', {'doctor': 'abc'}).status_code, 400)
+
+    def test_filtered_doctor_query_uses_index(self):
+        queryset = AppointmentService().get_appointments(self.doctor, filters={'date_from': '2030-01-08', 'status': 'booked'})
+        self.assertEqual(queryset.count(), 2)
+        self.assertUsesIndex(queryset, 'appt_doctor_date_status_idx')
+
+    def test_schema_documents_filter_fields(self):
+        from common.filters import filterset_parameters
+        from .filters import AppointmentFilter
+        parameters = {parameter.name: parameter for parameter in filterset_parameters(AppointmentFilter)}
+        self.assertEqual(set(parameters), {'date_from', 'date_to', 'status', 'service_type', 'doctor', 'patient'})
+        self.assertIn('completed', parameters['status'].enum)
+
+
+class AppointmentReadSerializerTests(TestCase):
+    """The values() fast path renders exactly what AppointmentSerializer renders."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.doctor = create_doctor('fastdoc')
+        cls.doctor.user.first_name = 'Gregory'
+        cls.doctor.user.save()
+        cls.patient = create_patient('fastpatient')
+        cls.patient.user.first_name, cls.patient.user.last_name = 'Lisa', 'Cuddy'
+        cls.patient.user.save()
+        for index, notes in enumerate(['', 'Bring "reports" & scans', 'Ünïcode ✓']):
+            Appointment.objects.create(
+                patient=cls.patient, doctor=cls.doctor, appointment_date=date(2030, 1, 7 + index),
+                start_time=time(9, 15, 30), end_time=time(10), service_type='lab', notes=notes
+            )
+
+    def render_both(self):
+        queryset = Appointment.objects.order_by('appointment_date', 'start_time', 'id')
+        renderer = JSONRenderer()
+        return (
+            renderer.render(AppointmentSerializer(queryset, many=True).data),
+            renderer.render(AppointmentReadSerializer(AppointmentReadSerializer.project(queryset)).data),
+        )
+
+    def test_output_is_byte_identical(self):
+        expected, actual = self.render_both()
+        self.assertEqual(actual, expected)
+        with timezone.override('Asia/Kolkata'):
+            expected, actual = self.render_both()
+        self.assertEqual(actual, expected)
+
+    def test_projection_is_a_single_query(self):
+        with self.assertNumQueries(1):
+            AppointmentReadSerializer(AppointmentReadSerializer.project(Appointment.objects.all())).data
+
+
+class SparseFieldsetTests(TestCase):
+    """?fields= and ?omit= trim both the payload and the query."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.doctor = create_doctor('sparsedoc')
+        cls.patient = create_patient('sparsepatient')
+        cls.appointment = Appointment.objects.create(
+            patient=cls.patient, doctor=cls.doctor, appointment_date=date(2030, 1, 7), start_time=time(9),
+            end_time=time(10), service_type='lab', notes='Fasting required'
+        )
+
+    def get(self, url, params):
+        self.client.force_login(self.patient.user)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json(), context.captured_queries[-1]['sql']
+
+    def test_appointment_list_projects_requested_columns(self):
+        body, sql = self.get('/patients/appointments/', {'fields': 'id,appointment_date,start_time,status'})
+        self.assertEqual(body['results'], [{'id': self.appointment.id, 'appointment_date': '2030-01-07', 'start_time': '09:00:00', 'status': 'booked'}])
+        self.assertNotIn('auth', sql.lower().split('from', 1)[1])
+        self.assertNotIn('notes', sql)
+
+    def test_detail_omit_skips_name_joins(self):
+        body, sql = self.get(f'/patients/profiles/{self.patient.pk}/', {'omit': 'medical_history,user_full_name'})
+        self.assertNotIn('medical_history', body)
+        self.assertNotIn('user_full_name', body)
+        self.assertIn('gender', body)
+        self.assertNotIn('JOIN', sql)
+        self.assertNotIn('medical_history', sql)
+
+    def test_waiting_list_keeps_one_name_join(self):
+        WaitingList.objects.create(patient=self.patient, doctor=self.doctor, requested_date=date(2030, 1, 7), requested_time=time(9))
+        body, sql = self.get('/patients/waiting-list/', {'fields': 'id,doctor_name'})
+        self.assertEqual(list(body['results'][0]), ['id', 'doctor_name'])
+        self.assertEqual(sql.count('JOIN'), 2)  # doctor profile and its user only
+
+
+class ConditionalGetTests(TestCase):
+    """Profile endpoints revalidate against the profile and its user row."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.patient = create_patient('etagpatient')
+
+    def test_name_change_on_user_invalidates_profile_etag(self):
+        self.client.force_login(self.patient.user)
+        url = f'/patients/profiles/{self.patient.pk}/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get('/patients/profiles/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        user = self.patient.user
+        user.first_name = 'Renamed'
+        user.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Renamed', response.json()['user_full_name'])
+
+
+
+class AppointmentExportTests(TestCase):
+    """Streaming CSV/NDJSON exports for doctors and staff."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.doctor = create_doctor('exportdoc')
+        cls.other_doctor = create_doctor('exportother')
+        cls.patient = create_patient('exportpatient')
+        cls.staff = User.objects.create_user('exportstaff', 'staff@example.com', 'pass1234', role='is_superuser', is_staff=True)
+        for index in range(6):
+            Appointment.objects.create(
+                patient=cls.patient, doctor=cls.doctor if index < 5 else cls.other_doctor,
+                appointment_date=date(2030, 1, 7) + timedelta(days=index), start_time=time(9), end_time=time(10),
+                service_type='lab' if index % 2 else 'consultation', status='completed' if index == 4 else 'booked'
+            )
+
+    def read_body(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_staff_csv_export_applies_filters(self):
+        self.client.force_login(self.staff)
+        response = self.client.get('/patients/staff/appointments/export/', {
+            'start_date': '2030-01-08', 'end_date': '2030-01-12', 'service_type': 'lab'
+        })
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.DictReader(self.read_body(response).splitlines()))
+        self.assertEqual([row['appointment_date'] for row in rows], ['2030-01-08', '2030-01-10', '2030-01-12'])
+        self.assertEqual(rows[0]['doctor_name'], self.doctor.user.get_full_name)
+
+    def test_csv_export_neutralizes_formulas(self):
+        payloads = ['=HYPERLINK("http://evil.example")', '+1+1', '-2', '@SUM(A1)', '\tcmd', '\rcmd']
+        appointments = Appointment.objects.order_by('appointment_date')
+        for appointment, payload in zip(appointments, payloads):
+            Appointment.objects.filter(pk=appointment.pk).update(notes=payload)
+        body = ''.join(AppointmentExportService().stream(appointments, 'csv'))
+        notes = [row['notes'] for row in csv.DictReader(body.splitlines(True))]
+        self.assertEqual(notes, ["'" + payload for payload in payloads])
+        self.assertEqual(CsvExportFormat.escape('Follow-up - fasting'), 'Follow-up - fasting')
+
+    def test_doctor_ndjson_export_is_scoped_and_matches_list_output(self):
+        self.client.force_login(self.doctor.user)
+        response = self.client.get('/doctors/appointments/export/', {'file_format': 'ndjson', 'status': 'booked'})
+        records = [json.loads(line) for line in self.read_body(response).splitlines()]
+        expected = Appointment.objects.filter(doctor=self.doctor, status='booked').order_by('appointment_date')
+        self.assertEqual(records, AppointmentReadSerializer(AppointmentReadSerializer.project(expected)).data)
+
+    def test_export_is_staff_only_and_validates_filters(self):
+        self.client.force_login(self.patient.user)
+        self.assertEqual(self.client.get('/patients/staff/appointments/export/').status_code, 403)
+        self.client.force_login(self.staff)
+        response = self.client.get('/patients/staff/appointments/export/', {'start_date': '2030-02-01', 'end_date': '2030-01-01'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_stream_yields_bounded_chunks(self):
+        chunks = list(AppointmentExportService().stream(Appointment.objects.all(), 'csv', chunk_size=2))
+        self.assertEqual(len(chunks), 4)  # header + 6 rows, two lines per chunk
+        self.assertTrue(all(chunk.count('\n') <= 2 for chunk in chunks))
+
+@skipUnlessDBFeature('has_select_for_update')
+class ConcurrentBookingStressTests(TransactionTestCase):
+    """Hammer one doctor-day from many threads and prove no slot is double booked."""
+    threads = 16
+    attempts_per_thread = 10
+
+    def test_concurrent_bookings_never_double_book(self):
+        caches['availability'].clear()
+        doctor = create_doctor('stress')
+        other_doctor = create_doctor('calm')
+        day = date(2030, 1, 7)
+        for profile in (doctor, other_doctor):
+            Schedule.objects.create(doctor=profile, day_of_week='monday', start_time=time(8), end_time=time(20))
+        patients = [create_patient(f'stress{index}') for index in range(self.threads)]
+        successes = []
+        errors = []
+
+        def worker(index):
+            service = BookingService()
+            target = doctor if index % 4 else other_doctor
+            try:
+                for attempt in range(self.attempts_per_thread):
+                    hour = 8 + (index + attempt) % 12
+                    try:
+                        service.book_appointment(
+                            patients[index], booking_data(target, day, time(hour), time(hour + 1))
+                        )
+                        successes.append(hour)
+                    except ValueError:
+                        pass
+            except Exception as exc:  # Surface unexpected errors in the main thread
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        started = timer.perf_counter()
+        workers = [threading.Thread(target=worker, args=(index,)) for index in range(self.threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = timer.perf_counter() - started
+
+        self.assertEqual(errors, [])
+        for profile in (doctor, other_doctor):
+            active = list(Appointment.objects.filter(
+                doctor=profile, appointment_date=day, status__in=ACTIVE_APPOINTMENT_STATUSES
+            ).order_by('start_time').values_list('start_time', 'end_time'))
+            for (_, previous_end), (next_start, _) in zip(active, active[1:]):
+                self.assertLessEqual(previous_end, next_start)
+        self.assertEqual(len(successes), Appointment.objects.count())
+        sys.stderr.write(
+            f"\nConcurrent booking: {len(successes)} bookings in {elapsed:.2f}s "
+            f"({len(successes) / elapsed:.1f} bookings/s, {self.threads} threads)\n"
+        )
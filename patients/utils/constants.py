@@ -1,4 +1,19 @@
 CANCELLATION_POLICY_HOURS = 24
 REMINDER_HOURS_BEFORE = 24
 SERVICE_TYPES = ['consultation', 'lab', 'follow_up']
-GENDERS = ['male', 'female', 'other']
\ No newline at end of file
+GENDERS = ['male', 'female', 'other']
+BOOKING_LOCK_RETRIES = 3  # Attempts when the doctor-day lock is contended
+BOOKING_LOCK_TIMEOUT_MS = 2000  # Max wait for the doctor-day row lock (PostgreSQL)
+BOOKING_RETRY_BACKOFF_SECONDS = 0.05
+BULK_BOOKING_MAX_ITEMS = 10000
+BULK_BOOKING_BATCH_SIZE = 1000  # Rows per INSERT in bulk_create
+APPOINTMENT_ORDERING = ('appointment_date', 'start_time', 'id')  # Keyset order for appointment lists
+WAITING_LIST_ORDERING = ('requested_date', 'requested_time', 'id')
+# Database guards against double booking (patients.models.Appointment, migrations 0002 and 0005)
+SLOT_CONFLICT_CONSTRAINTS = ('appointment_no_overlap', 'unique_active_appointment_start')
+# SQLite names the columns, not the index, when unique_active_appointment_start fails
+SQLITE_SLOT_UNIQUE_COLUMNS = 'patients_appointment.doctor_id, patients_appointment.appointment_date, patients_appointment.start_time'
+APPOINTMENT_STATUSES = ['booked', 'confirmed', 'canceled', 'completed', 'rescheduled']
+EXPORT_FORMATS = ['csv', 'ndjson']
+EXPORT_CHUNK_SIZE = 2000  # Rows fetched per server-side cursor round trip (and per streamed chunk)
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')  # Cells spreadsheets would evaluate
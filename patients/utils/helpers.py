@@ -1,5 +1,8 @@
+import uuid
 from datetime import datetime, timedelta
 from django.utils import timezone  # Added
+from django.utils.dateparse import parse_date, parse_time
+from .constants import SLOT_CONFLICT_CONSTRAINTS, SQLITE_SLOT_UNIQUE_COLUMNS
 
 def is_past_datetime(dt):
     """Check if datetime is past."""
@@ -11,4 +14,33 @@ def add_hours_to_datetime(dt, hours):
 
 def format_appointment_display(appointment):
     """Format appointment for display."""
-    return f"{appointment.appointment_date} {appointment.start_time} - {appointment.end_time}"
\ No newline at end of file
+    return f"{appointment.appointment_date} {appointment.start_time} - {appointment.end_time}"
+
+def generate_appointment_id(appointment_date):
+    """
+    Build a unique appointment ID, e.g. 'APT-20250101-1A2B3C4D5E6F7A8B'. The 64 random
+    bits keep collisions negligible even across 10k-row bulk batches.
+    """
+    return f"APT-{appointment_date.strftime('%Y%m%d')}-{uuid.uuid4().hex[:16].upper()}"
+
+def is_slot_conflict(error):
+    """
+    Whether an IntegrityError comes from the double-booking guards (SLOT_CONFLICT_CONSTRAINTS).
+    PostgreSQL names the constraint in the error diagnostics; SQLite reports the trigger
+    message, or the slot columns for the unique index.
+    """
+    constraint = getattr(getattr(error.__cause__, 'diag', None), 'constraint_name', None)
+    if constraint:
+        return constraint in SLOT_CONFLICT_CONSTRAINTS
+    message = str(error)
+    return any(name in message for name in SLOT_CONFLICT_CONSTRAINTS) or message.endswith(SQLITE_SLOT_UNIQUE_COLUMNS)
+
+def normalize_appointment_data(data):
+    """Copy request data, parsing ISO date/time strings into date/time objects."""
+    parsed = {key: data.get(key) for key in data}
+    if isinstance(parsed.get('appointment_date'), str):
+        parsed['appointment_date'] = parse_date(parsed['appointment_date'])
+    for field in ('start_time', 'end_time'):
+        if isinstance(parsed.get(field), str):
+            parsed[field] = parse_time(parsed[field])
+    return parsed
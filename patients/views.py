@@ -3,14 +3,27 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
 from .models import PatientProfile, Appointment, WaitingList
-from .serializers import PatientProfileSerializer, AppointmentSerializer, WaitingListSerializer
+from .serializers import (
+    PatientProfileSerializer, AppointmentSerializer, AppointmentReadSerializer, WaitingListSerializer,
+    BulkAppointmentSerializer, AppointmentExportSerializer
+)
 from .services.booking_service import BookingService
 from .services.notification_service import NotificationService
-from common.permissions import IsAuthenticatedAndActive
+from .services.export_service import AppointmentExportService
+from common.permissions import IsAuthenticatedAndActive, IsStaff
+from common.authentication import with_names
+from common.profiles import patient_id, get_patient
 from .utils.validators import validate_appointment, validate_profile
-from .utils.constants import CANCELLATION_POLICY_HOURS
+from .utils.constants import CANCELLATION_POLICY_HOURS, APPOINTMENT_ORDERING, WAITING_LIST_ORDERING
+from .utils.helpers import normalize_appointment_data
 from django.utils import timezone
 from common.exceptions import AppointmentConflictError
+from drf_spectacular.utils import extend_schema
+from .filters import AppointmentFilter, WaitingListFilter
+from common.filters import apply_filterset, filterset_parameters
+from common.conditional import not_modified, queryset_validators, with_validators
+from common.pagination import KeysetPagination
+from common.serializers import requested_fields
 
 class PatientProfileListCreateView(APIView):
     """List and create patient profiles."""
@@ -18,14 +31,19 @@ class PatientProfileListCreateView(APIView):
 
     def get(self, request):
         profiles = PatientProfile.objects.filter(user=request.user)
-        serializer = PatientProfileSerializer(profiles, many=True)
-        return Response(serializer.data)
+        etag, last_modified = queryset_validators(request, profiles, related=('user',))
+        unchanged = not_modified(request, etag, last_modified)
+        if unchanged:
+            return unchanged
+        profiles = PatientProfileSerializer.sparse_queryset(profiles.select_related('user'), request)
+        serializer = PatientProfileSerializer(profiles, many=True, context={'request': request})
+        return with_validators(Response(serializer.data), etag, last_modified)
 
     def post(self, request):
         validate_profile(request.data)
         serializer = PatientProfileSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save(user=request.user)
+            serializer.save(user=with_names(request.user))  # Bearer-token request users carry no names
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -34,9 +52,14 @@ class PatientProfileDetailView(APIView):
     permission_classes = [IsAuthenticatedAndActive]
 
     def get(self, request, pk):
-        profile = get_object_or_404(PatientProfile, pk=pk, user=request.user)
-        serializer = PatientProfileSerializer(profile)
-        return Response(serializer.data)
+        profiles = PatientProfile.objects.filter(pk=pk, user=request.user)
+        etag, last_modified = queryset_validators(request, profiles, related=('user',))
+        unchanged = not_modified(request, etag, last_modified)
+        if unchanged:
+            return unchanged
+        profile = get_object_or_404(PatientProfileSerializer.sparse_queryset(profiles.select_related('user'), request))
+        serializer = PatientProfileSerializer(profile, context={'request': request})
+        return with_validators(Response(serializer.data), etag, last_modified)
 
     def put(self, request, pk):
         profile = get_object_or_404(PatientProfile, pk=pk, user=request.user)
@@ -56,18 +79,24 @@ class AppointmentListCreateView(APIView):
     """List and book appointments."""
     permission_classes = [IsAuthenticatedAndActive]
 
+    @extend_schema(parameters=filterset_parameters(AppointmentFilter))
     def get(self, request):
-        patient = get_object_or_404(PatientProfile, user=request.user)
-        appointments = Appointment.objects.filter(patient=patient)
-        serializer = AppointmentSerializer(appointments, many=True)
-        return Response(serializer.data)
+        patient_pk = patient_id(request)
+        fields = requested_fields(request, AppointmentReadSerializer.sources)
+        appointments = apply_filterset(AppointmentFilter, request.query_params, Appointment.objects.filter(patient_id=patient_pk))
+        appointments = AppointmentReadSerializer.project(appointments, fields, required=APPOINTMENT_ORDERING)
+        paginator = KeysetPagination(APPOINTMENT_ORDERING)
+        page = paginator.paginate_queryset(appointments, request, view=self)
+        serializer = AppointmentReadSerializer(page, fields)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
-        patient = get_object_or_404(PatientProfile, user=request.user)
-        validate_appointment(request.data)
+        patient = get_patient(request)
+        data = normalize_appointment_data(request.data)
+        validate_appointment(data)
         service = BookingService()
         try:
-            appointment = service.book_appointment(patient, request.data)
+            appointment = service.book_appointment(patient, data)
             serializer = AppointmentSerializer(appointment)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         except AppointmentConflictError as e:
@@ -75,14 +104,50 @@ class AppointmentListCreateView(APIView):
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+class AppointmentBulkCreateView(APIView):
+    """Book many appointments in one request (staff may book for any patient)."""
+    permission_classes = [IsAuthenticatedAndActive]
+
+    def post(self, request):
+        serializer = BulkAppointmentSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        patient = None
+        if not request.user.is_staff:
+            patient = get_patient(request)
+        service = BookingService()
+        try:
+            results = service.bulk_book_appointments(
+                serializer.validated_data['appointments'], patient=patient, allow_patient_override=request.user.is_staff
+            )
+        except AppointmentConflictError as e:
+            return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
+        booked = sum(1 for result in results if result['status'] == 'booked')
+        return Response({"booked": booked, "failed": len(results) - booked, "results": results}, status=status.HTTP_201_CREATED if booked else status.HTTP_200_OK)
+
+class StaffAppointmentExportView(APIView):
+    """Stream all appointments as CSV or NDJSON for clinic staff (filters: date range, status, service type)."""
+    permission_classes = [IsAuthenticatedAndActive, IsStaff]
+
+    def get(self, request):
+        params = AppointmentExportSerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        service = AppointmentExportService()
+        appointments = service.filter(Appointment.objects.all(), **params.validated_data)
+        return service.response(appointments, params.validated_data['file_format'])
+
 class AppointmentDetailView(APIView):
     """Retrieve appointment."""
     permission_classes = [IsAuthenticatedAndActive]
 
     def get(self, request, pk):
-        patient = get_object_or_404(PatientProfile, user=request.user)
-        appointment = get_object_or_404(Appointment, pk=pk, patient=patient)
-        serializer = AppointmentSerializer(appointment)
+        patient_pk = patient_id(request)
+        appointments = AppointmentSerializer.sparse_queryset(
+            Appointment.objects.select_related('patient__user', 'doctor__user'), request
+        )
+        appointment = get_object_or_404(appointments, pk=pk, patient_id=patient_pk)
+        serializer = AppointmentSerializer(appointment, context={'request': request})
         return Response(serializer.data)
 
 class AppointmentCancelView(APIView):
@@ -90,8 +155,8 @@ class AppointmentCancelView(APIView):
     permission_classes = [IsAuthenticatedAndActive]
 
     def post(self, request, pk):
-        patient = get_object_or_404(PatientProfile, user=request.user)
-        appointment = get_object_or_404(Appointment, pk=pk, patient=patient)
+        patient_pk = patient_id(request)
+        appointment = get_object_or_404(Appointment, pk=pk, patient_id=patient_pk)
         service = BookingService()
         try:
             service.cancel_appointment(appointment)
@@ -104,11 +169,11 @@ class AppointmentRescheduleView(APIView):
     permission_classes = [IsAuthenticatedAndActive]
 
     def post(self, request, pk):
-        patient = get_object_or_404(PatientProfile, user=request.user)
-        appointment = get_object_or_404(Appointment, pk=pk, patient=patient)
+        patient_pk = patient_id(request)
+        appointment = get_object_or_404(Appointment, pk=pk, patient_id=patient_pk)
         service = BookingService()
         try:
-            new_appointment = service.reschedule_appointment(appointment, request.data)
+            new_appointment = service.reschedule_appointment(appointment, normalize_appointment_data(request.data))
             serializer = AppointmentSerializer(new_appointment)
             return Response(serializer.data)
         except AppointmentConflictError as e:
@@ -120,14 +185,19 @@ class WaitingListListCreateView(APIView):
     """List and join waiting list."""
     permission_classes = [IsAuthenticatedAndActive]
 
+    @extend_schema(parameters=filterset_parameters(WaitingListFilter))
     def get(self, request):
-        patient = get_object_or_404(PatientProfile, user=request.user)
-        waiting_list = WaitingList.objects.filter(patient=patient)
-        serializer = WaitingListSerializer(waiting_list, many=True)
-        return Response(serializer.data)
+        patient_pk = patient_id(request)
+        waiting_list = apply_filterset(WaitingListFilter, request.query_params, WaitingList.objects.filter(patient_id=patient_pk))
+        waiting_list = waiting_list.select_related('patient__user', 'doctor__user')
+        waiting_list = WaitingListSerializer.sparse_queryset(waiting_list, request, required=WAITING_LIST_ORDERING)
+        paginator = KeysetPagination(WAITING_LIST_ORDERING)
+        page = paginator.paginate_queryset(waiting_list, request, view=self)
+        serializer = WaitingListSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
-        patient = get_object_or_404(PatientProfile, user=request.user)
+        patient = get_patient(request)
         serializer = WaitingListSerializer(data=request.data)
         if serializer.is_valid():
             serializer.save(patient=patient)
@@ -139,7 +209,10 @@ class WaitingListDetailView(APIView):
     permission_classes = [IsAuthenticatedAndActive]
 
     def get(self, request, pk):
-        patient = get_object_or_404(PatientProfile, user=request.user)
-        entry = get_object_or_404(WaitingList, pk=pk, patient=patient)
-        serializer = WaitingListSerializer(entry)
+        patient_pk = patient_id(request)
+        entries = WaitingListSerializer.sparse_queryset(
+            WaitingList.objects.select_related('patient__user', 'doctor__user'), request
+        )
+        entry = get_object_or_404(entries, pk=pk, patient_id=patient_pk)
+        serializer = WaitingListSerializer(entry, context={'request': request})
         return Response(serializer.data)
@@ -0,0 +1,15 @@
+import django_filters
+from .models import NotificationLog
+
+
+class NotificationLogFilter(django_filters.FilterSet):
+    """Query filters for notification logs; the sent_at range uses the (user, sent_at) index."""
+    sent_after = django_filters.DateTimeFilter(field_name='sent_at', lookup_expr='gte', label="Sent at or after")
+    sent_before = django_filters.DateTimeFilter(field_name='sent_at', lookup_expr='lte', label="Sent at or before")
+    message_type = django_filters.ChoiceFilter(choices=NotificationLog._meta.get_field('message_type').choices, label="Message type")
+    channel = django_filters.ChoiceFilter(choices=NotificationLog._meta.get_field('channel').choices, label="Channel")
+    status = django_filters.ChoiceFilter(choices=NotificationLog._meta.get_field('status').choices, label="Delivery status")
+
+    class Meta:
+        model = NotificationLog
+        fields = ['sent_after', 'sent_before', 'message_type', 'channel', 'status']
@@ -41,5 +41,10 @@ class NotificationLog(TimestampMixin):
     )
     error_message = models.TextField(blank=True, help_text="Error details if failed")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'sent_at'], name='notiflog_user_sent_idx'),
+        ]
+
     def __str__(self):
         return f"{self.message_type} to {self.user} via {self.channel} - {self.status}"
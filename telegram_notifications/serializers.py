@@ -1,9 +1,11 @@
 from rest_framework import serializers
 from .models import TelegramUser, NotificationLog
+from common.serializers import SparseFieldsetMixin
 
 
-class TelegramUserSerializer(serializers.ModelSerializer):
+class TelegramUserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for linking users to Telegram."""
+    sparse_sources = {'user_full_name': ['user__first_name', 'user__last_name']}
     user_full_name = serializers.CharField(source='user.get_full_name', read_only=True)
 
     class Meta:
@@ -12,8 +14,9 @@ class TelegramUserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class NotificationLogSerializer(serializers.ModelSerializer):
+class NotificationLogSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for notification logs."""
+    sparse_sources = {'user_full_name': ['user__first_name', 'user__last_name']}
     user_full_name = serializers.CharField(source='user.get_full_name', read_only=True)
 
     class Meta:
@@ -1,3 +1,54 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from datetime import date
+from patients.models import PatientProfile
+from .models import NotificationLog
+from common.testing import QueryPlanAssertionsMixin, QueryBudgetAssertionsMixin
 
-# Create your tests here.
+User = get_user_model()
+
+
+class NotificationLogQueryTests(QueryPlanAssertionsMixin, QueryBudgetAssertionsMixin, TestCase):
+    """A user's notification history is read from an index at a constant query count."""
+
+    @classmethod
+    def setUpTestData(cls):
+        users = [User.objects.create_user(f'notify{index}', f'notify{index}@example.com', 'pass1234', role='is_patient') for index in range(10)]
+        NotificationLog.objects.bulk_create([
+            NotificationLog(user=users[index % 10], message_type='reminder', channel='email') for index in range(300)
+        ])
+        cls.user = users[0]
+
+    def test_user_log_list_uses_index(self):
+        self.assertUsesIndex(NotificationLog.objects.filter(user=self.user).order_by('-sent_at'), 'notiflog_user_sent_idx')
+
+    def test_log_list_query_count_is_constant(self):
+        user = User.objects.create_user('notifyme', 'notifyme@example.com', 'pass1234', role='is_patient')
+        PatientProfile.objects.create(user=user, date_of_birth=date(1990, 1, 1), gender='other')
+
+        def add_logs(total):
+            NotificationLog.objects.bulk_create([
+                NotificationLog(user=user, message_type='booking', channel='telegram')
+                for _ in range(user.notification_logs.count(), total)
+            ])
+        self.client.force_login(user)
+        self.assertConstantQueries(lambda: self.client.get('/telegram/logs/', {'page_size': 100}), add_logs)
+        self.assertEqual(len(self.client.get('/telegram/logs/', {'page_size': 100}).json()['results']), 100)
+
+    def test_log_list_pages_newest_first(self):
+        self.client.force_login(self.user)
+        PatientProfile.objects.create(user=self.user, date_of_birth=date(1990, 1, 1), gender='other')
+        first = self.client.get('/telegram/logs/', {'page_size': 20}).json()
+        second = self.client.get(first['next']).json()
+        ids = [row['id'] for row in first['results'] + second['results']]
+        self.assertEqual(len(set(ids)), 30)
+        self.assertIsNone(second['next'])
+        self.assertEqual(ids, sorted(ids, reverse=True))
+
+    def test_log_list_filters_by_channel_and_rejects_bad_choice(self):
+        self.client.force_login(self.user)
+        PatientProfile.objects.create(user=self.user, date_of_birth=date(1990, 1, 1), gender='other')
+        NotificationLog.objects.create(user=self.user, message_type='booking', channel='telegram', status='failed')
+        body = self.client.get('/telegram/logs/', {'channel': 'telegram', 'status': 'failed'}).json()
+        self.assertEqual([row['message_type'] for row in body['results']], ['booking'])
+        self.assertEqual(self.client.get('/telegram/logs/', {'channel': 'pigeon'}).status_code, 400)
@@ -7,7 +7,7 @@ from .views import (
 urlpatterns = [
     # Telegram User Endpoints
     path('users/', TelegramUserListCreateView.as_view(), name='telegram-user-list-create'),
-    path('users/<uuid:pk>/', TelegramUserDetailView.as_view(), name='telegram-user-detail'),
+    path('users/<int:pk>/', TelegramUserDetailView.as_view(), name='telegram-user-detail'),
 
     # Notification Endpoints
     path('logs/', NotificationLogListView.as_view(), name='notification-log-list'),
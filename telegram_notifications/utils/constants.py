@@ -13,4 +13,6 @@ if not BOT_TOKEN:
     )
 
 TELEGRAM_API_URL = "https://api.telegram.org/bot"
-MESSAGE_TYPES = ['booking', 'reminder', 'cancellation', 'reschedule']
\ No newline at end of file
+MESSAGE_TYPES = ['booking', 'reminder', 'cancellation', 'reschedule']
+
+NOTIFICATION_LOG_ORDERING = ('-sent_at', '-id')  # Keyset order for log lists, newest first
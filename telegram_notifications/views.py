@@ -7,14 +7,20 @@ from .serializers import TelegramUserSerializer, NotificationLogSerializer
 from .services.telegram_service import TelegramService
 from common.permissions import IsAuthenticatedAndActive  # Added
 from .utils.helpers import format_message
+from .utils.constants import NOTIFICATION_LOG_ORDERING
+from common.pagination import KeysetPagination
+from common.filters import apply_filterset, filterset_parameters
+from drf_spectacular.utils import extend_schema
+from .filters import NotificationLogFilter
 
 class TelegramUserListCreateView(APIView):
     """List and create Telegram users."""
     permission_classes = [IsAuthenticatedAndActive]
 
     def get(self, request):
-        users = TelegramUser.objects.filter(user=request.user)
-        serializer = TelegramUserSerializer(users, many=True)
+        users = TelegramUser.objects.filter(user=request.user).select_related('user')
+        users = TelegramUserSerializer.sparse_queryset(users, request)
+        serializer = TelegramUserSerializer(users, many=True, context={'request': request})
         return Response(serializer.data)
 
     def post(self, request):
@@ -29,8 +35,9 @@ class TelegramUserDetailView(APIView):
     permission_classes = [IsAuthenticatedAndActive]
 
     def get(self, request, pk):
-        user = get_object_or_404(TelegramUser, pk=pk, user=request.user)
-        serializer = TelegramUserSerializer(user)
+        users = TelegramUserSerializer.sparse_queryset(TelegramUser.objects.select_related('user'), request)
+        user = get_object_or_404(users, pk=pk, user=request.user)
+        serializer = TelegramUserSerializer(user, context={'request': request})
         return Response(serializer.data)
 
     def put(self, request, pk):
@@ -50,10 +57,15 @@ class NotificationLogListView(APIView):
     """List notification logs."""
     permission_classes = [IsAuthenticatedAndActive]
 
+    @extend_schema(parameters=filterset_parameters(NotificationLogFilter))
     def get(self, request):
-        logs = NotificationLog.objects.filter(user=request.user)
-        serializer = NotificationLogSerializer(logs, many=True)
-        return Response(serializer.data)
+        logs = apply_filterset(NotificationLogFilter, request.query_params, NotificationLog.objects.filter(user=request.user))
+        logs = logs.select_related('user')
+        logs = NotificationLogSerializer.sparse_queryset(logs, request, required=NOTIFICATION_LOG_ORDERING)
+        paginator = KeysetPagination(NOTIFICATION_LOG_ORDERING)
+        page = paginator.paginate_queryset(logs, request, view=self)
+        serializer = NotificationLogSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
 
 class SendNotificationView(APIView):
     """Send a notification."""